@@ -12,16 +12,23 @@ Features:
 - Converts to clean markdown format
 - Preserves structure, tables, and formatting
 - Extracts text from images and scanned documents
-- Batch conversion support
+- Batch conversion support (parallel with --concurrency, output streamed in input order)
+- Page-range chunking for very large PDFs (--chunk-pages, requires pypdf)
+- Incremental re-runs: unchanged documents are reused from a conversion store
 - Saves to docs/assets/document-extraction.md by default
 """
 
 import argparse
+import contextlib
+import json
 import os
+import re
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, TextIO, Tuple
 
 try:
     from google import genai
@@ -36,6 +43,16 @@ try:
 except ImportError:
     load_dotenv = None
 
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
+
+import rate_limiter
+import upload_registry
+import inline_budget
+import result_cache
+
 
 def find_api_key() -> Optional[str]:
     """Find Gemini API key using correct priority order.
@@ -126,28 +143,50 @@ def get_mime_type(file_path: str) -> str:
     return mime_types.get(ext, 'application/octet-stream')
 
 
-def upload_file(client: genai.Client, file_path: str, verbose: bool = False) -> Any:
-    """Upload file to Gemini File API."""
-    if verbose:
-        print(f"Uploading {file_path}...")
+def upload_file(
+    client: genai.Client,
+    file_path: str,
+    verbose: bool = False,
+    registry: Optional[upload_registry.UploadRegistry] = None
+) -> Any:
+    """Upload file to Gemini File API.
 
-    myfile = client.files.upload(file=file_path)
+    With a registry, a still-valid earlier upload of the same content is
+    reused instead of uploading again.
+    """
+    digest = registry.content_hash(file_path) if registry is not None else None
+    with registry.content_lock(digest) if digest else contextlib.nullcontext():
+        myfile = registry.lookup(client, digest) if digest else None
+        if myfile is not None:
+            if verbose:
+                print(f"Reusing upload of {file_path}: {myfile.name}")
+        else:
+            if verbose:
+                print(f"Uploading {file_path}...")
+            myfile = client.files.upload(file=file_path)
+
+        # Wait for processing if needed
+        max_wait = 300  # 5 minutes
+        elapsed = 0
+        interval = upload_registry.POLL_INITIAL_SECONDS
+        while myfile.state.name == 'PROCESSING' and elapsed < max_wait:
+            time.sleep(interval)
+            elapsed += interval
+            interval = upload_registry.next_poll_interval(interval)
+            myfile = client.files.get(name=myfile.name)
+            if verbose:
+                print(f"  Processing... {elapsed:.0f}s")
 
-    # Wait for processing if needed
-    max_wait = 300  # 5 minutes
-    elapsed = 0
-    while myfile.state.name == 'PROCESSING' and elapsed < max_wait:
-        time.sleep(2)
-        myfile = client.files.get(name=myfile.name)
-        elapsed += 2
-        if verbose and elapsed % 10 == 0:
-            print(f"  Processing... {elapsed}s")
+        if myfile.state.name == 'FAILED':
+            if digest:
+                registry.forget(digest)
+            raise ValueError(f"File processing failed: {file_path}")
 
-    if myfile.state.name == 'FAILED':
-        raise ValueError(f"File processing failed: {file_path}")
+        if myfile.state.name == 'PROCESSING':
+            raise TimeoutError(f"Processing timeout after {max_wait}s: {file_path}")
 
-    if myfile.state.name == 'PROCESSING':
-        raise TimeoutError(f"Processing timeout after {max_wait}s: {file_path}")
+        if digest:
+            registry.record(digest, myfile)
 
     if verbose:
         print(f"  Uploaded: {myfile.name}")
@@ -155,13 +194,34 @@ def upload_file(client: genai.Client, file_path: str, verbose: bool = False) ->
     return myfile
 
 
+DEFAULT_PROMPT = """Convert this document to clean, well-formatted Markdown.
+
+Requirements:
+- Preserve all content, structure, and formatting
+- Convert tables to markdown table format
+- Maintain heading hierarchy (# ## ### etc)
+- Preserve lists, code blocks, and quotes
+- Extract text from images if present
+- Keep formatting consistent and readable
+
+Output only the markdown content without any preamble or explanation."""
+
+CHUNK_PROMPT_SUFFIX = """
+
+These are pages {start}-{end} of a {total}-page document ({name}), converted separately and joined afterwards:
+- Do not add a title, summary or preamble for this excerpt
+- If the first page continues a section or table from the previous page, continue it without repeating its heading
+- Use the heading levels the document itself uses, not levels relative to this excerpt"""
+
+
 def convert_to_markdown(
     client: genai.Client,
     file_path: str,
     model: str = 'gemini-2.5-flash',
     custom_prompt: Optional[str] = None,
     verbose: bool = False,
-    max_retries: int = 3
+    max_retries: int = 3,
+    registry: Optional[upload_registry.UploadRegistry] = None
 ) -> Dict[str, Any]:
     """Convert a document to markdown using Gemini."""
 
@@ -169,43 +229,28 @@ def convert_to_markdown(
         try:
             file_path_obj = Path(file_path)
             file_size = file_path_obj.stat().st_size
-            use_file_api = file_size > 20 * 1024 * 1024  # >20MB
+            use_file_api = inline_budget.use_file_api(file_size)  # >20MB by default
 
-            # Default prompt for markdown conversion
-            if custom_prompt:
-                prompt = custom_prompt
-            else:
-                prompt = """Convert this document to clean, well-formatted Markdown.
+            prompt = custom_prompt or DEFAULT_PROMPT
 
-Requirements:
-- Preserve all content, structure, and formatting
-- Convert tables to markdown table format
-- Maintain heading hierarchy (# ## ### etc)
-- Preserve lists, code blocks, and quotes
-- Extract text from images if present
-- Keep formatting consistent and readable
-
-Output only the markdown content without any preamble or explanation."""
+            mime_type = get_mime_type(str(file_path))
+            tokens = rate_limiter.estimate_tokens(prompt, str(file_path), mime_type)
 
             # Upload or inline the file
             if use_file_api:
-                myfile = upload_file(client, str(file_path), verbose)
-                content = [prompt, myfile]
+                myfile = upload_file(client, str(file_path), verbose, registry)
+                call = lambda: client.models.generate_content(model=model, contents=[prompt, myfile])
             else:
-                with open(file_path, 'rb') as f:
-                    file_bytes = f.read()
-
-                mime_type = get_mime_type(str(file_path))
-                content = [
-                    prompt,
-                    types.Part.from_bytes(data=file_bytes, mime_type=mime_type)
-                ]
+                def call():
+                    # Reserve budget and read the bytes only for the request
+                    # itself, so rate-limit waits and retries do not hold them
+                    with inline_budget.budget.reserve(file_size):
+                        with open(file_path, 'rb') as f:
+                            part = types.Part.from_bytes(data=f.read(), mime_type=mime_type)
+                        return client.models.generate_content(model=model, contents=[prompt, part])
 
-            # Generate markdown
-            response = client.models.generate_content(
-                model=model,
-                contents=content
-            )
+            # Generate markdown (waits for quota and absorbs 429s)
+            response = rate_limiter.call_with_rate_limit(model, call, tokens=tokens, verbose=verbose)
 
             markdown_content = response.text if hasattr(response, 'text') else ''
 
@@ -224,10 +269,279 @@ Output only the markdown content without any preamble or explanation."""
                     'markdown': None
                 }
 
-            wait_time = 2 ** attempt
+            wait_time = rate_limiter.backoff_delay(attempt, rate_limiter.retry_after_seconds(e))
             if verbose:
-                print(f"  Retry {attempt + 1} after {wait_time}s: {e}")
-            time.sleep(wait_time)
+                print(f"  Retry {attempt + 1} after {wait_time:.1f}s: {e}")
+
+        time.sleep(wait_time)
+
+
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_WRAPPING_FENCE_RE = re.compile(r'^```(?:markdown|md)?[ \t]*\n(.*)\n```$', re.S)
+_pypdf_warned = False
+
+
+def split_pdf(reader: Any, pages_per_chunk: int, out_dir: str) -> List[Tuple[int, int, str]]:
+    """Write page-range chunks of a PDF to out_dir.
+
+    Returns (first_page, last_page, path) per chunk, pages 1-based inclusive.
+    """
+    total = len(reader.pages)
+    chunks = []
+    for start in range(0, total, pages_per_chunk):
+        end = min(start + pages_per_chunk, total)
+        writer = PdfWriter()
+        for page in range(start, end):
+            writer.add_page(reader.pages[page])
+        chunk_path = os.path.join(out_dir, f"pages-{start + 1:05d}-{end:05d}.pdf")
+        with open(chunk_path, 'wb') as f:
+            writer.write(f)
+        chunks.append((start + 1, end, chunk_path))
+    return chunks
+
+
+def _heading_lines(lines: List[str]):
+    """Yield (index, level, text) for ATX headings outside code fences."""
+    in_fence = False
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+            continue
+        if not in_fence:
+            match = _HEADING_RE.match(line)
+            if match:
+                yield i, len(match.group(1)), match.group(2)
+
+
+def stitch_chunks(chunks: List[str], page_ranges: Optional[List[Tuple[int, int]]] = None) -> str:
+    """Join separately converted page ranges into one markdown document.
+
+    Keeps headings continuous across chunk boundaries:
+    - a ```markdown fence wrapped around a whole chunk is removed
+    - a chunk's opening heading is dropped when it repeats the heading still
+      in progress at the end of the previous chunk (a re-emitted running header)
+    - if the first chunk opens with a single top-level title, later chunks
+      that reuse the title's level are demoted one level so the title stays unique
+    """
+    parts = []
+    title_level = None
+    last_heading = None
+
+    for k, chunk in enumerate(chunks):
+        text = (chunk or '').strip()
+        fenced = _WRAPPING_FENCE_RE.match(text)
+        if fenced:
+            text = fenced.group(1).strip()
+        lines = text.split('\n')
+        headings = list(_heading_lines(lines))
+
+        if k == 0:
+            if headings:
+                top = min(level for _, level, _ in headings)
+                at_top = [h for h in headings if h[1] == top]
+                if len(at_top) == 1 and at_top[0] is headings[0]:
+                    title_level = top
+        else:
+            first = next((i for i, line in enumerate(lines) if line.strip()), None)
+            if (first is not None and headings and headings[0][0] == first
+                    and last_heading and headings[0][2].strip().lower() == last_heading):
+                del lines[first]
+                headings = list(_heading_lines(lines))
+
+            if title_level and any(level <= title_level for _, level, _ in headings):
+                for i, level, heading in headings:
+                    lines[i] = f"{'#' * min(6, level + 1)} {heading}"
+                headings = list(_heading_lines(lines))
+
+        if headings:
+            last_heading = headings[-1][2].strip().lower()
+
+        body = '\n'.join(lines).strip()
+        if page_ranges:
+            start, end = page_ranges[k]
+            body = f"<!-- pages {start}-{end} -->\n\n{body}"
+        parts.append(body)
+
+    return '\n\n'.join(parts)
+
+
+def convert_pdf_chunked(
+    client: genai.Client,
+    file_path: str,
+    pages_per_chunk: int,
+    model: str = 'gemini-2.5-flash',
+    custom_prompt: Optional[str] = None,
+    verbose: bool = False,
+    registry: Optional[upload_registry.UploadRegistry] = None,
+    max_workers: int = 4
+) -> Dict[str, Any]:
+    """Convert a PDF as page-range chunks in parallel, then stitch them in order.
+
+    PDFs with no more than `pages_per_chunk` pages, unreadable PDFs and
+    installs without pypdf fall back to a single convert_to_markdown call.
+    """
+    global _pypdf_warned
+    whole = dict(client=client, file_path=file_path, model=model,
+                 custom_prompt=custom_prompt, verbose=verbose, registry=registry)
+
+    if PdfReader is None:
+        if not _pypdf_warned:
+            print("Warning: pypdf not installed; converting PDFs without chunking (pip install pypdf)")
+            _pypdf_warned = True
+        return convert_to_markdown(**whole)
+
+    try:
+        reader = PdfReader(file_path)
+        total = len(reader.pages)
+    except Exception as e:
+        if verbose:
+            print(f"  Cannot split {file_path} ({e}); converting as one document")
+        return convert_to_markdown(**whole)
+
+    if total <= pages_per_chunk:
+        return convert_to_markdown(**whole)
+
+    base_prompt = custom_prompt or DEFAULT_PROMPT
+    name = Path(file_path).name
+    with tempfile.TemporaryDirectory(prefix='document-chunks-') as tmp:
+        chunks = split_pdf(reader, pages_per_chunk, tmp)
+        if verbose:
+            print(f"  Split {name}: {total} pages into {len(chunks)} chunk(s)")
+
+        # Chunk files are temporary, so they are not added to the upload registry
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            futures = [
+                executor.submit(
+                    convert_to_markdown,
+                    client=client,
+                    file_path=chunk_path,
+                    model=model,
+                    custom_prompt=base_prompt + CHUNK_PROMPT_SUFFIX.format(
+                        start=start, end=end, total=total, name=name
+                    ),
+                    verbose=verbose
+                )
+                for start, end, chunk_path in chunks
+            ]
+            chunk_results = [future.result() for future in futures]
+
+    page_ranges = [(start, end) for start, end, _ in chunks]
+    failures = [
+        f"pages {start}-{end}: {result.get('error', 'Unknown error')}"
+        for (start, end), result in zip(page_ranges, chunk_results)
+        if result['status'] != 'success'
+    ]
+    if failures:
+        return {
+            'file': str(file_path),
+            'status': 'error',
+            'error': '; '.join(failures),
+            'markdown': None,
+            'chunks': len(chunks)
+        }
+
+    return {
+        'file': str(file_path),
+        'status': 'success',
+        'markdown': stitch_chunks([r.get('markdown') or '' for r in chunk_results], page_ranges),
+        'chunks': len(chunks)
+    }
+
+
+def conversion_key(content_hash: str, model: str, custom_prompt: Optional[str],
+                   pages_per_chunk: Optional[int] = None) -> str:
+    """Conversion store key: document content plus what shapes its markdown."""
+    return result_cache.cache_key(
+        content_hash,
+        kind='document',
+        model=model,
+        prompt=custom_prompt or DEFAULT_PROMPT,
+        pages_per_chunk=pages_per_chunk
+    )
+
+
+def _timed_convert(pages_per_chunk: Optional[int] = None, chunk_concurrency: int = 4,
+                   store: Optional[result_cache.ResultCache] = None,
+                   **kwargs) -> Dict[str, Any]:
+    """Convert one document and record how long it took.
+
+    With a store, an unchanged document converted before with the same model
+    and prompt is returned from it instead of calling the API.
+    """
+    start = time.time()
+    file_path = kwargs['file_path']
+    key = content_hash = None
+    if store is not None:
+        # Memoized by path/size/mtime when an upload registry is in use
+        registry = kwargs.get('registry')
+        try:
+            if registry is not None:
+                content_hash = registry.content_hash(file_path)
+            else:
+                content_hash = result_cache.hash_file(file_path)
+        except OSError:
+            content_hash = None
+        if content_hash:
+            key = conversion_key(content_hash, kwargs.get('model'), kwargs.get('custom_prompt'),
+                                 pages_per_chunk)
+            cached = store.get(key)
+            if cached is not None:
+                result = {**cached, 'file': str(file_path), 'cached': True, 'sha256': content_hash}
+                result['seconds'] = round(time.time() - start, 2)
+                return result
+
+    if pages_per_chunk and Path(file_path).suffix.lower() == '.pdf':
+        result = convert_pdf_chunked(pages_per_chunk=pages_per_chunk,
+                                     max_workers=chunk_concurrency, **kwargs)
+    else:
+        result = convert_to_markdown(**kwargs)
+
+    if key and result['status'] == 'success':
+        store.put(key, result)
+    if content_hash:
+        result['sha256'] = content_hash
+    result['seconds'] = round(time.time() - start, 2)
+    return result
+
+
+def write_manifest(manifest_path: Path, output_path: Path, model: str,
+                   custom_prompt: Optional[str], results: List[Dict[str, Any]]) -> None:
+    """Record which document versions the combined output was built from."""
+    manifest = {
+        'output': str(output_path),
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'model': model,
+        'prompt': 'default' if not custom_prompt else custom_prompt,
+        'documents': [
+            {
+                'file': r['file'],
+                'sha256': r.get('sha256'),
+                'status': r['status'],
+                'cached': bool(r.get('cached')),
+                'seconds': r['seconds'],
+                'markdown_chars': r.get('markdown_chars', 0),
+                **({'error': r['error']} if r.get('error') else {}),
+            }
+            for r in results
+        ],
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def write_section(f: TextIO, result: Dict[str, Any]) -> None:
+    """Write one document's section of the combined markdown file."""
+    f.write(f"## {Path(result['file']).name}\n\n")
+
+    if result['status'] == 'success' and result.get('markdown'):
+        f.write(result['markdown'])
+        f.write("\n\n")
+    elif result['status'] == 'success':
+        f.write("**Note**: Conversion succeeded but no content was returned.\n\n")
+    else:
+        f.write(f"**Error**: {result.get('error', 'Unknown error')}\n\n")
+
+    f.write("---\n\n")
 
 
 def batch_convert(
@@ -236,9 +550,26 @@ def batch_convert(
     auto_name: bool = False,
     model: str = 'gemini-2.5-flash',
     custom_prompt: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    registry: Optional[upload_registry.UploadRegistry] = None,
+    concurrency: int = 1,
+    pages_per_chunk: Optional[int] = None,
+    chunk_concurrency: int = 4,
+    store: Optional[result_cache.ResultCache] = None
 ) -> List[Dict[str, Any]]:
-    """Batch convert multiple files to markdown."""
+    """Batch convert multiple files to markdown.
+
+    Up to `concurrency` files are converted at once. With `pages_per_chunk`,
+    longer PDFs are split into page ranges converted `chunk_concurrency` at
+    a time and stitched back in order.
+
+    With a conversion `store`, only new or changed documents are sent; the
+    combined file is rebuilt from stored markdown for the rest, and a
+    `<output>.manifest.json` records each document's hash and status. Each document's section
+    is written to the output as soon as it and every earlier document are
+    done, and its markdown is then dropped: the returned results carry
+    status, timing and `markdown_chars`, not the markdown itself.
+    """
 
     api_key = find_api_key()
     if not api_key:
@@ -248,7 +579,8 @@ def batch_convert(
         sys.exit(1)
 
     client = genai.Client(api_key=api_key)
-    results = []
+    concurrency = max(1, concurrency)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(files)
 
     # Determine output path
     if not output_file:
@@ -266,50 +598,92 @@ def batch_convert(
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Process each file
-    for i, file_path in enumerate(files, 1):
-        if verbose:
-            print(f"\n[{i}/{len(files)}] Converting: {file_path}")
-
-        result = convert_to_markdown(
-            client=client,
-            file_path=file_path,
-            model=model,
-            custom_prompt=custom_prompt,
-            verbose=verbose
-        )
-
-        results.append(result)
-
-        if verbose:
-            status = result.get('status', 'unknown')
-            print(f"  Status: {status}")
-
-    # Save combined markdown
+    start = time.time()
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write("# Document Extraction Results\n\n")
         f.write(f"Converted {len(files)} document(s) to markdown.\n\n")
         f.write("---\n\n")
-
-        for result in results:
-            f.write(f"## {Path(result['file']).name}\n\n")
-
-            if result['status'] == 'success' and result.get('markdown'):
-                f.write(result['markdown'])
-                f.write("\n\n")
-            elif result['status'] == 'success':
-                f.write("**Note**: Conversion succeeded but no content was returned.\n\n")
-            else:
-                f.write(f"**Error**: {result.get('error', 'Unknown error')}\n\n")
-
-            f.write("---\n\n")
+        f.flush()
+
+        # Finished documents wait here until every earlier one is written.
+        # Submission stays within `window` of the next section to write, so
+        # one slow document can't make this buffer grow without bound.
+        finished: Dict[int, Dict[str, Any]] = {}
+        in_flight = {}
+        next_index = 0
+        written = 0
+        window = concurrency * 2
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while written < len(files):
+                while (next_index < len(files) and len(in_flight) < concurrency
+                       and next_index - written < window):
+                    file_path = files[next_index]
+                    if verbose:
+                        print(f"\n[{next_index + 1}/{len(files)}] Converting: {file_path}")
+                    future = executor.submit(
+                        _timed_convert,
+                        client=client,
+                        file_path=file_path,
+                        model=model,
+                        custom_prompt=custom_prompt,
+                        verbose=verbose,
+                        registry=registry,
+                        pages_per_chunk=pages_per_chunk,
+                        chunk_concurrency=chunk_concurrency,
+                        store=store
+                    )
+                    in_flight[future] = next_index
+                    next_index += 1
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'file': files[i], 'status': 'error', 'error': str(e),
+                                  'markdown': None, 'seconds': 0.0}
+                    finished[i] = result
+
+                    if verbose:
+                        status = result.get('status', 'unknown')
+                        print(f"  [{i + 1}/{len(files)}] Status: {status} ({result['seconds']:.1f}s)")
+
+                while written in finished:
+                    result = finished.pop(written)
+                    write_section(f, result)
+                    f.flush()
+                    # Release the markdown now that it is on disk
+                    result['markdown_chars'] = len(result.pop('markdown', None) or '')
+                    results[written] = result
+                    written += 1
+
+    elapsed = time.time() - start
+    if registry is not None:
+        registry.flush()
+
+    manifest_path = None
+    if store is not None:
+        manifest_path = output_path.with_suffix('.manifest.json')
+        write_manifest(manifest_path, output_path, model, custom_prompt, results)
 
     if verbose or True:  # Always show output location
         print(f"\n{'='*50}")
         print(f"Converted: {len(results)} file(s)")
         print(f"Success: {sum(1 for r in results if r['status'] == 'success')}")
         print(f"Failed: {sum(1 for r in results if r['status'] == 'error')}")
+        reused = sum(1 for r in results if r.get('cached'))
+        if reused:
+            print(f"Reused: {reused} unchanged document(s) from the conversion store")
+        print("Per-file time:")
+        for result in results:
+            print(f"  {Path(result['file']).name}: {result['seconds']:.1f}s ({result['status']})")
+        file_seconds = sum(r['seconds'] for r in results)
+        print(f"Wall time: {elapsed:.1f}s (sum of per-file times: {file_seconds:.1f}s)")
         print(f"Output saved to: {output_path}")
+        if manifest_path:
+            print(f"Manifest: {manifest_path}")
 
     return results
 
@@ -339,6 +713,15 @@ Examples:
   # Batch convert directory
   %(prog)s --input ./documents/*.pdf --verbose
 
+  # Convert 8 documents at a time
+  %(prog)s --input ./documents/*.pdf --concurrency 8
+
+  # Nightly re-run: only new or changed documents are sent to the API
+  %(prog)s --input ./docs/*.pdf --output ./docs-extraction.md
+
+  # Split a 600-page manual into 50-page chunks converted in parallel
+  %(prog)s --input manual.pdf --chunk-pages 50 --chunk-concurrency 12
+
 Supported formats:
   - PDF documents (up to 1,000 pages)
   - Images (JPEG, PNG, WEBP, HEIC)
@@ -359,11 +742,43 @@ Default output: <project-root>/docs/assets/document-extraction.md
                        help='Gemini model to use (default: gemini-2.5-flash)')
     parser.add_argument('--prompt', '-p',
                        help='Custom prompt for conversion')
+    parser.add_argument('--rpm', type=float,
+                       help='Requests/min limit for the model (default: GEMINI_RATE_LIMITS or adaptive)')
+    parser.add_argument('--tpm', type=float,
+                       help='Tokens/min limit for the model (default: GEMINI_RATE_LIMITS or none)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Number of documents converted in parallel (default: 1)')
+    parser.add_argument('--chunk-pages', type=int,
+                       help='Split PDFs longer than this many pages into chunks converted in parallel (requires pypdf)')
+    parser.add_argument('--chunk-concurrency', type=int, default=4,
+                       help='Chunks of one PDF converted in parallel (default: 4)')
+    parser.add_argument('--inline-threshold-mb', type=float,
+                       help='Send files up to this size inline, larger ones via File API (default: 20, max 20)')
+    parser.add_argument('--inline-budget-mb', type=float,
+                       help='Max inline file bytes in flight across parallel workers (default: 128)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Convert every document and re-upload large files; do not use the conversion store or upload registry')
+    parser.add_argument('--cache-dir',
+                       help='Conversion store directory (default: ~/.cache/ai-multimodal/conversions)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
 
     args = parser.parse_args()
 
+    if args.rpm is not None or args.tpm is not None:
+        rate_limiter.configure(args.model, rpm=args.rpm, tpm=args.tpm)
+
+    if args.inline_threshold_mb is not None and not 0 <= args.inline_threshold_mb <= inline_budget.MAX_INLINE_MB:
+        parser.error(f"--inline-threshold-mb must be between 0 and {inline_budget.MAX_INLINE_MB}")
+    inline_budget.configure(args.inline_threshold_mb, args.inline_budget_mb)
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.chunk_pages is not None and args.chunk_pages < 1:
+        parser.error("--chunk-pages must be at least 1")
+    if args.chunk_concurrency < 1:
+        parser.error("--chunk-concurrency must be at least 1")
+
     # Validate input files
     files = []
     for file_pattern in args.input:
@@ -387,7 +802,14 @@ Default output: <project-root>/docs/assets/document-extraction.md
         auto_name=args.auto_name,
         model=args.model,
         custom_prompt=args.prompt,
-        verbose=args.verbose
+        verbose=args.verbose,
+        registry=None if args.no_cache else upload_registry.UploadRegistry(),
+        concurrency=args.concurrency,
+        pages_per_chunk=args.chunk_pages,
+        chunk_concurrency=args.chunk_concurrency,
+        store=None if args.no_cache else result_cache.ResultCache(
+            args.cache_dir or str(result_cache.cache_root() / 'conversions')
+        )
     )
 
 
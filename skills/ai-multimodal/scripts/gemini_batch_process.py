@@ -11,14 +11,17 @@ Supports all Gemini modalities:
 """
 
 import argparse
+import contextlib
 import json
 import os
 import sys
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 import csv
 import shutil
+import textwrap
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Import centralized environment resolver
 sys.path.insert(0, str(Path.home() / '.claude' / 'scripts'))
@@ -41,6 +44,11 @@ except ImportError:
     print("Install with: pip install google-genai")
     sys.exit(1)
 
+import rate_limiter
+import result_cache
+import upload_registry
+import inline_budget
+
 
 # Image generation model fallback chain (highest quality -> lowest cost)
 # All image generation requires billing - no completely free option exists
@@ -239,30 +247,52 @@ def get_mime_type(file_path: str) -> str:
     return mime_types.get(ext, 'application/octet-stream')
 
 
-def upload_file(client: genai.Client, file_path: str, verbose: bool = False) -> Any:
-    """Upload file to Gemini File API."""
-    if verbose:
-        print(f"Uploading {file_path}...")
+def upload_file(
+    client: genai.Client,
+    file_path: str,
+    verbose: bool = False,
+    registry: Optional[upload_registry.UploadRegistry] = None
+) -> Any:
+    """Upload file to Gemini File API.
 
-    myfile = client.files.upload(file=file_path)
+    With a registry, a still-valid earlier upload of the same content is
+    reused instead of uploading again.
+    """
+    digest = registry.content_hash(file_path) if registry is not None else None
+    with registry.content_lock(digest) if digest else contextlib.nullcontext():
+        myfile = registry.lookup(client, digest) if digest else None
+        if myfile is not None:
+            if verbose:
+                print(f"Reusing upload of {file_path}: {myfile.name}")
+        else:
+            if verbose:
+                print(f"Uploading {file_path}...")
+            myfile = client.files.upload(file=file_path)
+
+        # Wait for processing (video/audio files need processing)
+        mime_type = get_mime_type(file_path)
+        if mime_type.startswith('video/') or mime_type.startswith('audio/'):
+            max_wait = 300  # 5 minutes
+            elapsed = 0
+            interval = upload_registry.POLL_INITIAL_SECONDS
+            while myfile.state.name == 'PROCESSING' and elapsed < max_wait:
+                time.sleep(interval)
+                elapsed += interval
+                interval = upload_registry.next_poll_interval(interval)
+                myfile = client.files.get(name=myfile.name)
+                if verbose:
+                    print(f"  Processing... {elapsed:.0f}s")
 
-    # Wait for processing (video/audio files need processing)
-    mime_type = get_mime_type(file_path)
-    if mime_type.startswith('video/') or mime_type.startswith('audio/'):
-        max_wait = 300  # 5 minutes
-        elapsed = 0
-        while myfile.state.name == 'PROCESSING' and elapsed < max_wait:
-            time.sleep(2)
-            myfile = client.files.get(name=myfile.name)
-            elapsed += 2
-            if verbose and elapsed % 10 == 0:
-                print(f"  Processing... {elapsed}s")
+            if myfile.state.name == 'FAILED':
+                if digest:
+                    registry.forget(digest)
+                raise ValueError(f"File processing failed: {file_path}")
 
-        if myfile.state.name == 'FAILED':
-            raise ValueError(f"File processing failed: {file_path}")
+            if myfile.state.name == 'PROCESSING':
+                raise TimeoutError(f"Processing timeout after {max_wait}s: {file_path}")
 
-        if myfile.state.name == 'PROCESSING':
-            raise TimeoutError(f"Processing timeout after {max_wait}s: {file_path}")
+        if digest:
+            registry.record(digest, myfile)
 
     if verbose:
         print(f"  Uploaded: {myfile.name}")
@@ -349,10 +379,14 @@ def generate_image_imagen4(
             else:
                 print()
 
-        response = client.models.generate_images(
-            model=model,
-            prompt=prompt,
-            config=gen_config
+        response = rate_limiter.call_with_rate_limit(
+            model,
+            lambda: client.models.generate_images(
+                model=model,
+                prompt=prompt,
+                config=gen_config
+            ),
+            verbose=verbose
         )
 
         # Save images
@@ -469,11 +503,15 @@ def generate_video_veo(
             print(f"  Starting video generation (this may take 11s-6min)...")
 
         # Call generate_videos with image parameter for first frame
-        operation = client.models.generate_videos(
-            model=model,
-            prompt=prompt,
-            image=first_frame,  # First frame as opening image
-            config=gen_config
+        operation = rate_limiter.call_with_rate_limit(
+            model,
+            lambda: client.models.generate_videos(
+                model=model,
+                prompt=prompt,
+                image=first_frame,  # First frame as opening image
+                config=gen_config
+            ),
+            verbose=verbose
         )
 
         # Poll operation until complete
@@ -544,37 +582,43 @@ def process_file(
     format_output: str,
     aspect_ratio: Optional[str] = None,
     verbose: bool = False,
-    max_retries: int = 3
+    max_retries: int = 3,
+    cache: Optional[result_cache.ResultCache] = None,
+    registry: Optional[upload_registry.UploadRegistry] = None
 ) -> Dict[str, Any]:
-    """Process a single file with retry logic."""
+    """Process a single file with retry logic.
 
-    for attempt in range(max_retries):
+    With a cache, a file whose content was already processed with the same
+    prompt/model/task/format/aspect ratio returns the stored result.
+    """
+    key = None
+    if cache is not None and file_path:
+        # The registry memoizes hashes by path/size/mtime, so unchanged
+        # inputs are not re-read on every run
         try:
-            # For generation tasks without input files
-            if task == 'generate' and not file_path:
-                content = [prompt]
+            if registry is not None:
+                digest = registry.content_hash(str(file_path))
             else:
-                # Process input file
-                file_path = Path(file_path)
-                # Determine if we need File API
-                file_size = file_path.stat().st_size
-                use_file_api = file_size > 20 * 1024 * 1024  # >20MB
-
-                if use_file_api:
-                    # Upload to File API
-                    myfile = upload_file(client, str(file_path), verbose)
-                    content = [prompt, myfile]
-                else:
-                    # Inline data
-                    with open(file_path, 'rb') as f:
-                        file_bytes = f.read()
-
-                    mime_type = get_mime_type(str(file_path))
-                    content = [
-                        prompt,
-                        types.Part.from_bytes(data=file_bytes, mime_type=mime_type)
-                    ]
+                digest = result_cache.hash_file(str(file_path))
+        except OSError:
+            digest = None
+        if digest:
+            key = result_cache.cache_key(
+                digest,
+                prompt=prompt,
+                model=model,
+                task=task,
+                format_output=format_output,
+                aspect_ratio=aspect_ratio
+            )
+        cached = cache.get(key) if key else None
+        if cached is not None:
+            if verbose:
+                print(f"  Cached result: {file_path}")
+            return {**cached, 'file': str(file_path), 'cached': True}
 
+    for attempt in range(max_retries):
+        try:
             # Configure request
             config_args = {}
             if task == 'generate':
@@ -590,12 +634,42 @@ def process_file(
 
             config = types.GenerateContentConfig(**config_args) if config_args else None
 
-            # Generate content
-            response = client.models.generate_content(
-                model=model,
-                contents=content,
-                config=config
-            )
+            def generate(content):
+                return client.models.generate_content(
+                    model=model,
+                    contents=content,
+                    config=config
+                )
+
+            # For generation tasks without input files
+            if task == 'generate' and not file_path:
+                tokens = rate_limiter.estimate_tokens(prompt)
+                call = lambda: generate([prompt])
+            else:
+                # Process input file
+                file_path = Path(file_path)
+                # Determine if we need File API
+                file_size = file_path.stat().st_size
+                use_file_api = inline_budget.use_file_api(file_size)  # >20MB by default
+                mime_type = get_mime_type(str(file_path))
+                tokens = rate_limiter.estimate_tokens(prompt, str(file_path), mime_type)
+
+                if use_file_api:
+                    # Upload to File API
+                    myfile = upload_file(client, str(file_path), verbose, registry)
+                    call = lambda: generate([prompt, myfile])
+                else:
+                    def call():
+                        # Inline data: reserve budget and read the bytes only
+                        # for the request itself, so rate-limit waits and
+                        # retries do not hold them
+                        with inline_budget.budget.reserve(file_size):
+                            with open(file_path, 'rb') as f:
+                                part = types.Part.from_bytes(data=f.read(), mime_type=mime_type)
+                            return generate([prompt, part])
+
+            # Generate content (waits for quota and absorbs 429s)
+            response = rate_limiter.call_with_rate_limit(model, call, tokens=tokens, verbose=verbose)
 
             # Extract response
             result = {
@@ -632,6 +706,8 @@ def process_file(
                         if verbose:
                             print(f"  Saved image to: {output_file}")
 
+            if key:
+                cache.put(key, result)
             return result
 
         except Exception as e:
@@ -650,10 +726,270 @@ def process_file(
                     'error': str(e)
                 }
 
-            wait_time = 2 ** attempt
+            wait_time = rate_limiter.backoff_delay(attempt, rate_limiter.retry_after_seconds(e))
             if verbose:
-                print(f"  Retry {attempt + 1} after {wait_time}s: {e}")
-            time.sleep(wait_time)
+                print(f"  Retry {attempt + 1} after {wait_time:.1f}s: {e}")
+
+        time.sleep(wait_time)
+
+
+def _is_fatal_result(result: Dict[str, Any]) -> bool:
+    """Check if a failed result means the rest of the batch would fail too."""
+    if result.get('status') != 'error':
+        return False
+    error = Exception(result.get('error', ''))
+    return _is_billing_error(error) or _is_free_tier_quota_error(error)
+
+
+def process_files(
+    client: genai.Client,
+    files: List[str],
+    prompt: str,
+    model: str,
+    task: str,
+    format_output: str,
+    aspect_ratio: Optional[str] = None,
+    verbose: bool = False,
+    concurrency: int = 1,
+    cache: Optional[result_cache.ResultCache] = None,
+    on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    registry: Optional[upload_registry.UploadRegistry] = None
+) -> List[Dict[str, Any]]:
+    """Process input files with up to `concurrency` requests in flight.
+
+    Results are returned in input order. Each file keeps the retry logic of
+    process_file. After a billing/free tier error no new files are started;
+    files that were never sent are reported as skipped errors.
+
+    `on_result(index, result)` is called in the calling thread as soon as
+    each file finishes (in completion order).
+    """
+    concurrency = max(1, concurrency)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+    stop_error = None
+    in_flight = {}
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            # Keep at most `concurrency` files submitted so an early stop
+            # leaves the rest of the batch unsent
+            while stop_error is None and next_index < len(files) and len(in_flight) < concurrency:
+                file_path = files[next_index]
+                if verbose:
+                    print(f"\n[{next_index + 1}/{len(files)}] Processing: {file_path}")
+                future = executor.submit(
+                    process_file,
+                    client=client,
+                    file_path=file_path,
+                    prompt=prompt,
+                    model=model,
+                    task=task,
+                    format_output=format_output,
+                    aspect_ratio=aspect_ratio,
+                    verbose=verbose,
+                    cache=cache,
+                    registry=registry
+                )
+                in_flight[future] = next_index
+                next_index += 1
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'file': files[i], 'status': 'error', 'error': str(e)}
+                results[i] = result
+                if on_result:
+                    on_result(i, result)
+
+                if verbose:
+                    status = result.get('status', 'unknown')
+                    print(f"  [{i + 1}/{len(files)}] Status: {status}")
+
+                if stop_error is None and _is_fatal_result(result):
+                    stop_error = result.get('error', '')
+                    if verbose:
+                        print("  Billing/quota error - not starting remaining files")
+
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = {
+                'file': files[i],
+                'status': 'error',
+                'error': f"Skipped: batch stopped after billing/quota error: {stop_error}"
+            }
+            if on_result:
+                on_result(i, results[i])
+
+    return results
+
+
+def job_id(prompt: str, model: str, task: str, format_output: str,
+           aspect_ratio: Optional[str] = None) -> str:
+    """Identify a batch job by the parameters that shape its results."""
+    return result_cache.cache_key(
+        'job', prompt=prompt, model=model, task=task,
+        format_output=format_output, aspect_ratio=aspect_ratio
+    )[:16]
+
+
+def _file_signature(file_path: str) -> Optional[List[int]]:
+    try:
+        st = Path(file_path).stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_manifest(manifest_file: str, job: str) -> Dict[str, Dict[str, Any]]:
+    """Return {file: result} for files the manifest records as completed.
+
+    Only successful entries of the same job whose file is unchanged (size
+    and mtime) count; the last entry for a file wins.
+    """
+    completed = {}
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn write from an interrupted run
+                if not isinstance(entry, dict) or entry.get('job') != job:
+                    continue
+                file_path = entry.get('file')
+                if entry.get('status') == 'success' and entry.get('signature') == _file_signature(file_path):
+                    completed[file_path] = entry.get('result')
+                else:
+                    completed.pop(file_path, None)
+    except FileNotFoundError:
+        pass
+    return completed
+
+
+def compact_manifest(manifest_file: str) -> None:
+    """Rewrite the manifest keeping only the last entry per job and file.
+
+    Runs append to the manifest, so without compaction repeated runs of the
+    same batch would grow it without bound.
+    """
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return
+    latest = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # torn write from an interrupted run
+        if isinstance(entry, dict):
+            key = (entry.get('job'), entry.get('file'))
+            latest.pop(key, None)  # re-insert so order follows the last write
+            latest[key] = line if line.endswith('\n') else line + '\n'
+    if len(latest) == len(lines):
+        return
+    tmp = f"{manifest_file}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.writelines(latest.values())
+    os.replace(tmp, manifest_file)
+
+
+def append_manifest(manifest, job: str, file_path: str, result: Dict[str, Any]) -> None:
+    """Append one file's outcome to an open manifest and flush it to disk."""
+    entry = {
+        'job': job,
+        'file': file_path,
+        'signature': _file_signature(file_path),
+        'status': result.get('status'),
+        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'result': result,
+    }
+    manifest.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    manifest.flush()
+
+
+def _markdown_section(number: int, result: Dict[str, Any]) -> str:
+    section = f"## {number}. {result.get('file', 'Unknown')}\n\n"
+    section += f"**Status**: {result.get('status', 'unknown')}\n\n"
+    if result.get('response'):
+        section += f"**Response**:\n\n{result['response']}\n\n"
+    if result.get('error'):
+        section += f"**Error**: {result['error']}\n\n"
+    return section
+
+
+def _csv_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'file': result.get('file', ''),
+        'status': result.get('status', ''),
+        'response': result.get('response', ''),
+        'error': result.get('error', '')
+    }
+
+
+CSV_FIELDS = ['file', 'status', 'response', 'error']
+
+
+class ResultWriter:
+    """Write batch results to the output file in input order as they finish.
+
+    Results that arrive early are held until every earlier file is done, so
+    the output always holds a complete prefix of the batch. The file has the
+    same layout save_results would produce; JSON output gets its closing
+    bracket in close().
+    """
+
+    def __init__(self, output_file: str, format_output: str):
+        self.format_output = format_output
+        self.path = Path(output_file)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._next = 0
+        self._file = open(self.path, 'w', newline='' if format_output == 'csv' else None,
+                          encoding='utf-8')
+        if format_output == 'json':
+            self._file.write('[')
+        elif format_output == 'csv':
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            self._csv.writeheader()
+        else:
+            self._file.write("# Batch Processing Results\n\n")
+
+    def add(self, index: int, result: Dict[str, Any]) -> None:
+        self._pending[index] = result
+        while self._next in self._pending:
+            self._write(self._next, self._pending.pop(self._next))
+            self._next += 1
+        self._file.flush()
+
+    def _write(self, index: int, result: Dict[str, Any]) -> None:
+        if self.format_output == 'json':
+            item = textwrap.indent(json.dumps(result, indent=2), '  ')
+            self._file.write(('\n' if index == 0 else ',\n') + item)
+        elif self.format_output == 'csv':
+            self._csv.writerow(_csv_row(result))
+        else:
+            self._file.write(_markdown_section(index + 1, result))
+
+    def close(self) -> None:
+        if self.format_output == 'json':
+            self._file.write('\n]' if self._next else ']')
+        self._file.close()
+
+
+def _is_asset_output(output_file: str) -> bool:
+    """Check if the output path names a generated image/video, not a report."""
+    return Path(output_file).suffix.lower() in {
+        '.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp', '.mp4', '.mov', '.avi', '.webm'
+    }
 
 
 def batch_process(
@@ -669,9 +1005,24 @@ def batch_process(
     reference_images: Optional[List[str]] = None,
     output_file: Optional[str] = None,
     verbose: bool = False,
-    dry_run: bool = False
+    dry_run: bool = False,
+    concurrency: int = 1,
+    cache: Optional[result_cache.ResultCache] = None,
+    manifest_file: Optional[str] = None,
+    resume: bool = False,
+    registry: Optional[upload_registry.UploadRegistry] = None
 ) -> List[Dict[str, Any]]:
-    """Batch process multiple files."""
+    """Batch process multiple files.
+
+    Input files are sent `concurrency` at a time (default 1, sequential).
+    Results for input files are looked up in and stored to `cache` if given,
+    and File API uploads are reused through `registry`.
+
+    With `manifest_file`, each input file's outcome is appended to a JSONL
+    manifest as soon as it finishes, and `output_file` is written
+    incrementally. With `resume`, files the manifest records as completed
+    for the same job are not sent again.
+    """
     api_key = find_api_key()
     if not api_key:
         print("Error: GEMINI_API_KEY not found")
@@ -688,10 +1039,12 @@ def batch_process(
         print(f"Model: {model}")
         print(f"Task: {task}")
         print(f"Prompt: {prompt}")
+        print(f"Concurrency: {concurrency}")
         return []
 
     client = genai.Client(api_key=api_key)
     results = []
+    writer = None
 
     # For generation tasks without input files, process once
     if task == 'generate' and not files:
@@ -785,29 +1138,63 @@ def batch_process(
             print(f"  Status: {status}")
     else:
         # Process input files
-        for i, file_path in enumerate(files, 1):
-            if verbose:
-                print(f"\n[{i}/{len(files)}] Processing: {file_path}")
+        job = job_id(prompt, model, task, format_output, aspect_ratio)
+        if manifest_file:
+            compact_manifest(manifest_file)
+        completed = load_manifest(manifest_file, job) if manifest_file and resume else {}
+        pending = [i for i, file_path in enumerate(files) if file_path not in completed]
+        if completed:
+            print(f"Resuming: {len(files) - len(pending)} of {len(files)} file(s) already completed")
+
+        if output_file and not _is_asset_output(output_file):
+            writer = ResultWriter(output_file, format_output)
+        manifest = None
+        if manifest_file:
+            Path(manifest_file).parent.mkdir(parents=True, exist_ok=True)
+            # Always append: a run without --resume must not discard the
+            # resume state of earlier runs (the last entry per file wins)
+            manifest = open(manifest_file, 'a', encoding='utf-8')
+
+        results = [None] * len(files)
+        for i, file_path in enumerate(files):
+            if file_path in completed:
+                results[i] = {**completed[file_path], 'file': file_path}
+                if writer:
+                    writer.add(i, results[i])
+
+        def record(local_index: int, result: Dict[str, Any]) -> None:
+            i = pending[local_index]
+            results[i] = result
+            if manifest:
+                append_manifest(manifest, job, files[i], result)
+            if writer:
+                writer.add(i, result)
 
-            result = process_file(
+        try:
+            process_files(
                 client=client,
-                file_path=file_path,
+                files=[files[i] for i in pending],
                 prompt=prompt,
                 model=model,
                 task=task,
                 format_output=format_output,
                 aspect_ratio=aspect_ratio,
-                verbose=verbose
+                verbose=verbose,
+                concurrency=concurrency,
+                cache=cache,
+                on_result=record,
+                registry=registry
             )
-
-            results.append(result)
-
-            if verbose:
-                status = result.get('status', 'unknown')
-                print(f"  Status: {status}")
-
-    # Save results
-    if output_file:
+        finally:
+            if manifest:
+                manifest.close()
+            if writer:
+                writer.close()
+            if registry is not None:
+                registry.flush()
+
+    # Save results (unless they were already written as they finished)
+    if output_file and writer is None:
         save_results(results, output_file, format_output)
 
     return results
@@ -916,26 +1303,15 @@ def save_results(results: List[Dict[str, Any]], output_file: str, format_output:
             json.dump(results, f, indent=2)
     elif format_output == 'csv':
         with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['file', 'status', 'response', 'error']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
             for result in results:
-                writer.writerow({
-                    'file': result.get('file', ''),
-                    'status': result.get('status', ''),
-                    'response': result.get('response', ''),
-                    'error': result.get('error', '')
-                })
+                writer.writerow(_csv_row(result))
     else:  # markdown
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write("# Batch Processing Results\n\n")
             for i, result in enumerate(results, 1):
-                f.write(f"## {i}. {result.get('file', 'Unknown')}\n\n")
-                f.write(f"**Status**: {result.get('status', 'unknown')}\n\n")
-                if result.get('response'):
-                    f.write(f"**Response**:\n\n{result['response']}\n\n")
-                if result.get('error'):
-                    f.write(f"**Error**: {result['error']}\n\n")
+                f.write(_markdown_section(i, result))
 
 
 def main():
@@ -955,6 +1331,22 @@ Examples:
   %(prog)s --files *.pdf --task extract --prompt "Extract data as JSON" \\
     --format json --output results.json
 
+  # Transcribe a folder with 8 requests in flight
+  %(prog)s --files audio/*.mp3 --task transcribe --concurrency 8
+
+  # Stay under a 300 requests/min quota
+  %(prog)s --files images/*.png --task analyze --concurrency 16 --rpm 300
+
+  # Rerun without the result cache (default: ~/.cache/ai-multimodal/results)
+  %(prog)s --files *.mp3 --task transcribe --no-cache
+
+  # Resume an interrupted overnight job (skips files already in the manifest)
+  %(prog)s --files audio/*.mp3 --task transcribe --format json \\
+    --output transcripts.json --resume
+
+  # Many parallel workers with at most 64 MB of inline payloads in flight
+  %(prog)s --files images/*.png --task analyze --concurrency 32 --inline-budget-mb 64
+
   # Generate images
   %(prog)s --task generate --prompt "A mountain landscape" \\
     --model gemini-2.5-flash-image --aspect-ratio 16:9
@@ -987,6 +1379,26 @@ Examples:
                        help='Reference images for video generation (max 3)')
 
     parser.add_argument('--output', help='Output file for results')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Number of files processed in parallel (default: 1)')
+    parser.add_argument('--rpm', type=float,
+                       help='Requests/min limit for the model (default: GEMINI_RATE_LIMITS or adaptive)')
+    parser.add_argument('--tpm', type=float,
+                       help='Tokens/min limit for the model (default: GEMINI_RATE_LIMITS or none)')
+    parser.add_argument('--inline-threshold-mb', type=float,
+                       help='Send files up to this size inline, larger ones via File API (default: 20, max 20)')
+    parser.add_argument('--inline-budget-mb', type=float,
+                       help='Max inline file bytes in flight across parallel workers (default: 128)')
+    parser.add_argument('--manifest',
+                       help='JSONL job manifest updated after each file (default: <output>.manifest.jsonl)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip files the manifest records as completed for the same job')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always call the API and re-upload large files; do not use the result cache or upload registry')
+    parser.add_argument('--cache-dir',
+                       help='Result cache directory (default: ~/.cache/ai-multimodal/results)')
+    parser.add_argument('--cache-max-mb', type=float,
+                       help='Result cache size limit in MB (default: 512)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
     parser.add_argument('--dry-run', action='store_true',
@@ -1016,6 +1428,21 @@ Examples:
         parser.error(str(e))
 
     # Validate arguments
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    if args.rpm is not None or args.tpm is not None:
+        rate_limiter.configure(args.model, rpm=args.rpm, tpm=args.tpm)
+
+    if args.inline_threshold_mb is not None and not 0 <= args.inline_threshold_mb <= inline_budget.MAX_INLINE_MB:
+        parser.error(f"--inline-threshold-mb must be between 0 and {inline_budget.MAX_INLINE_MB}")
+    inline_budget.configure(args.inline_threshold_mb, args.inline_budget_mb)
+
+    if not args.manifest and args.output and args.files:
+        args.manifest = f"{args.output}.manifest.jsonl"
+    if args.resume and not args.manifest:
+        parser.error("--resume requires --manifest or --output")
+
     if args.task not in ['generate', 'generate-video'] and not args.files:
         parser.error("--files required for non-generation tasks")
 
@@ -1031,6 +1458,13 @@ Examples:
         elif args.task == 'extract':
             args.prompt = 'Extract key information'
 
+    cache = None
+    registry = None
+    if not args.no_cache:
+        max_bytes = int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None
+        cache = result_cache.ResultCache(args.cache_dir, max_bytes=max_bytes)
+        registry = upload_registry.UploadRegistry()
+
     # Process files
     files = args.files or []
     results = batch_process(
@@ -1046,7 +1480,12 @@ Examples:
         reference_images=args.reference_images,
         output_file=args.output,
         verbose=args.verbose,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        concurrency=args.concurrency,
+        cache=cache,
+        manifest_file=args.manifest,
+        resume=args.resume,
+        registry=registry
     )
 
     # Print results and summary
@@ -1059,8 +1498,13 @@ Examples:
         failed = len(results) - success
         print(f"{'='*50}")
         print(f"Summary: {len(results)} processed, {success} success, {failed} failed")
+        cached = sum(1 for r in results if r.get('cached'))
+        if cached:
+            print(f"Cached: {cached} result(s) reused without API calls")
         if args.output:
             print(f"Results saved to: {args.output}")
+        if args.manifest:
+            print(f"Job manifest: {args.manifest}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Memory bound for inline request payloads.
+
+Files at or under the inline threshold are read into memory and sent inside
+the request; larger files go through the File API, which the SDK uploads from
+disk in resumable chunks. Inline reads must reserve their size from a
+process-wide byte budget first and keep it until the request returns, so
+concurrent workers wait instead of holding many payloads in memory at once.
+An inline file costs roughly 2-3x its size while in flight (raw bytes plus
+the base64 copy in the JSON request).
+
+Settings (flags override the environment):
+    AI_MULTIMODAL_INLINE_THRESHOLD_MB   inline size limit, at most 20 (default 20)
+    AI_MULTIMODAL_INLINE_BUDGET_MB      inline bytes in flight (default 128)
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+MB = 1024 * 1024
+MAX_INLINE_MB = 20  # Gemini inline request limit
+DEFAULT_BUDGET_MB = 128
+
+
+class ByteBudget:
+    """Counting semaphore measured in bytes."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, int(limit))
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes: int) -> int:
+        """Block until `nbytes` fit in the budget; return the amount reserved.
+
+        Requests larger than the whole budget reserve all of it, so they
+        still run, one at a time.
+        """
+        nbytes = min(max(0, int(nbytes)), self.limit)
+        with self._cond:
+            while self.in_use and self.in_use + nbytes > self.limit:
+                self._cond.wait()
+            self.in_use += nbytes
+        return nbytes
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self.in_use = max(0, self.in_use - nbytes)
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, nbytes: int):
+        reserved = self.acquire(nbytes)
+        try:
+            yield reserved
+        finally:
+            self.release(reserved)
+
+
+def _env_mb(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+_threshold_bytes = int(min(_env_mb('AI_MULTIMODAL_INLINE_THRESHOLD_MB', MAX_INLINE_MB), MAX_INLINE_MB) * MB)
+budget = ByteBudget(_env_mb('AI_MULTIMODAL_INLINE_BUDGET_MB', DEFAULT_BUDGET_MB) * MB)
+
+
+def configure(threshold_mb: Optional[float] = None, budget_mb: Optional[float] = None) -> None:
+    """Set the inline threshold and/or the in-flight budget for this process."""
+    global _threshold_bytes
+    if threshold_mb is not None:
+        _threshold_bytes = int(min(threshold_mb, MAX_INLINE_MB) * MB)
+    if budget_mb is not None:
+        with budget._cond:
+            budget.limit = max(1, int(budget_mb * MB))
+            budget._cond.notify_all()
+
+
+def use_file_api(file_size: int) -> bool:
+    """Check if a file is too large to send inline."""
+    return file_size > _threshold_bytes
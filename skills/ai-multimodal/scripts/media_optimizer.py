@@ -9,6 +9,8 @@ Features:
 - Format conversion
 - Quality vs size optimization
 - Validation before upload
+- Parallel batch mode (--jobs N): ffmpeg work in a process pool with a
+  per-job thread budget, image work in-process on a thread pool
 """
 
 import argparse
@@ -16,6 +18,8 @@ import json
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
@@ -62,6 +66,10 @@ def load_env_files():
 # Load environment variables at module level
 load_env_files()
 
+VIDEO_EXTENSIONS = ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv']
+AUDIO_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.flac', '.aac']
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp']
+
 
 def check_ffmpeg() -> bool:
     """Check if ffmpeg is installed."""
@@ -122,9 +130,14 @@ def optimize_video(
     max_duration: Optional[int] = None,
     quality: int = 23,
     resolution: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    threads: Optional[int] = None
 ) -> bool:
-    """Optimize video file for Gemini API."""
+    """Optimize video file for Gemini API.
+
+    `threads` caps ffmpeg's encoder threads (default: ffmpeg decides,
+    usually one per core).
+    """
     if not check_ffmpeg():
         print("Error: ffmpeg not installed")
         print("Install: apt-get install ffmpeg (Linux) or brew install ffmpeg (Mac)")
@@ -171,6 +184,9 @@ def optimize_video(
         video_bitrate = max(target_bitrate - 128000, 500000)
         cmd.extend(['-b:v', str(video_bitrate)])
 
+    if threads:
+        cmd.extend(['-threads', str(threads)])
+
     cmd.append(output_path)
 
     if verbose:
@@ -204,7 +220,8 @@ def optimize_audio(
     target_size_mb: Optional[int] = None,
     bitrate: str = '64k',
     sample_rate: int = 16000,
-    verbose: bool = False
+    verbose: bool = False,
+    threads: Optional[int] = None
 ) -> bool:
     """Optimize audio file for Gemini API."""
     if not check_ffmpeg():
@@ -228,8 +245,10 @@ def optimize_audio(
         '-b:a', bitrate,
         '-ar', str(sample_rate),
         '-ac', '1',  # Mono (Gemini uses mono anyway)
-        output_path
     ]
+    if threads:
+        cmd.extend(['-threads', str(threads)])
+    cmd.append(output_path)
 
     if verbose:
         print(f"\nOptimizing...")
@@ -355,6 +374,172 @@ def split_video(
     return output_files
 
 
+def _available_cpus() -> int:
+    """CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def ffmpeg_thread_budget(jobs: int, cpus: Optional[int] = None) -> int:
+    """ffmpeg threads per job so `jobs` concurrent encoders share the CPUs."""
+    cpus = cpus or _available_cpus()
+    return max(1, cpus // max(1, jobs))
+
+
+def media_kind(file_path: str) -> Optional[str]:
+    """Return 'video', 'audio' or 'image' for a supported file, else None."""
+    ext = Path(file_path).suffix.lower()
+    if ext in VIDEO_EXTENSIONS:
+        return 'video'
+    if ext in AUDIO_EXTENSIONS:
+        return 'audio'
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    return None
+
+
+def _file_size(file_path: str) -> int:
+    try:
+        return Path(file_path).stat().st_size
+    except OSError:
+        return 0
+
+
+def _optimize_one(kind: Optional[str], input_path: str, output_path: str,
+                  options: Dict[str, Any]) -> Dict[str, Any]:
+    """Optimize one file and report sizes and time (runs in a worker)."""
+    optimizers = {'video': optimize_video, 'audio': optimize_audio, 'image': optimize_image}
+    start = time.monotonic()
+    success = False
+    if kind in optimizers:
+        try:
+            success = optimizers[kind](input_path, output_path, **options)
+        except Exception as e:
+            print(f"Error optimizing {input_path}: {e}")
+    else:
+        print(f"Error: Unsupported file type: {Path(input_path).suffix.lower()}")
+
+    return {
+        'file': input_path,
+        'output': output_path,
+        'kind': kind,
+        'status': 'success' if success else 'error',
+        'input_size': _file_size(input_path),
+        'output_size': _file_size(output_path) if success else 0,
+        'seconds': round(time.monotonic() - start, 2),
+    }
+
+
+def _print_progress(done: int, total: int, result: Dict[str, Any]) -> None:
+    name = Path(result['file']).name
+    if result['status'] == 'success':
+        print(f"[{done}/{total}] {name}: {result['input_size'] / (1024*1024):.2f} MB -> "
+              f"{result['output_size'] / (1024*1024):.2f} MB in {result['seconds']:.1f}s")
+    else:
+        print(f"[{done}/{total}] {name}: failed")
+
+
+def print_batch_summary(results: List[Dict[str, Any]], elapsed: float) -> None:
+    """Print file counts, aggregate compression and throughput."""
+    succeeded = [r for r in results if r['status'] == 'success']
+    print(f"\nProcessed: {len(succeeded)}/{len(results)} files")
+
+    input_bytes = sum(r['input_size'] for r in succeeded)
+    output_bytes = sum(r['output_size'] for r in succeeded)
+    if input_bytes:
+        compression = (1 - output_bytes / input_bytes) * 100
+        print(f"Size: {input_bytes / (1024*1024):.2f} MB -> {output_bytes / (1024*1024):.2f} MB "
+              f"({compression:.1f}% compression)")
+
+    elapsed = max(elapsed, 1e-6)
+    file_seconds = sum(r['seconds'] for r in results)
+    print(f"Wall time: {elapsed:.1f}s (sum of per-file times: {file_seconds:.1f}s)")
+    print(f"Throughput: {input_bytes / (1024*1024) / elapsed:.2f} MB/s, "
+          f"{len(results) / elapsed:.2f} files/s")
+
+
+def batch_optimize(
+    files: List[str],
+    output_dir: str,
+    jobs: int = 1,
+    quality: int = 85,
+    bitrate: str = '64k',
+    max_width: int = 1920,
+    verbose: bool = False
+) -> List[Dict[str, Any]]:
+    """Optimize `files` into `output_dir`, up to `jobs` at a time.
+
+    The CPUs are split into `jobs` slots of cpu_count // jobs each, shared
+    by both kinds of work: at most `jobs` files are in flight in total,
+    whichever pool runs them. Video and audio go to a process pool, and
+    each ffmpeg is limited to one slot's threads. Images run on a thread
+    pool in this process (Pillow releases the GIL while resizing and
+    encoding) and use about one CPU, which fits in a slot. A mixed batch
+    therefore never asks for more than the machine has. With jobs=1 files
+    are processed one at a time and ffmpeg keeps its own thread default.
+
+    Returns per-file results in input order.
+    """
+    jobs = max(1, jobs)
+    threads = ffmpeg_thread_budget(jobs) if jobs > 1 else None
+
+    tasks = []
+    for input_file in files:
+        kind = media_kind(str(input_file))
+        if kind == 'video':
+            options = {'quality': quality, 'verbose': verbose, 'threads': threads}
+        elif kind == 'audio':
+            options = {'bitrate': bitrate, 'verbose': verbose, 'threads': threads}
+        else:
+            options = {'max_width': max_width, 'quality': quality, 'verbose': verbose}
+        tasks.append((kind, str(input_file), str(Path(output_dir) / Path(input_file).name), options))
+
+    if jobs > 1:
+        print(f"Jobs: {jobs} (ffmpeg threads per job: {threads})")
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    start = time.monotonic()
+
+    if jobs == 1:
+        for i, task in enumerate(tasks):
+            results[i] = _optimize_one(*task)
+            _print_progress(i + 1, len(tasks), results[i])
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as process_pool, \
+                ThreadPoolExecutor(max_workers=jobs) as thread_pool:
+            in_flight = {}
+            next_index = 0
+            done = 0
+            while next_index < len(tasks) or in_flight:
+                # Keep `jobs` files in flight across both pools
+                while next_index < len(tasks) and len(in_flight) < jobs:
+                    task = tasks[next_index]
+                    pool = thread_pool if task[0] == 'image' else process_pool
+                    in_flight[pool.submit(_optimize_one, *task)] = next_index
+                    next_index += 1
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = in_flight.pop(future)
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        # Worker process died (e.g. killed for memory)
+                        print(f"Error optimizing {tasks[i][1]}: {e}")
+                        results[i] = {
+                            'file': tasks[i][1], 'output': tasks[i][2], 'kind': tasks[i][0],
+                            'status': 'error', 'input_size': _file_size(tasks[i][1]),
+                            'output_size': 0, 'seconds': 0.0,
+                        }
+                    done += 1
+                    _print_progress(done, len(tasks), results[i])
+
+    print_batch_summary(results, time.monotonic() - start)
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Optimize media files for Gemini API',
@@ -375,6 +560,9 @@ Examples:
 
   # Batch optimize directory
   %(prog)s --input-dir ./videos --output-dir ./optimized --quality 85
+
+  # Batch optimize 4 files at a time (ffmpeg threads split across jobs)
+  %(prog)s --input-dir ./media --output-dir ./optimized --jobs 4
         """
     )
 
@@ -393,6 +581,9 @@ Examples:
     parser.add_argument('--split', action='store_true', help='Split long video into chunks')
     parser.add_argument('--chunk-duration', type=int, default=3600,
                        help='Chunk duration in seconds (default: 3600 = 1 hour)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Files to optimize in parallel in batch mode; ffmpeg '
+                            'threads are split across jobs (default: 1)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
 
     args = parser.parse_args()
@@ -400,6 +591,8 @@ Examples:
     # Validate arguments
     if not args.input and not args.input_dir:
         parser.error("Either --input or --input-dir required")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     # Single file processing
     if args.input:
@@ -423,7 +616,7 @@ Examples:
         # Determine file type
         ext = input_path.suffix.lower()
 
-        if ext in ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv']:
+        if ext in VIDEO_EXTENSIONS:
             success = optimize_video(
                 str(input_path),
                 str(output_path),
@@ -432,7 +625,7 @@ Examples:
                 resolution=args.resolution,
                 verbose=args.verbose
             )
-        elif ext in ['.mp3', '.wav', '.m4a', '.flac', '.aac']:
+        elif ext in AUDIO_EXTENSIONS:
             success = optimize_audio(
                 str(input_path),
                 str(output_path),
@@ -440,7 +633,7 @@ Examples:
                 bitrate=args.bitrate,
                 verbose=args.verbose
             )
-        elif ext in ['.jpg', '.jpeg', '.png', '.webp']:
+        elif ext in IMAGE_EXTENSIONS:
             success = optimize_image(
                 str(input_path),
                 str(output_path),
@@ -478,28 +671,15 @@ Examples:
 
         print(f"Found {len(files)} files to process")
 
-        success_count = 0
-        for input_file in files:
-            output_file = output_dir / input_file.name
-
-            ext = input_file.suffix.lower()
-            success = False
-
-            if ext in ['.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv']:
-                success = optimize_video(str(input_file), str(output_file),
-                                        quality=args.quality, verbose=args.verbose)
-            elif ext in ['.mp3', '.wav', '.m4a', '.flac', '.aac']:
-                success = optimize_audio(str(input_file), str(output_file),
-                                        bitrate=args.bitrate, verbose=args.verbose)
-            elif ext in ['.jpg', '.jpeg', '.png', '.webp']:
-                success = optimize_image(str(input_file), str(output_file),
-                                        max_width=args.max_width, quality=args.quality,
-                                        verbose=args.verbose)
-
-            if success:
-                success_count += 1
-
-        print(f"\nProcessed: {success_count}/{len(files)} files")
+        batch_optimize(
+            [str(f) for f in files],
+            str(output_dir),
+            jobs=args.jobs,
+            quality=args.quality,
+            bitrate=args.bitrate,
+            max_width=args.max_width,
+            verbose=args.verbose
+        )
 
 
 if __name__ == '__main__':
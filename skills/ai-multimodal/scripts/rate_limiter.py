@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Client-side rate limiting for Gemini API calls.
+
+One limiter per model, shared by every thread in the process:
+- Token buckets for requests/min and tokens/min (both optional)
+- Adaptive rate: halved on a 429, raised by one request/min per success
+- Jittered backoff that honors Retry-After headers and RetryInfo delays
+- A throttled model pauses for all callers, so parallel workers back off together
+
+Limits come from GEMINI_RATE_LIMITS or configure():
+    GEMINI_RATE_LIMITS="gemini-2.5-flash=1000/1000000,imagen-4.0-generate-001=10,*=60"
+Each entry is model=rpm[/tpm]; '*' applies to models not listed. Without a
+configured limit a model is unthrottled until its first 429, after which the
+rate starts from half of what was observed in the last minute.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+WINDOW_SECONDS = 60.0
+MIN_RPM = 1.0
+MAX_THROTTLE_RETRIES = 8
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Rough input token costs used before the response reports real usage
+TOKENS_PER_IMAGE = 258
+TOKENS_PER_KB = {
+    'audio/': 2,        # ~32 tokens/s at ~128 kbps
+    'video/': 1,        # ~263 tokens/s at a few Mbps
+    'application/pdf': 3,  # ~258 tokens/page
+    'text/': 256,       # ~4 bytes per token
+}
+
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s")
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Seconds to wait before retry `attempt` (0-based).
+
+    A server-provided Retry-After wins, plus up to `base` seconds of jitter so
+    parallel workers don't retry in lockstep. Otherwise uses exponential
+    backoff with equal jitter: uniform between half and all of base * 2**attempt.
+    """
+    if retry_after is not None:
+        return min(cap, max(0.0, retry_after)) + random.uniform(0, base)
+    delay = min(cap, base * (2 ** attempt))
+    return random.uniform(delay / 2, delay)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extract the server's requested delay from an API error, if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers is not None:
+        try:
+            value = headers.get('retry-after')
+        except Exception:
+            value = None
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+    # google.rpc.RetryInfo, e.g. {'retryDelay': '17s'} in the error details
+    match = _RETRY_DELAY_RE.search(str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+# 429s that waiting will not fix: zero free-tier quota and billing/access
+# problems (same markers gemini_batch_process uses to stop a batch early)
+NOT_RETRYABLE_MARKERS = (
+    'limit: 0',
+    'free_tier',
+    'billing',
+    'billed users',
+    'payment',
+    'access denied',
+    'not authorized',
+    'permission denied',
+)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check if error is a retryable 429 (not a free-tier or billing limit)."""
+    error_str = str(error)
+    lowered = error_str.lower()
+    if any(marker in lowered for marker in NOT_RETRYABLE_MARKERS):
+        return False
+    code = getattr(error, 'code', None)
+    return code == 429 or 'RESOURCE_EXHAUSTED' in error_str or '429 ' in error_str
+
+
+def estimate_tokens(prompt: str, file_path: Optional[str] = None,
+                    mime_type: Optional[str] = None) -> int:
+    """Estimate input tokens for a request before sending it."""
+    tokens = len(prompt or '') // 4 + 1
+    if file_path and mime_type:
+        if mime_type.startswith('image/'):
+            return tokens + TOKENS_PER_IMAGE
+        try:
+            size_kb = Path(file_path).stat().st_size // 1024
+        except OSError:
+            return tokens
+        for prefix, per_kb in TOKENS_PER_KB.items():
+            if mime_type.startswith(prefix):
+                return tokens + size_kb * per_kb
+    return tokens
+
+
+def response_tokens(response: Any) -> Optional[int]:
+    """Total tokens reported by a generate_content response, if available."""
+    usage = getattr(response, 'usage_metadata', None)
+    total = getattr(usage, 'total_token_count', None)
+    return total if isinstance(total, int) else None
+
+
+class RateLimiter:
+    """Token-bucket limiter for one model with adaptive request rate."""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.max_rpm = rpm
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        now = clock()
+        self._requests = float(rpm) if rpm else 0.0
+        self._tokens = float(tpm) if tpm else 0.0
+        self._updated = now
+        self._paused_until = 0.0
+        self._throttle_streak = 0
+        self._sent = deque()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / WINDOW_SECONDS)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / WINDOW_SECONDS)
+        while self._sent and now - self._sent[0] > WINDOW_SECONDS:
+            self._sent.popleft()
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request of `tokens` input tokens may be sent.
+
+        Returns the number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                need = min(tokens, self.tpm) if self.tpm else 0
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    wait = 0.0
+                    if self.rpm and self._requests < 1:
+                        wait = (1 - self._requests) * WINDOW_SECONDS / self.rpm
+                    if self.tpm and self._tokens < need:
+                        wait = max(wait, (need - self._tokens) * WINDOW_SECONDS / self.tpm)
+                    if wait <= 0:
+                        if self.rpm:
+                            self._requests -= 1
+                        if self.tpm:
+                            self._tokens -= need
+                        self._sent.append(now)
+                        return waited
+            self._sleep(wait)
+            waited += wait
+
+    def on_success(self, estimated: int = 0, used: Optional[int] = None) -> None:
+        """Record a successful call: grow the rate and settle the token estimate."""
+        with self._lock:
+            self._throttle_streak = 0
+            if self.rpm is not None:
+                self.rpm += 1
+                if self.max_rpm is not None:
+                    self.rpm = min(self.rpm, self.max_rpm)
+            if self.tpm and used is not None:
+                charged = min(estimated, self.tpm)
+                self._tokens = max(-self.tpm, self._tokens - (used - charged))
+
+    def on_throttle(self, error: Optional[Exception] = None) -> float:
+        """Record a 429: halve the rate and pause every caller of this model.
+
+        The rate is halved once per throttle window: 429s that arrive while
+        a pause is already running (a wave of concurrent requests hitting
+        the same quota) only extend the pause to any longer server hint.
+
+        Returns the pause length in seconds.
+        """
+        retry_after = retry_after_seconds(error) if error is not None else None
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._paused_until:
+                if retry_after is not None:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+                return self._paused_until - now
+            current = self.rpm if self.rpm else max(float(len(self._sent)), MIN_RPM)
+            self.rpm = max(MIN_RPM, current / 2)
+            self._requests = min(self._requests, self.rpm)
+            delay = backoff_delay(self._throttle_streak, retry_after)
+            self._throttle_streak += 1
+            self._paused_until = max(self._paused_until, now + delay)
+            return delay
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_configured: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+_registry_lock = threading.Lock()
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """Parse 'model=rpm[/tpm],...' into {model: (rpm, tpm)}."""
+    limits = {}
+    for entry in spec.split(','):
+        entry = entry.strip()
+        if not entry or '=' not in entry:
+            continue
+        model, value = entry.split('=', 1)
+        rpm, _, tpm = value.partition('/')
+        limits[model.strip()] = (float(rpm) if rpm.strip() else None,
+                                 float(tpm) if tpm.strip() else None)
+    return limits
+
+
+def configure(model: str, rpm: Optional[float] = None, tpm: Optional[float] = None) -> None:
+    """Set the limits for a model ('*' for the default), replacing its limiter."""
+    with _registry_lock:
+        _configured[model] = (rpm, tpm)
+        if model == '*':
+            _limiters.clear()
+        else:
+            _limiters.pop(model, None)
+
+
+def _limits_for(model: str) -> Tuple[Optional[float], Optional[float]]:
+    env_limits = parse_limits(os.getenv('GEMINI_RATE_LIMITS', ''))
+    for table in (_configured, env_limits):
+        if model in table:
+            return table[model]
+    for table in (_configured, env_limits):
+        if '*' in table:
+            return table['*']
+    return None, None
+
+
+def get_limiter(model: str) -> RateLimiter:
+    """Return the process-wide limiter for a model."""
+    with _registry_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            rpm, tpm = _limits_for(model)
+            limiter = _limiters[model] = RateLimiter(rpm=rpm, tpm=tpm)
+        return limiter
+
+
+def call_with_rate_limit(model: str, call: Callable[[], Any], tokens: int = 0,
+                         verbose: bool = False,
+                         max_throttle_retries: int = MAX_THROTTLE_RETRIES) -> Any:
+    """Run `call()` under the model's limiter, waiting out 429 responses.
+
+    Rate limit errors are retried up to `max_throttle_retries` times without
+    counting against the caller's own retries; any other error propagates.
+    """
+    limiter = get_limiter(model)
+    for throttled in range(max_throttle_retries + 1):
+        limiter.acquire(tokens)
+        try:
+            result = call()
+        except Exception as e:
+            if not is_rate_limit_error(e) or throttled == max_throttle_retries:
+                raise
+            delay = limiter.on_throttle(e)
+            if verbose:
+                print(f"  Rate limited on {model}, backing off {delay:.1f}s")
+            continue
+        limiter.on_success(estimated=tokens, used=response_tokens(result))
+        return result
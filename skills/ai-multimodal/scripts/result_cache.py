@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for Gemini results.
+
+Entries are keyed by the input file's SHA-256 plus every request parameter
+that changes the answer (prompt, model, task, output format, aspect ratio),
+so renaming or moving a file still hits and editing it misses. Each entry is a
+small JSON file holding the result dict (response text and generated-asset
+paths); entries whose generated assets were deleted count as misses.
+
+The cache is bounded by size: after a write pushes it past the limit, the
+least recently used entries are removed.
+
+Location: ~/.cache/ai-multimodal/results (AI_MULTIMODAL_CACHE_DIR overrides
+the ~/.cache/ai-multimodal root). Size: 512 MB (AI_MULTIMODAL_CACHE_MAX_MB).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_VERSION = 1
+DEFAULT_MAX_MB = 512
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def cache_root() -> Path:
+    """Root directory for ai-multimodal caches."""
+    override = os.getenv('AI_MULTIMODAL_CACHE_DIR')
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / '.cache' / 'ai-multimodal'
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash: str, **params: Any) -> str:
+    """Key for a content hash plus the request parameters that shape the result."""
+    payload = json.dumps([CACHE_VERSION, content_hash, params], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded on-disk result cache with LRU eviction."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else cache_root() / 'results'
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('AI_MULTIMODAL_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        result = entry.get('result') if isinstance(entry, dict) else None
+        if result is not None:
+            assets = entry.get('assets', [])
+            if all(Path(asset).exists() for asset in assets):
+                try:
+                    os.utime(path)  # mark as recently used
+                except OSError:
+                    pass
+                with self._lock:
+                    self.hits += 1
+                return result
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result, evicting old entries if the cache grows too large."""
+        assets = []
+        for field in ('generated_image', 'generated_video'):
+            if result.get(field):
+                assets.append(result[field])
+        assets.extend(result.get('generated_images') or [])
+
+        path = self._path(key)
+        data = json.dumps({'result': result, 'assets': assets}, ensure_ascii=False).encode('utf-8')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            old_size = path.stat().st_size if path.exists() else 0
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob('*/*.json'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the size limit."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
@@ -2,8 +2,10 @@
 Tests for document_converter.py
 """
 
+import json
 import pytest
 import sys
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, mock_open
 
@@ -56,6 +58,120 @@ class TestMimeType:
         assert dc.get_mime_type('file.unknown') == 'application/octet-stream'
 
 
+class TestBatchConvert:
+    """Test concurrent batch conversion."""
+
+    @patch('document_converter.find_api_key', return_value='test-key')
+    @patch('document_converter.genai.Client')
+    @patch('document_converter.convert_to_markdown')
+    def test_concurrent_output_in_input_order(self, mock_convert, mock_client_class,
+                                              mock_find_key, tmp_path):
+        """Test sections are written in input order and markdown is released."""
+        def fake_convert(**kwargs):
+            index = int(Path(kwargs['file_path']).stem)
+            time.sleep(0.01 * (4 - index))  # later files finish first
+            return {'file': kwargs['file_path'], 'status': 'success', 'markdown': f'Doc {index}'}
+
+        mock_convert.side_effect = fake_convert
+        files = [f'{i}.pdf' for i in range(4)]
+        output = tmp_path / 'out.md'
+
+        results = dc.batch_convert(files, output_file=str(output), concurrency=4)
+
+        text = output.read_text()
+        positions = [text.index(f'Doc {i}') for i in range(4)]
+        assert positions == sorted(positions)
+        assert text.index('## 0.pdf') < positions[0]
+        assert [r['file'] for r in results] == files
+        assert all('markdown' not in r and r['markdown_chars'] == 5 for r in results)
+        assert all('seconds' in r for r in results)
+
+    @patch('document_converter.find_api_key', return_value='test-key')
+    @patch('document_converter.genai.Client')
+    @patch('document_converter.convert_to_markdown')
+    def test_rerun_converts_only_changed_documents(self, mock_convert, mock_client_class,
+                                                   mock_find_key, tmp_path):
+        """Test unchanged documents come from the conversion store."""
+        mock_convert.side_effect = lambda **kwargs: {
+            'file': kwargs['file_path'], 'status': 'success',
+            'markdown': f"Text of {Path(kwargs['file_path']).read_text()}"
+        }
+        a = tmp_path / 'a.txt'
+        b = tmp_path / 'b.txt'
+        a.write_text('alpha')
+        b.write_text('beta')
+        output = tmp_path / 'out.md'
+        store = dc.result_cache.ResultCache(str(tmp_path / 'store'))
+
+        dc.batch_convert([str(a), str(b)], output_file=str(output), store=store)
+        b.write_text('beta v2')
+        results = dc.batch_convert([str(a), str(b)], output_file=str(output), store=store)
+
+        assert mock_convert.call_count == 3
+        assert mock_convert.call_args.kwargs['file_path'] == str(b)
+        assert [bool(r.get('cached')) for r in results] == [True, False]
+        text = output.read_text()
+        assert 'Text of alpha' in text and 'Text of beta v2' in text
+        manifest = json.loads((tmp_path / 'out.manifest.json').read_text())
+        assert [d['cached'] for d in manifest['documents']] == [True, False]
+
+
+class TestChunkedPdf:
+    """Test page-range chunking and stitching."""
+
+    def test_stitch_keeps_single_title(self):
+        """Test later chunks reusing the title level are demoted."""
+        markdown = dc.stitch_chunks([
+            '# Manual\n\n## Install\n\nSteps',
+            '# Configure\n\nOptions',
+        ])
+        assert [line for line in markdown.splitlines() if line.startswith('# ')] == ['# Manual']
+        assert '## Configure' in markdown
+
+    def test_stitch_drops_repeated_running_heading(self):
+        """Test a heading re-emitted at a chunk start is removed."""
+        markdown = dc.stitch_chunks([
+            '## Install\n\nStep 1',
+            '## Install\n\nStep 2',
+        ])
+        assert markdown.count('## Install') == 1
+        assert markdown.index('Step 1') < markdown.index('Step 2')
+
+    def test_stitch_unwraps_fences_and_marks_pages(self):
+        """Test markdown fences are removed and page ranges noted."""
+        markdown = dc.stitch_chunks(['```markdown\nText A\n```', 'Text B'], [(1, 50), (51, 80)])
+        assert '```' not in markdown
+        assert '<!-- pages 51-80 -->' in markdown
+
+    @patch('document_converter.convert_to_markdown')
+    def test_convert_pdf_chunked_in_page_order(self, mock_convert, tmp_path):
+        """Test a long PDF is split and chunk results stitched in order."""
+        pypdf = pytest.importorskip('pypdf')
+        writer = pypdf.PdfWriter()
+        for _ in range(5):
+            writer.add_blank_page(width=72, height=72)
+        pdf = tmp_path / 'manual.pdf'
+        with open(pdf, 'wb') as f:
+            writer.write(f)
+
+        def fake_convert(**kwargs):
+            pages = len(pypdf.PdfReader(kwargs['file_path']).pages)
+            start = kwargs['custom_prompt'].split('These are pages ')[1].split('-')[0]
+            time.sleep(0.01 * (5 - int(start)))
+            return {'file': kwargs['file_path'], 'status': 'success',
+                    'markdown': f'Chunk from page {start} ({pages} pages)'}
+
+        mock_convert.side_effect = fake_convert
+
+        result = dc.convert_pdf_chunked(Mock(), str(pdf), pages_per_chunk=2)
+
+        assert result['status'] == 'success'
+        assert result['chunks'] == 3
+        markdown = result['markdown']
+        assert (markdown.index('page 1 (2 pages)') < markdown.index('page 3 (2 pages)')
+                < markdown.index('page 5 (1 pages)'))
+
+
 class TestIntegration:
     """Integration tests."""
 
@@ -2,8 +2,10 @@
 Tests for gemini_batch_process.py
 """
 
+import json
 import pytest
 import sys
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
@@ -310,6 +312,156 @@ class TestBatchProcessing:
 
         assert results == []
 
+    @patch('gemini_batch_process.process_file')
+    def test_process_files_concurrent_keeps_order(self, mock_process):
+        """Test concurrent processing returns results in input order."""
+        def fake_process(**kwargs):
+            # Earlier files finish last
+            time.sleep(0.01 * (5 - int(Path(kwargs['file_path']).stem)))
+            return {'file': kwargs['file_path'], 'status': 'success'}
+
+        mock_process.side_effect = fake_process
+        files = [f'{i}.jpg' for i in range(5)]
+
+        results = gbp.process_files(
+            client=Mock(),
+            files=files,
+            prompt='Analyze',
+            model='gemini-2.5-flash',
+            task='analyze',
+            format_output='text',
+            concurrency=4
+        )
+
+        assert [r['file'] for r in results] == files
+        assert mock_process.call_count == 5
+
+    @patch('gemini_batch_process.process_file')
+    def test_process_files_stops_on_billing_error(self, mock_process):
+        """Test remaining files are skipped after a billing error."""
+        mock_process.side_effect = [
+            {'file': '0.jpg', 'status': 'success'},
+            {'file': '1.jpg', 'status': 'error', 'error': 'Requires billing enabled'},
+        ]
+        files = [f'{i}.jpg' for i in range(4)]
+
+        results = gbp.process_files(
+            client=Mock(),
+            files=files,
+            prompt='Analyze',
+            model='gemini-2.5-flash',
+            task='analyze',
+            format_output='text',
+            concurrency=1
+        )
+
+        assert mock_process.call_count == 2
+        assert [r['file'] for r in results] == files
+        assert results[2]['status'] == 'error'
+        assert results[3]['error'].startswith('Skipped')
+
+
+class TestResumableJobs:
+    """Test job manifest, resume and incremental output."""
+
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_resume_skips_completed_files(self, mock_client_class, mock_process,
+                                          mock_find_key, tmp_path):
+        """Test a resumed job only sends files that did not succeed."""
+        mock_find_key.return_value = 'test_key'
+        files = []
+        for name in ('a.jpg', 'b.jpg', 'c.jpg'):
+            path = tmp_path / name
+            path.write_bytes(name.encode())
+            files.append(str(path))
+        manifest = str(tmp_path / 'job.manifest.jsonl')
+        output = str(tmp_path / 'out.json')
+        kwargs = dict(files=files, prompt='Analyze', model='gemini-2.5-flash',
+                      task='analyze', format_output='json', output_file=output,
+                      manifest_file=manifest)
+
+        mock_process.side_effect = lambda **kw: (
+            {'file': kw['file_path'], 'status': 'error', 'error': 'API Error'}
+            if kw['file_path'].endswith('b.jpg')
+            else {'file': kw['file_path'], 'status': 'success', 'response': 'ok'}
+        )
+        gbp.batch_process(**kwargs)
+        assert mock_process.call_count == 3
+
+        mock_process.reset_mock()
+        mock_process.side_effect = lambda **kw: {
+            'file': kw['file_path'], 'status': 'success', 'response': 'retried'
+        }
+        results = gbp.batch_process(resume=True, **kwargs)
+
+        assert mock_process.call_count == 1
+        assert mock_process.call_args.kwargs['file_path'] == files[1]
+        assert [r['response'] for r in results] == ['ok', 'retried', 'ok']
+        with open(output) as f:
+            assert json.load(f) == results
+
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_run_without_resume_keeps_manifest(self, mock_client_class, mock_process,
+                                               mock_find_key, tmp_path):
+        """Test a run without --resume appends instead of truncating."""
+        mock_find_key.return_value = 'test_key'
+        mock_process.side_effect = lambda **kw: {
+            'file': kw['file_path'], 'status': 'success', 'response': 'ok'
+        }
+        files = []
+        for name in ('a.jpg', 'b.jpg'):
+            path = tmp_path / name
+            path.write_bytes(name.encode())
+            files.append(str(path))
+        kwargs = dict(prompt='Analyze', model='gemini-2.5-flash', task='analyze',
+                      format_output='json', output_file=str(tmp_path / 'out.json'),
+                      manifest_file=str(tmp_path / 'job.manifest.jsonl'))
+
+        gbp.batch_process(files=files, **kwargs)
+        gbp.batch_process(files=files[:1], **kwargs)
+        mock_process.reset_mock()
+        gbp.batch_process(files=files, resume=True, **kwargs)
+
+        mock_process.assert_not_called()
+        gbp.batch_process(files=files, **kwargs)
+        gbp.compact_manifest(kwargs['manifest_file'])
+        with open(kwargs['manifest_file']) as f:
+            assert [json.loads(line)['file'] for line in f] == files
+
+    def test_load_manifest_ignores_other_jobs_and_changed_files(self, tmp_path):
+        """Test only unchanged files from the same job count as completed."""
+        image = tmp_path / 'a.jpg'
+        image.write_bytes(b'v1')
+        manifest = tmp_path / 'job.manifest.jsonl'
+        with open(manifest, 'w') as f:
+            gbp.append_manifest(f, 'job1', str(image), {'status': 'success'})
+            f.write('{"truncated')
+
+        assert str(image) in gbp.load_manifest(str(manifest), 'job1')
+        assert gbp.load_manifest(str(manifest), 'job2') == {}
+
+        image.write_bytes(b'v2-changed')
+        assert gbp.load_manifest(str(manifest), 'job1') == {}
+
+    def test_result_writer_matches_save_results(self, tmp_path):
+        """Test out-of-order incremental output equals save_results output."""
+        results = [{'file': f'{i}.jpg', 'status': 'success', 'response': f'R{i}'} for i in range(3)]
+        for format_output, suffix in (('json', '.json'), ('csv', '.csv'), ('markdown', '.md')):
+            expected = tmp_path / f'expected{suffix}'
+            actual = tmp_path / f'actual{suffix}'
+            gbp.save_results(results, str(expected), format_output)
+
+            writer = gbp.ResultWriter(str(actual), format_output)
+            for i in (2, 0, 1):
+                writer.add(i, results[i])
+            writer.close()
+
+            assert actual.read_text() == expected.read_text()
+
 
 class TestResultsSaving:
     """Test results saving functionality."""
@@ -0,0 +1,136 @@
+"""
+Tests for inline_budget.py
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import inline_budget as ib
+import gemini_batch_process as gbp
+import document_converter as dc
+
+
+class TestByteBudget:
+    """Test the byte-counting semaphore."""
+
+    def test_acquire_blocks_until_release(self):
+        """Test a reservation waits while the budget is full."""
+        budget = ib.ByteBudget(100)
+        budget.acquire(80)
+        acquired = threading.Event()
+
+        def worker():
+            budget.acquire(50)
+            acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.05)
+        assert not acquired.is_set()
+
+        budget.release(80)
+        thread.join(timeout=1)
+        assert acquired.is_set()
+        assert budget.in_use == 50
+
+    def test_oversized_request_takes_whole_budget(self):
+        """Test a request above the limit still runs, alone."""
+        budget = ib.ByteBudget(100)
+        with budget.reserve(500) as reserved:
+            assert reserved == 100
+            assert budget.in_use == 100
+        assert budget.in_use == 0
+
+
+class TestInlineThreshold:
+    """Test the inline/File API switch."""
+
+    def test_configure_threshold(self):
+        """Test threshold changes and the 20MB cap."""
+        try:
+            ib.configure(threshold_mb=1)
+            assert ib.use_file_api(2 * ib.MB)
+            assert not ib.use_file_api(ib.MB)
+
+            ib.configure(threshold_mb=100)
+            assert ib.use_file_api(21 * ib.MB)
+        finally:
+            ib.configure(threshold_mb=ib.MAX_INLINE_MB)
+
+    def test_process_file_releases_budget(self, tmp_path):
+        """Test inline bytes are returned to the budget after a failure."""
+        image = tmp_path / 'photo.jpg'
+        image.write_bytes(b'x' * 1024)
+        mock_client = Mock()
+        mock_client.models.generate_content.side_effect = Exception('API Error')
+
+        result = gbp.process_file(
+            client=mock_client,
+            file_path=str(image),
+            prompt='Describe',
+            model='gemini-2.5-flash',
+            task='analyze',
+            format_output='text',
+            max_retries=1
+        )
+
+        assert result['status'] == 'error'
+        assert ib.budget.in_use == 0
+
+    def test_budget_not_held_during_retry_wait(self, tmp_path):
+        """Test the inline reservation is returned before backing off."""
+        image = tmp_path / 'photo.jpg'
+        image.write_bytes(b'x' * 1024)
+        mock_client = Mock()
+        held = []
+
+        def fake_generate(**kwargs):
+            held.append(ib.budget.in_use)
+            raise Exception('API Error')
+
+        mock_client.models.generate_content.side_effect = fake_generate
+
+        with patch('gemini_batch_process.time.sleep') as mock_sleep:
+            mock_sleep.side_effect = lambda seconds: held.append(ib.budget.in_use)
+            gbp.process_file(
+                client=mock_client,
+                file_path=str(image),
+                prompt='Describe',
+                model='gemini-2.5-flash',
+                task='analyze',
+                format_output='text',
+                max_retries=2
+            )
+
+        assert held == [1024, 0, 1024]
+
+    def test_converter_budget_not_held_during_retry_wait(self, tmp_path):
+        """Test document conversion also returns the reservation before backing off."""
+        pdf = tmp_path / 'doc.pdf'
+        pdf.write_bytes(b'x' * 2048)
+        mock_client = Mock()
+        held = []
+
+        def fake_generate(**kwargs):
+            held.append(ib.budget.in_use)
+            raise Exception('API Error')
+
+        mock_client.models.generate_content.side_effect = fake_generate
+
+        with patch('document_converter.time.sleep') as mock_sleep:
+            mock_sleep.side_effect = lambda seconds: held.append(ib.budget.in_use)
+            result = dc.convert_to_markdown(mock_client, str(pdf), max_retries=2)
+
+        assert result['status'] == 'error'
+        assert held == [2048, 0, 2048]
+        assert ib.budget.in_use == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v', '--cov=inline_budget', '--cov-report=term-missing'])
@@ -4,6 +4,9 @@ Tests for media_optimizer.py
 
 import pytest
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import json
@@ -321,6 +324,90 @@ class TestImageOptimization:
             assert result is False
 
 
+class TestBatchOptimize:
+    """Test the parallel batch scheduler."""
+
+    def test_ffmpeg_thread_budget(self):
+        """Test CPUs are split across jobs, at least one thread each."""
+        assert mo.ffmpeg_thread_budget(4, cpus=16) == 4
+        assert mo.ffmpeg_thread_budget(3, cpus=8) == 2
+        assert mo.ffmpeg_thread_budget(32, cpus=8) == 1
+
+    @patch('media_optimizer.check_ffmpeg')
+    @patch('media_optimizer.get_media_info')
+    @patch('subprocess.run')
+    def test_optimize_video_passes_threads(self, mock_run, mock_info, mock_check):
+        """Test the thread budget reaches the ffmpeg command."""
+        mock_check.return_value = True
+        mock_info.return_value = {'size': 1024, 'duration': 10.0, 'bit_rate': 1000}
+
+        mo.optimize_video('input.mp4', 'output.mp4', threads=2)
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index('-threads') + 1] == '2'
+        assert cmd[-1] == 'output.mp4'
+
+    @patch('media_optimizer.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('media_optimizer._available_cpus', return_value=8)
+    @patch('media_optimizer.optimize_image')
+    @patch('media_optimizer.optimize_video')
+    def test_batch_results_and_summary(self, mock_video, mock_image, mock_cpus,
+                                       tmp_path, capsys):
+        """Test per-job threads, input-order results and the aggregate summary."""
+        def fake_optimize(input_path, output_path, **kwargs):
+            Path(output_path).write_bytes(b'x' * 250)
+            return True
+
+        mock_video.side_effect = fake_optimize
+        mock_image.side_effect = fake_optimize
+        files = []
+        for name in ['a.mp4', 'b.jpg', 'c.mp4']:
+            path = tmp_path / name
+            path.write_bytes(b'x' * 1000)
+            files.append(str(path))
+        out_dir = tmp_path / 'out'
+        out_dir.mkdir()
+
+        results = mo.batch_optimize(files, str(out_dir), jobs=2)
+
+        assert [r['file'] for r in results] == files
+        assert [r['kind'] for r in results] == ['video', 'image', 'video']
+        assert all(r['status'] == 'success' and r['output_size'] == 250 for r in results)
+        assert all(c.kwargs['threads'] == 4 for c in mock_video.call_args_list)
+        assert 'threads' not in mock_image.call_args.kwargs
+        output = capsys.readouterr().out
+        assert 'Processed: 3/3 files' in output
+        assert '(75.0% compression)' in output
+        assert 'Throughput:' in output
+
+    @patch('media_optimizer.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('media_optimizer.optimize_image')
+    @patch('media_optimizer.optimize_video')
+    def test_mixed_batch_shares_job_slots(self, mock_video, mock_image, tmp_path):
+        """Test image and ffmpeg work together never exceed `jobs` files."""
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def fake_optimize(input_path, output_path, **kwargs):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return True
+
+        mock_video.side_effect = fake_optimize
+        mock_image.side_effect = fake_optimize
+        files = [str(tmp_path / f'{i}.{ext}') for i in range(4) for ext in ('mp4', 'png')]
+
+        results = mo.batch_optimize(files, str(tmp_path), jobs=3)
+
+        assert peak[0] == 3
+        assert all(r['status'] == 'success' for r in results)
+
+
 class TestVideoSplitting:
     """Test video splitting functionality."""
 
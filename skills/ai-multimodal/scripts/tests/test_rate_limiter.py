@@ -0,0 +1,171 @@
+"""
+Tests for rate_limiter.py
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import rate_limiter as rl
+
+
+class FakeClock:
+    """Manual clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestBackoff:
+    """Test backoff and Retry-After parsing."""
+
+    def test_backoff_delay_jitter_range(self):
+        """Test exponential backoff stays within its jitter range."""
+        for attempt in range(4):
+            delay = rl.backoff_delay(attempt)
+            assert 2 ** attempt / 2 <= delay <= 2 ** attempt
+
+    def test_backoff_delay_honors_retry_after(self):
+        """Test server-provided delay takes priority."""
+        delay = rl.backoff_delay(0, retry_after=17)
+        assert 17 <= delay <= 18
+
+    def test_retry_after_header(self):
+        """Test Retry-After header on the error response."""
+        error = Exception('429')
+        error.response = Mock(headers={'retry-after': '12'})
+        assert rl.retry_after_seconds(error) == 12.0
+
+    def test_retry_after_from_retry_info(self):
+        """Test retryDelay in google.rpc.RetryInfo details."""
+        error = Exception("429 RESOURCE_EXHAUSTED. {'retryDelay': '31s'}")
+        assert rl.retry_after_seconds(error) == 31.0
+
+    def test_rate_limit_error_detection(self):
+        """Test 429s are retryable but zero free-tier quota is not."""
+        assert rl.is_rate_limit_error(Exception('429 RESOURCE_EXHAUSTED'))
+        assert not rl.is_rate_limit_error(Exception('RESOURCE_EXHAUSTED limit: 0'))
+        assert not rl.is_rate_limit_error(Exception('API Error'))
+
+
+class TestRateLimiter:
+    """Test token bucket and adaptive rate."""
+
+    def test_requests_per_minute(self):
+        """Test requests beyond the bucket wait for refill."""
+        clock = FakeClock()
+        limiter = rl.RateLimiter(rpm=60, clock=clock, sleep=clock.sleep)
+
+        for _ in range(60):
+            assert limiter.acquire() == 0
+        waited = limiter.acquire()
+
+        assert waited == pytest.approx(1.0)
+
+    def test_tokens_per_minute(self):
+        """Test large requests wait for the token bucket."""
+        clock = FakeClock()
+        limiter = rl.RateLimiter(tpm=1000, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire(tokens=1000)
+        waited = limiter.acquire(tokens=500)
+
+        assert waited == pytest.approx(30.0)
+
+    def test_throttle_halves_rate_and_pauses(self):
+        """Test a 429 halves the rate and pauses all callers."""
+        clock = FakeClock()
+        limiter = rl.RateLimiter(rpm=100, clock=clock, sleep=clock.sleep)
+
+        delay = limiter.on_throttle(Exception("RESOURCE_EXHAUSTED {'retryDelay': '5s'}"))
+
+        assert limiter.rpm == 50
+        assert 5 <= delay <= 6
+        assert limiter.acquire() == pytest.approx(delay)
+
+    def test_concurrent_throttles_halve_once(self):
+        """Test a wave of 429s during one pause halves the rate once."""
+        clock = FakeClock()
+        limiter = rl.RateLimiter(rpm=300, clock=clock, sleep=clock.sleep)
+
+        delays = [limiter.on_throttle(Exception('429 RESOURCE_EXHAUSTED')) for _ in range(16)]
+
+        assert limiter.rpm == 150
+        assert max(delays) == delays[0]
+
+        clock.sleep(delays[0])
+        limiter.on_throttle(Exception('429 RESOURCE_EXHAUSTED'))
+        assert limiter.rpm == 75
+
+    def test_success_raises_rate_up_to_ceiling(self):
+        """Test additive increase stops at the configured limit."""
+        limiter = rl.RateLimiter(rpm=10)
+        limiter.rpm = 9
+
+        limiter.on_success()
+        limiter.on_success()
+
+        assert limiter.rpm == 10
+
+
+class TestCallWithRateLimit:
+    """Test the call wrapper used by the scripts."""
+
+    @patch('rate_limiter.get_limiter')
+    def test_retries_rate_limit_errors(self, mock_get_limiter):
+        """Test 429s are retried and the result returned."""
+        limiter = Mock()
+        limiter.on_throttle.return_value = 0
+        mock_get_limiter.return_value = limiter
+        call = Mock(side_effect=[Exception('429 RESOURCE_EXHAUSTED'), 'ok'])
+
+        assert rl.call_with_rate_limit('gemini-2.5-flash', call) == 'ok'
+        assert call.call_count == 2
+        limiter.on_throttle.assert_called_once()
+        limiter.on_success.assert_called_once()
+
+    @patch('rate_limiter.get_limiter')
+    def test_other_errors_propagate(self, mock_get_limiter):
+        """Test non-429 errors are left to the caller's retry logic."""
+        mock_get_limiter.return_value = Mock()
+        call = Mock(side_effect=Exception('API Error'))
+
+        with pytest.raises(Exception, match='API Error'):
+            rl.call_with_rate_limit('gemini-2.5-flash', call)
+        assert call.call_count == 1
+
+    @patch('rate_limiter.get_limiter')
+    def test_free_tier_and_billing_429s_not_retried(self, mock_get_limiter):
+        """Test quota/billing 429s reach the caller at once so the batch can stop."""
+        limiter = Mock()
+        mock_get_limiter.return_value = limiter
+        for message in ("429 RESOURCE_EXHAUSTED quotaId: GenerateRequestsPerDayPerProjectPerModel-FreeTier "
+                        "quotaMetric: generativelanguage.googleapis.com/generate_requests_free_tier",
+                        '429 RESOURCE_EXHAUSTED: billing account has no remaining credit'):
+            call = Mock(side_effect=Exception(message))
+
+            with pytest.raises(Exception):
+                rl.call_with_rate_limit('gemini-2.5-flash', call)
+            assert call.call_count == 1
+        limiter.on_throttle.assert_not_called()
+
+    def test_parse_limits(self):
+        """Test GEMINI_RATE_LIMITS parsing."""
+        limits = rl.parse_limits('gemini-2.5-flash=1000/1000000, imagen-4.0-generate-001=10')
+        assert limits['gemini-2.5-flash'] == (1000.0, 1000000.0)
+        assert limits['imagen-4.0-generate-001'] == (10.0, None)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v', '--cov=rate_limiter', '--cov-report=term-missing'])
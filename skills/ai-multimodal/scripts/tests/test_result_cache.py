@@ -0,0 +1,127 @@
+"""
+Tests for result_cache.py
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import result_cache as rc
+import gemini_batch_process as gbp
+import upload_registry
+
+
+class TestCacheKey:
+    """Test content hashing and keys."""
+
+    def test_hash_depends_on_content_only(self, tmp_path):
+        """Test identical content under different names hashes the same."""
+        a = tmp_path / 'a.jpg'
+        b = tmp_path / 'b.jpg'
+        a.write_bytes(b'same')
+        b.write_bytes(b'same')
+        assert rc.hash_file(str(a)) == rc.hash_file(str(b))
+
+    def test_key_depends_on_params(self):
+        """Test every request parameter changes the key."""
+        base = rc.cache_key('abc', prompt='p', model='m', task='analyze')
+        assert base == rc.cache_key('abc', task='analyze', model='m', prompt='p')
+        assert base != rc.cache_key('abc', prompt='p2', model='m', task='analyze')
+        assert base != rc.cache_key('abd', prompt='p', model='m', task='analyze')
+
+
+class TestResultCache:
+    """Test storing, lookup and eviction."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test a stored result is returned and counted as a hit."""
+        cache = rc.ResultCache(str(tmp_path))
+        cache.put('k1', {'status': 'success', 'response': 'Test'})
+
+        assert cache.get('k1')['response'] == 'Test'
+        assert cache.get('k2') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_missing_asset_is_a_miss(self, tmp_path):
+        """Test entries whose generated files were deleted are ignored."""
+        image = tmp_path / 'out.png'
+        image.write_bytes(b'png')
+        cache = rc.ResultCache(str(tmp_path / 'cache'))
+        cache.put('k1', {'status': 'success', 'generated_image': str(image)})
+
+        assert cache.get('k1') is not None
+        image.unlink()
+        assert cache.get('k1') is None
+
+    def test_eviction_removes_least_recently_used(self, tmp_path):
+        """Test the oldest entries are evicted past the size limit."""
+        cache = rc.ResultCache(str(tmp_path), max_bytes=300)
+        for i in range(3):
+            cache.put(f'k{i}', {'response': 'x' * 50})
+            os.utime(cache._path(f'k{i}'), (i, i))
+        cache.get('k0')  # k0 becomes most recently used
+
+        cache.put('k3', {'response': 'x' * 50})
+
+        assert cache._path('k0').exists()
+        assert not cache._path('k1').exists()
+        assert cache._path('k3').exists()
+
+
+class TestProcessFileCache:
+    """Test process_file reuses cached results."""
+
+    def test_second_call_uses_cache(self, tmp_path):
+        """Test identical content skips the API on the second call."""
+        image = tmp_path / 'photo.jpg'
+        image.write_bytes(b'jpeg-bytes')
+        copy = tmp_path / 'copy.jpg'
+        copy.write_bytes(b'jpeg-bytes')
+
+        mock_client = Mock()
+        mock_response = Mock()
+        mock_response.text = 'A photo'
+        mock_client.models.generate_content.return_value = mock_response
+        cache = rc.ResultCache(str(tmp_path / 'cache'))
+
+        kwargs = dict(client=mock_client, prompt='Describe', model='gemini-2.5-flash',
+                      task='analyze', format_output='text', cache=cache)
+        first = gbp.process_file(file_path=str(image), **kwargs)
+        second = gbp.process_file(file_path=str(copy), **kwargs)
+
+        assert mock_client.models.generate_content.call_count == 1
+        assert second['response'] == first['response'] == 'A photo'
+        assert second['file'] == str(copy)
+        assert second['cached'] is True
+
+    def test_rerun_uses_memoized_hash(self, tmp_path):
+        """Test an unchanged input is not re-hashed when a registry is given."""
+        image = tmp_path / 'photo.jpg'
+        image.write_bytes(b'jpeg-bytes')
+        mock_client = Mock()
+        mock_client.models.generate_content.return_value.text = 'A photo'
+        cache = rc.ResultCache(str(tmp_path / 'cache'))
+        registry_path = str(tmp_path / 'uploads.json')
+
+        kwargs = dict(client=mock_client, file_path=str(image), prompt='Describe',
+                      model='gemini-2.5-flash', task='analyze', format_output='text',
+                      cache=cache)
+        first_run = upload_registry.UploadRegistry(registry_path)
+        gbp.process_file(registry=first_run, **kwargs)
+        first_run.flush()
+        with patch('upload_registry.hash_file') as mock_hash, \
+                patch('result_cache.hash_file') as mock_cache_hash:
+            result = gbp.process_file(registry=upload_registry.UploadRegistry(registry_path),
+                                      **kwargs)
+            mock_hash.assert_not_called()
+            mock_cache_hash.assert_not_called()
+
+        assert result['cached'] is True
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v', '--cov=result_cache', '--cov-report=term-missing'])
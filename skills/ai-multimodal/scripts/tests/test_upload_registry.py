@@ -0,0 +1,123 @@
+"""
+Tests for upload_registry.py
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import upload_registry as ur
+import gemini_batch_process as gbp
+
+
+def make_remote_file(name, state='ACTIVE', expires_in=40 * 3600):
+    remote = Mock()
+    remote.name = name
+    remote.uri = f'https://example.invalid/{name}'
+    remote.state.name = state
+    remote.expiration_time = Mock()
+    remote.expiration_time.timestamp.return_value = time.time() + expires_in
+    return remote
+
+
+class TestUploadRegistry:
+    """Test recording and reusing uploads."""
+
+    def test_content_hash_memoized_by_signature(self, tmp_path):
+        """Test unchanged files are not re-hashed."""
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'video')
+        registry = ur.UploadRegistry(str(tmp_path / 'uploads.json'))
+
+        first = registry.content_hash(str(video))
+        with patch('upload_registry.hash_file') as mock_hash:
+            assert registry.content_hash(str(video)) == first
+            mock_hash.assert_not_called()
+
+    def test_hashes_saved_on_flush_and_pruned(self, tmp_path):
+        """Test new hashes are batched into one save and stale ones dropped."""
+        path = str(tmp_path / 'uploads.json')
+        files = []
+        for i in range(3):
+            media = tmp_path / f'{i}.mp4'
+            media.write_bytes(b'video %d' % i)
+            files.append(media)
+        registry = ur.UploadRegistry(path)
+
+        with patch.object(registry, '_save', wraps=registry._save) as mock_save:
+            for media in files:
+                registry.content_hash(str(media))
+            mock_save.assert_not_called()
+            registry.flush()
+            mock_save.assert_called_once()
+
+        files[0].unlink()
+        files[1].write_bytes(b'edited')
+        reloaded = ur.UploadRegistry(path)
+        assert list(reloaded._data['hashes']) == [str(files[2].resolve())]
+
+    def test_lookup_reuses_valid_upload_across_instances(self, tmp_path):
+        """Test a recorded upload is found by a later run."""
+        path = str(tmp_path / 'uploads.json')
+        ur.UploadRegistry(path).record('abc', make_remote_file('files/1'))
+
+        client = Mock()
+        client.files.get.return_value = make_remote_file('files/1')
+        reused = ur.UploadRegistry(path).lookup(client, 'abc')
+
+        assert reused.name == 'files/1'
+        client.files.get.assert_called_once_with(name='files/1')
+
+    def test_lookup_skips_uploads_about_to_expire(self, tmp_path):
+        """Test uploads expiring within the margin are not reused."""
+        registry = ur.UploadRegistry(str(tmp_path / 'uploads.json'))
+        registry.record('abc', make_remote_file('files/1', expires_in=60))
+        client = Mock()
+
+        assert registry.lookup(client, 'abc') is None
+        client.files.get.assert_not_called()
+
+    def test_lookup_forgets_deleted_uploads(self, tmp_path):
+        """Test uploads the API no longer has are dropped."""
+        registry = ur.UploadRegistry(str(tmp_path / 'uploads.json'))
+        registry.record('abc', make_remote_file('files/1'))
+        client = Mock()
+        client.files.get.side_effect = Exception('404 NOT_FOUND')
+
+        assert registry.lookup(client, 'abc') is None
+        assert 'abc' not in registry._data['uploads']
+
+    def test_poll_interval_backs_off(self):
+        """Test processing polls slow down up to the cap."""
+        interval = ur.POLL_INITIAL_SECONDS
+        for _ in range(20):
+            interval = ur.next_poll_interval(interval)
+        assert interval == ur.POLL_MAX_SECONDS
+
+
+class TestUploadFileReuse:
+    """Test upload_file uses the registry."""
+
+    @patch('gemini_batch_process.time.sleep')
+    def test_same_content_uploaded_once(self, mock_sleep, tmp_path):
+        """Test a second upload of identical content reuses the first."""
+        video = tmp_path / 'clip.mp4'
+        video.write_bytes(b'video')
+        registry = ur.UploadRegistry(str(tmp_path / 'uploads.json'))
+        client = Mock()
+        client.files.upload.return_value = make_remote_file('files/1')
+        client.files.get.return_value = make_remote_file('files/1')
+
+        first = gbp.upload_file(client, str(video), registry=registry)
+        second = gbp.upload_file(client, str(video), registry=registry)
+
+        assert first.name == second.name == 'files/1'
+        client.files.upload.assert_called_once()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v', '--cov=upload_registry', '--cov-report=term-missing'])
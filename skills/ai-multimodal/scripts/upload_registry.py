@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Local registry of Gemini File API uploads, keyed by file content.
+
+Files uploaded to the File API stay available for 48 hours. The registry
+remembers each upload's remote name and expiry under the SHA-256 of the
+uploaded content, so running several prompts against the same large video
+(or re-running a batch) reuses the remote file instead of uploading it again.
+A registered upload is only reused if it expires more than an hour from now
+and the API still reports it; otherwise the file is uploaded again.
+
+Content hashes are memoized by path, size and mtime, so unchanged files are
+not re-read on every run. New hashes are saved at most every few seconds and
+on flush(); entries for files that were deleted or changed are dropped when
+the registry is loaded.
+
+Location: ~/.cache/ai-multimodal/uploads.json (AI_MULTIMODAL_CACHE_DIR
+overrides the ~/.cache/ai-multimodal root).
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from result_cache import cache_root, hash_file
+
+REGISTRY_VERSION = 1
+UPLOAD_TTL_SECONDS = 48 * 3600
+REUSE_MARGIN_SECONDS = 3600
+HASH_SAVE_INTERVAL_SECONDS = 5.0
+
+# Processing poll schedule: start fast, back off to spare the files.get quota
+POLL_INITIAL_SECONDS = 1.0
+POLL_MAX_SECONDS = 10.0
+POLL_FACTOR = 1.5
+
+
+def _signature(path: str) -> Optional[List[int]]:
+    """(size, mtime_ns) of a file, or None if it cannot be read."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def next_poll_interval(interval: float) -> float:
+    """Next wait between File API state polls."""
+    return min(POLL_MAX_SECONDS, interval * POLL_FACTOR)
+
+
+class UploadRegistry:
+    """Content-hash -> remote File API upload, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path).expanduser() if path else cache_root() / 'uploads.json'
+        self._lock = threading.Lock()
+        self._content_locks: Dict[str, threading.Lock] = {}
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get('version') != REGISTRY_VERSION:
+            data = {'version': REGISTRY_VERSION, 'uploads': {}, 'hashes': {}}
+        now = time.time()
+        data['uploads'] = {
+            digest: entry for digest, entry in data.get('uploads', {}).items()
+            if entry.get('expires_at', 0) > now
+        }
+        data['hashes'] = {
+            path: entry for path, entry in data.get('hashes', {}).items()
+            if entry.get('signature') == _signature(path)
+        }
+        return data
+
+    def _save(self) -> None:
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def flush(self) -> None:
+        """Write hashes recorded since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def content_hash(self, file_path: str) -> Optional[str]:
+        """SHA-256 of a file, reusing the stored hash if size and mtime match."""
+        try:
+            resolved = str(Path(file_path).resolve())
+        except OSError:
+            return None
+        signature = _signature(resolved)
+        if signature is None:
+            return None
+        with self._lock:
+            known = self._data['hashes'].get(resolved)
+        if known and known.get('signature') == signature:
+            return known['sha256']
+        try:
+            digest = hash_file(resolved)
+        except OSError:
+            return None
+        with self._lock:
+            self._data['hashes'][resolved] = {'signature': signature, 'sha256': digest}
+            # Batches hash many files; rewrite the registry now and then, not per file
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= HASH_SAVE_INTERVAL_SECONDS:
+                self._save()
+        return digest
+
+    def content_lock(self, digest: str) -> threading.Lock:
+        """Lock held while uploading `digest`, so concurrent workers upload it once."""
+        with self._lock:
+            return self._content_locks.setdefault(digest, threading.Lock())
+
+    def lookup(self, client, digest: str) -> Optional[Any]:
+        """Return the still-valid remote file for `digest`, or None."""
+        with self._lock:
+            entry = self._data['uploads'].get(digest)
+        if not entry or entry['expires_at'] - time.time() < REUSE_MARGIN_SECONDS:
+            return None
+        try:
+            myfile = client.files.get(name=entry['name'])
+        except Exception:
+            myfile = None
+        if myfile is None or myfile.state.name not in ('ACTIVE', 'PROCESSING'):
+            self.forget(digest)
+            return None
+        return myfile
+
+    def record(self, digest: str, myfile: Any) -> None:
+        """Remember an upload of `digest`."""
+        name = getattr(myfile, 'name', None)
+        if not isinstance(name, str):
+            return
+        expiration = getattr(myfile, 'expiration_time', None)
+        try:
+            expires_at = expiration.timestamp()
+        except (AttributeError, TypeError, ValueError, OSError):
+            expires_at = time.time() + UPLOAD_TTL_SECONDS
+        uri = getattr(myfile, 'uri', None)
+        with self._lock:
+            self._data['uploads'][digest] = {
+                'name': name,
+                'uri': uri if isinstance(uri, str) else None,
+                'expires_at': expires_at,
+            }
+            self._save()
+
+    def forget(self, digest: str) -> None:
+        """Drop a registered upload (expired, deleted or failed)."""
+        with self._lock:
+            if self._data['uploads'].pop(digest, None) is not None:
+                self._save()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+bench-context-usage.py — compare context-usage.py's transcript parsing paths
+on a large synthetic session JSONL.
+
+Generates a transcript shaped like a long 1M-context session (mostly large
+tool-output lines, with an assistant usage entry every few lines), then times:
+
+    json-every-line   the previous parser: json.loads on every line
+    fast/<backend>    the pre-filtered parser with each installed decoder
+                      (msgspec, orjson, json)
+
+and checks that every path returns the same result.
+
+USAGE
+    python3 bench-context-usage.py                       # 500 MB in a temp dir
+    python3 bench-context-usage.py --size-mb 100 --path /tmp/t.jsonl --keep
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def load_context_usage():
+    """Import context-usage.py (its name is not a valid module name)."""
+    spec = importlib.util.spec_from_file_location("context_usage", SCRIPT_DIR / "context-usage.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------------------------------------------
+# Synthetic transcript
+# ---------------------------------------------------------------------------
+
+def generate_transcript(path: Path, size_mb: int, agent_name: str, seed: int = 7) -> None:
+    """Write roughly `size_mb` MB of transcript lines to `path`."""
+    rnd = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    # Tool output reads like source code and logs: words, punctuation, quotes.
+    vocab = ["def", "return", "self", "import", "const", "value", "error", "test",
+             "data", "file", "path", "the", "and", "for", "if", "else", "print",
+             "result", "=", "(", ")", ":", "{", "}", "'x'", '"y"', ".", ",", "\n"]
+    filler = " ".join(rnd.choice(vocab) for _ in range(900))
+    written = 0
+    turn = 0
+    used = 20_000
+    with path.open("w", encoding="utf-8") as fh:
+        while written < target:
+            turn += 1
+            ts = f"2026-05-07T{turn // 3600 % 24:02d}:{turn // 60 % 60:02d}:{turn % 60:02d}.{turn:09d}Z"
+            used = 15_000 if used > 900_000 else used + rnd.randint(500, 4000)
+            lines = [
+                {
+                    "type": "assistant",
+                    "agentName": agent_name,
+                    "sessionId": "bench-session",
+                    "timestamp": ts,
+                    "isSidechain": False,
+                    "message": {
+                        "model": "claude-bench[1m]",
+                        "stop_reason": rnd.choice(["tool_use", "end_turn"]),
+                        "content": [{"type": "text", "text": filler[: rnd.randint(50, 800)]}],
+                        "usage": {
+                            "input_tokens": rnd.randint(1, 10),
+                            "cache_read_input_tokens": used - 2000,
+                            "cache_creation_input_tokens": 2000,
+                            "output_tokens": rnd.randint(10, 900),
+                        },
+                    },
+                }
+            ]
+            for _ in range(rnd.randint(1, 4)):
+                repeat = rnd.randint(1, 40)
+                lines.append({
+                    "type": "user",
+                    "agentName": agent_name,
+                    "sessionId": "bench-session",
+                    "timestamp": ts,
+                    "message": {"role": "user", "content": [{"type": "tool_result", "content": filler * repeat}]},
+                    "toolUseResult": {"stdout": filler * repeat, "stderr": ""},
+                })
+            for obj in lines:
+                line = json.dumps(obj, separators=(",", ":")) + "\n"
+                fh.write(line)
+                written += len(line)
+
+
+# ---------------------------------------------------------------------------
+# Parsing paths
+# ---------------------------------------------------------------------------
+
+def parse_json_every_line(cu, path: Path, agent_name: Optional[str]) -> dict[str, Any]:
+    """The previous parser, kept verbatim so the baseline does not move with
+    context-usage.py: json.loads on every line, then the stop_reason filter
+    and compaction walk over the collected entries. Only constants and the
+    window-size/int helpers come from `cu`.
+    """
+    # First pass: collect all entries with usage. We need them all up front so
+    # we can apply ccstatusline's "if any entry has stop_reason, only count
+    # finalized + latest" filter correctly.
+    entries: list[dict[str, Any]] = []
+    has_stop_reason_field = False
+    last_session_id: Optional[str] = None
+    last_model: Optional[str] = None
+    is_compact_summary_seen = False
+
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError:
+                    # Tolerate partial / truncated lines at end-of-file.
+                    continue
+
+                if agent_name and obj.get("agentName") != agent_name:
+                    continue
+
+                if obj.get("isCompactSummary") is True:
+                    is_compact_summary_seen = True
+
+                msg = obj.get("message")
+                if not isinstance(msg, dict):
+                    continue
+                usage = msg.get("usage")
+                if not isinstance(usage, dict):
+                    continue
+
+                if "stop_reason" in msg:
+                    has_stop_reason_field = True
+
+                last_session_id = obj.get("sessionId") or last_session_id
+                last_model = msg.get("model") or last_model
+
+                entries.append(obj)
+    except OSError as exc:
+        raise cu.TranscriptParseError(f"could not read {path}: {exc}") from exc
+
+    # Apply ccstatusline's streaming-aware filter:
+    #   - If any entry has stop_reason, keep entries with truthy stop_reason
+    #     PLUS the very last entry (which may still be unfinalized).
+    #   - Otherwise keep all entries.
+    if has_stop_reason_field:
+        last_idx = len(entries) - 1
+        kept: list[dict[str, Any]] = []
+        for i, obj in enumerate(entries):
+            stop_reason = obj["message"].get("stop_reason")
+            if stop_reason or (stop_reason is None and i == last_idx):
+                kept.append(obj)
+        entries = kept
+
+    # Find the most recent main-chain assistant entry. Sidechains
+    # (isSidechain === true) and api-error stub messages don't count.
+    most_recent: Optional[dict[str, Any]] = None
+    most_recent_ts: Optional[str] = None
+    for obj in entries:
+        if obj.get("isSidechain") is True:
+            continue
+        if obj.get("isApiErrorMessage"):
+            continue
+        ts = obj.get("timestamp")
+        if not ts:
+            continue
+        if most_recent_ts is None or ts > most_recent_ts:
+            most_recent_ts = ts
+            most_recent = obj
+
+    if most_recent is None:
+        return {
+            "tokens_used": 0,
+            "input_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "model": last_model,
+            "session_id": last_session_id,
+            "compaction_count": 0,
+            "compaction_summary_seen": is_compact_summary_seen,
+            "most_recent_timestamp": None,
+        }
+
+    usage = most_recent["message"]["usage"]
+    input_tokens = cu._coerce_nonneg_int(usage.get("input_tokens"))
+    cache_read = cu._coerce_nonneg_int(usage.get("cache_read_input_tokens"))
+    cache_create = cu._coerce_nonneg_int(usage.get("cache_creation_input_tokens"))
+    tokens_used = input_tokens + cache_read + cache_create
+
+    # Compaction detection: walk forward, track context % across entries (using
+    # the same window size for percentage math), count drops >threshold. We
+    # need a window size for percentage-based detection; if the caller didn't
+    # supply one, infer from the model identifier on the latest entry.
+    inferred_window = (
+        cu.parse_context_window(last_model or "") or cu.DEFAULT_CONTEXT_WINDOW
+    )
+
+    compaction_count = 0
+    prev_pct: Optional[float] = None
+    for obj in entries:
+        if obj.get("isSidechain") is True or obj.get("isApiErrorMessage"):
+            continue
+        u = obj["message"].get("usage")
+        if not isinstance(u, dict):
+            continue
+        i = cu._coerce_nonneg_int(u.get("input_tokens"))
+        cr = cu._coerce_nonneg_int(u.get("cache_read_input_tokens"))
+        cc = cu._coerce_nonneg_int(u.get("cache_creation_input_tokens"))
+        used = i + cr + cc
+        pct = (used / inferred_window) * 100.0 if inferred_window > 0 else 0.0
+        if prev_pct is not None and pct < prev_pct - cu.COMPACTION_DROP_THRESHOLD_PCT:
+            compaction_count += 1
+        prev_pct = pct
+
+    if is_compact_summary_seen and compaction_count == 0:
+        # Definitive marker present but the percentage drop didn't register
+        # (e.g. compaction happened at session boundaries). Trust the marker.
+        compaction_count = 1
+
+    return {
+        "tokens_used": tokens_used,
+        "input_tokens": input_tokens,
+        "cache_read_input_tokens": cache_read,
+        "cache_creation_input_tokens": cache_create,
+        "model": last_model,
+        "session_id": last_session_id,
+        "compaction_count": compaction_count,
+        "compaction_summary_seen": is_compact_summary_seen,
+        "most_recent_timestamp": most_recent_ts,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Recommendation policy
+# ---------------------------------------------------------------------------
+
+
+def time_call(fn) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Benchmark context-usage.py transcript parsing.")
+    p.add_argument("--size-mb", type=int, default=500, help="Synthetic transcript size (default: 500).")
+    p.add_argument("--path", help="Transcript to use; generated there if missing.")
+    p.add_argument("--keep", action="store_true", help="Keep the generated transcript.")
+    p.add_argument("--agent-name", default="bmad-dev-bench", help="agentName to filter on.")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    cu = load_context_usage()
+    path = Path(args.path) if args.path else Path(tempfile.gettempdir()) / f"bench-context-usage-{args.size_mb}mb.jsonl"
+    generated = not path.exists()
+    if generated:
+        gen_seconds, _ = time_call(lambda: generate_transcript(path, args.size_mb, args.agent_name))
+        if not args.json:
+            print(f"generated {path} in {gen_seconds:.1f}s")
+    size_mb = path.stat().st_size / (1024 * 1024)
+
+    runs = [("json-every-line", lambda: parse_json_every_line(cu, path, args.agent_name))]
+    backends = ["json"]
+    if cu.orjson is not None:
+        backends.insert(0, "orjson")
+    if cu.msgspec is not None:
+        backends.insert(0, "msgspec")
+    for backend in backends:
+        def run(backend=backend):
+            cu._decode_entry = cu._entry_decoder(backend)
+            return cu.parse_transcript(path, agent_name=args.agent_name)
+        runs.append((f"fast/{backend}", run))
+
+    rows = []
+    baseline = None
+    for name, fn in runs:
+        seconds, result = time_call(fn)
+        if baseline is None:
+            baseline = (seconds, result)
+        rows.append({
+            "path": name,
+            "seconds": round(seconds, 3),
+            "mb_per_s": round(size_mb / seconds, 1) if seconds else None,
+            "speedup": round(baseline[0] / seconds, 2) if seconds else None,
+            # The fast path reports extra fields (turns, burn rate, history).
+            "same_result": {key: result.get(key) for key in baseline[1]} == baseline[1],
+        })
+
+    if args.json:
+        print(json.dumps({"transcript_mb": round(size_mb, 1), "runs": rows}, indent=2))
+    else:
+        print(f"transcript: {size_mb:.1f} MB")
+        print(f"{'path':<18}{'seconds':>10}{'MB/s':>10}{'speedup':>10}  same")
+        for row in rows:
+            print(f"{row['path']:<18}{row['seconds']:>10.3f}{row['mb_per_s']:>10.1f}"
+                  f"{row['speedup']:>9.2f}x  {'yes' if row['same_result'] else 'NO'}")
+
+    if generated and not args.keep:
+        os.unlink(path)
+    return 0 if all(row["same_result"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,18 @@ USAGE
     # Direct session id:
     python3 context-usage.py --session-id "9e646f4a-..." --context-window 1000000
 
+    # Several agents (or a whole team) in one run -> JSON array:
+    python3 context-usage.py --agent-name "bmad-dev-{TEAM_NAME}" \\
+        --agent-name "bmad-tester-{TEAM_NAME}" --context-window 1000000
+    python3 context-usage.py --team-name "{TEAM_NAME}" --all-agents
+
+    # Repeated polling: only parse what was appended since the last run
+    python3 context-usage.py --agent-name "bmad-dev-{TEAM_NAME}" --incremental
+
+    # Push mode: stay running, print a JSON line per agent at start and then
+    # only when its recommendation changes or a compaction is detected
+    python3 context-usage.py --team-name "{TEAM_NAME}" --all-agents --watch
+
 POLICY
     --policy 1m   (default when --context-window >= 1000000):
         ok if used <= 50%; otherwise recommend "respawn-with-handover".
@@ -43,7 +55,21 @@ POLICY
     of respawning at 50% vs 70% on a 1M window is huge anyway — better to
     respawn while the thinking is still sharp.
 
-OUTPUT (JSON, one object on stdout)
+CACHE
+    Discovery keeps an index of which sessionId / agentName / teamName each
+    transcript contains in $BMAD_AUTO_CACHE_DIR (default ~/.cache/bmad-auto),
+    refreshed by mtime/size so only new or grown files are read. Pass
+    --no-index to scan ~/.claude/projects directly. --incremental parse
+    checkpoints live in the same directory.
+
+PERFORMANCE
+    Only lines containing "usage" or "isCompactSummary" are decoded; they are
+    located with a byte search over 1 MB blocks. Decoding uses msgspec or
+    orjson when installed (override with BMAD_AUTO_JSON_BACKEND=json|orjson|
+    msgspec). bench-context-usage.py times this against a per-line json.loads
+    parse on a synthetic 500 MB transcript.
+
+OUTPUT (JSON, one object on stdout; an array of them in batch mode)
     {
       "agent_name": "bmad-dev-...",
       "session_id": "9e646f4a-...",
@@ -59,24 +85,43 @@ OUTPUT (JSON, one object on stdout)
       "used_pct": 50.2,
       "compaction_count": 0,
       "policy": "1m",
-      "recommendation": "ok"   # or "respawn-with-handover" / "unknown"
-    }
+      "recommendation": "ok",  # or "respawn-with-handover" / "unknown"
+      "turns": 212,                        # main-chain API turns so far
+      "burn_rate_tokens_per_turn": 2310.5, # mean growth over the last 20 turns
+      "turns_until_threshold": 0,          # at that rate; null if not growing
+      "history": [[4, 31022], [8, 40990], ...]  # only with --history:
+    }                                           # [turn, tokens_used], <= 65 points
 
 EXIT CODES
     0  computed successfully (recommendation is in the JSON)
-    1  no matching transcript found
+    1  no matching transcript found (batch mode: for at least one agent)
     2  bad arguments / unrecoverable parse error
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import math
 import os
 import re
+import select
+import signal
 import sys
+import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+# Optional fast JSON decoders; the stdlib json module is the fallback.
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ---------------------------------------------------------------------------
 # Constants — match ccstatusline so the numbers agree with its statusline
@@ -84,6 +129,8 @@ from typing import Any, Optional
 
 DEFAULT_CONTEXT_WINDOW = 200_000           # ccstatusline's fallback
 COMPACTION_DROP_THRESHOLD_PCT = 2.0        # >2 point drop = compaction
+HISTORY_POINTS = 64                        # downsampled usage history length
+BURN_RATE_TURNS = 20                       # recent turns averaged for burn rate
 
 
 # ---------------------------------------------------------------------------
@@ -95,21 +142,171 @@ def claude_projects_dir() -> Path:
     return Path.home() / ".claude" / "projects"
 
 
+def cache_dir() -> Path:
+    """Where checkpoints and the discovery index live: $BMAD_AUTO_CACHE_DIR
+    or ~/.cache/bmad-auto."""
+    override = os.environ.get("BMAD_AUTO_CACHE_DIR")
+    return Path(override) if override else Path.home() / ".cache" / "bmad-auto"
+
+
+def _walk_transcripts(root: Path):
+    """Yield (path, stat) for every *.jsonl file under `root` via os.scandir."""
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(".jsonl") and entry.is_file():
+                            yield Path(entry.path), entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
 def iter_transcripts() -> list[Path]:
     """All *.jsonl files under ~/.claude/projects/, newest first by mtime."""
     root = claude_projects_dir()
     if not root.exists():
         return []
-    return sorted(
-        root.rglob("*.jsonl"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
+    found = sorted(_walk_transcripts(root), key=lambda ps: ps[1].st_mtime, reverse=True)
+    return [path for path, _ in found]
+
+
+# Discovery index: which sessionIds and (agentName, teamName) pairs each
+# transcript contains, so lookups don't re-read thousands of files. Entries are
+# refreshed by mtime/size; a file that only grew is scanned from where the last
+# refresh stopped. Only top-level fields are indexed, as the --no-index scans
+# match; the byte patterns below just pick which lines to decode.
+
+DISCOVERY_INDEX_VERSION = 2
+_SESSION_ID_KEY = b'"sessionId":"'
+_SESSION_ID_RE = re.compile(rb'"sessionId":"([^"\\]*)"')
+_AGENT_NAME_KEY = b'"agentName":"'
+_TEAM_NAME_KEY = b'"teamName":"'
+
+
+def _discovery_index_path() -> Path:
+    return cache_dir() / "transcript-index.json"
+
+
+def _scan_discovery(path: Path, record: dict[str, Any]) -> None:
+    """Add the ids found from record["offset"] on; only newline-terminated
+    lines are consumed so a line still being written is re-read next time."""
+    session_ids = set(record["session_ids"])
+    pairs = {tuple(pair) for pair in record["pairs"]}
+    offset = record["offset"]
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            if _AGENT_NAME_KEY not in raw and _TEAM_NAME_KEY not in raw:
+                # Most lines repeat the file's sessionId: skip the decode when
+                # every "sessionId" key on the line holds an already-known id
+                # (an escaped value fails the regex and forces the decode).
+                count = raw.count(_SESSION_ID_KEY)
+                if not count:
+                    continue
+                found = _SESSION_ID_RE.findall(raw)
+                if len(found) == count and all(
+                    value.decode("utf-8", "replace") in session_ids for value in found
+                ):
+                    continue
+            obj = _decode_entry(raw)
+            if obj is None:
+                continue
+            session_id = obj.get("sessionId")
+            if isinstance(session_id, str):
+                session_ids.add(session_id)
+            agent = obj.get("agentName")
+            team = obj.get("teamName")
+            agent = agent if isinstance(agent, str) else None
+            team = team if isinstance(team, str) else None
+            if agent is not None or team is not None:
+                pairs.add((agent, team))
+    record["offset"] = offset
+    record["session_ids"] = sorted(session_ids)
+    record["pairs"] = sorted(pairs, key=lambda p: (p[0] or "", p[1] or ""))
+
+
+def load_discovery_index() -> dict[str, dict[str, Any]]:
+    """Return {path: record} for every transcript, refreshing stale records
+    and persisting the index when anything changed. Records carry mtime_ns,
+    size, the scanned offset with its _file_probe(), session_ids and
+    (agentName, teamName) pairs."""
+    root = claude_projects_dir()
+    index_path = _discovery_index_path()
+    try:
+        with index_path.open("r", encoding="utf-8") as fh:
+            stored = json.load(fh)
+        if stored.get("version") != DISCOVERY_INDEX_VERSION or stored.get("root") != str(root):
+            raise ValueError("stale discovery index")
+        old_files = stored["files"]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        old_files = {}
+
+    files: dict[str, dict[str, Any]] = {}
+    changed = False
+    if root.exists():
+        for path, st in _walk_transcripts(root):
+            key = str(path)
+            record = old_files.get(key)
+            if record and record["mtime_ns"] == st.st_mtime_ns and record["size"] == st.st_size:
+                files[key] = record
+                continue
+            try:
+                grown = (
+                    record is not None
+                    and record["offset"] <= st.st_size
+                    and _file_probe(path, record["offset"]) == record["probe"]
+                )
+                if not grown:
+                    record = {"offset": 0, "session_ids": [], "pairs": []}
+                _scan_discovery(path, record)
+                record.update(mtime_ns=st.st_mtime_ns, size=st.st_size,
+                              probe=_file_probe(path, record["offset"]))
+            except OSError:
+                continue
+            files[key] = record
+            changed = True
+    changed = changed or len(files) != len(old_files)
+
+    if changed:
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = index_path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("w", encoding="utf-8") as fh:
+                json.dump({"version": DISCOVERY_INDEX_VERSION, "root": str(root), "files": files},
+                          fh, separators=(",", ":"))
+            os.replace(tmp, index_path)
+        except OSError:
+            pass
+    return files
+
 
+def _indexed_newest_first(files: dict[str, dict[str, Any]]) -> list[tuple[Path, dict[str, Any]]]:
+    ordered = sorted(files.items(), key=lambda kv: kv[1]["mtime_ns"], reverse=True)
+    return [(Path(key), record) for key, record in ordered]
 
-def find_transcript_by_session_id(session_id: str) -> Optional[Path]:
+
+def find_transcript_by_session_id(session_id: str, use_index: bool = True) -> Optional[Path]:
     """Locate a JSONL file named <session-id>.jsonl. Falls back to scanning
     contents if the filename doesn't match (rare but possible after renames)."""
+    if use_index:
+        indexed = _indexed_newest_first(load_discovery_index())
+        for path, _ in indexed:
+            if path.stem == session_id:
+                return path
+        for path, record in indexed:
+            if session_id in record["session_ids"]:
+                return path
+        return None
+
     for path in iter_transcripts():
         if path.stem == session_id:
             return path
@@ -118,7 +315,13 @@ def find_transcript_by_session_id(session_id: str) -> Optional[Path]:
         try:
             with path.open("r", encoding="utf-8") as fh:
                 for line in fh:
-                    if f'"sessionId":"{session_id}"' in line:
+                    if f'"sessionId":"{session_id}"' not in line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(obj, dict) and obj.get("sessionId") == session_id:
                         return path
         except OSError:
             continue
@@ -126,12 +329,22 @@ def find_transcript_by_session_id(session_id: str) -> Optional[Path]:
 
 
 def find_transcript_by_agent(
-    agent_name: Optional[str], team_name: Optional[str]
+    agent_name: Optional[str], team_name: Optional[str], use_index: bool = True
 ) -> Optional[Path]:
     """Find the most recently modified transcript whose entries match the
     given agentName and/or teamName. Either field may be omitted."""
     if not agent_name and not team_name:
         return None
+    if use_index:
+        for path, record in _indexed_newest_first(load_discovery_index()):
+            for agent, team in record["pairs"]:
+                if agent_name and agent != agent_name:
+                    continue
+                if team_name and team != team_name:
+                    continue
+                return path
+        return None
+
     for path in iter_transcripts():
         try:
             with path.open("r", encoding="utf-8") as fh:
@@ -158,6 +371,76 @@ def find_transcript_by_agent(
     return None
 
 
+def _line_matches_agent(line: str, agent_name: str, team_name: Optional[str]) -> bool:
+    if f'"agentName":"{agent_name}"' not in line:
+        return False
+    if team_name and f'"teamName":"{team_name}"' not in line:
+        return False
+    try:
+        obj = json.loads(line)
+    except json.JSONDecodeError:
+        return False
+    return obj.get("agentName") == agent_name and (not team_name or obj.get("teamName") == team_name)
+
+
+def find_transcripts_by_agents(
+    agent_names: list[str], team_name: Optional[str], use_index: bool = True
+) -> dict[str, Optional[Path]]:
+    """find_transcript_by_agent() for several agents in one discovery pass:
+    the newest transcript per agent (optionally within `team_name`)."""
+    found: dict[str, Optional[Path]] = {name: None for name in agent_names}
+    if use_index:
+        for path, record in _indexed_newest_first(load_discovery_index()):
+            for agent, team in record["pairs"]:
+                if agent in found and found[agent] is None and (not team_name or team == team_name):
+                    found[agent] = path
+            if all(found.values()):
+                break
+        return found
+
+    for path in iter_transcripts():
+        pending = [name for name, hit in found.items() if hit is None]
+        if not pending:
+            break
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    for name in pending:
+                        if found[name] is None and _line_matches_agent(line, name, team_name):
+                            found[name] = path
+                    if all(found[name] for name in pending):
+                        break
+        except OSError:
+            continue
+    return found
+
+
+def list_team_agents(team_name: str, use_index: bool = True) -> list[str]:
+    """Every agentName seen on a line tagged with `team_name`, sorted."""
+    agents: set[str] = set()
+    if use_index:
+        for record in load_discovery_index().values():
+            agents.update(agent for agent, team in record["pairs"] if agent and team == team_name)
+        return sorted(agents)
+
+    needle = f'"teamName":"{team_name}"'
+    for path in iter_transcripts():
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    if needle not in line or '"agentName":"' not in line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if obj.get("teamName") == team_name and isinstance(obj.get("agentName"), str):
+                        agents.add(obj["agentName"])
+        except OSError:
+            continue
+    return sorted(agents)
+
+
 # ---------------------------------------------------------------------------
 # Window-size inference (ported from ccstatusline/utils/model-context.ts)
 # ---------------------------------------------------------------------------
@@ -197,6 +480,21 @@ def parse_context_window(model_identifier: str) -> Optional[int]:
 # ---------------------------------------------------------------------------
 # Transcript parsing — context length & compaction detection
 # ---------------------------------------------------------------------------
+#
+# The transcript is consumed as a stream so the same code serves a full parse
+# and an incremental one that resumes from a checkpoint. ccstatusline's
+# streaming-aware filter ("if any entry has stop_reason, keep only finalized
+# entries plus the very last one") cannot be decided until the end, so two
+# trackers run side by side:
+#
+#   all        every usage entry
+#   finalized  only entries with a truthy stop_reason
+#
+# At the end the matching tracker is picked; for `finalized`, the last entry is
+# applied as a virtual step if it is still unfinalized (stop_reason None). Each
+# tracker keeps its best (latest-timestamp) main-chain entry, the previous
+# main-chain usage and every positive usage drop as (prev_used, used), so the
+# compaction count can be recomputed once the final window size is known.
 
 class TranscriptParseError(RuntimeError):
     pass
@@ -208,154 +506,475 @@ def _coerce_nonneg_int(val: Any) -> int:
     return int(val)
 
 
-def parse_transcript(
-    transcript_path: Path,
-    agent_name: Optional[str] = None,
-) -> dict[str, Any]:
-    """Compute the most recent main-chain context length and the compaction
-    count, applying ccstatusline's streaming-aware and sidechain-aware
-    filtering. If `agent_name` is given, restrict to lines tagged with that
-    agentName (so a multi-agent transcript file is filtered correctly).
+def _new_tracker() -> dict[str, Any]:
+    return {
+        "best": None,
+        "prev_used": None,
+        "drops": [],
+        "turns": 0,
+        "recent": [],       # tokens used on the last BURN_RATE_TURNS turns
+        "history": [],      # (turn, tokens used) every `stride` turns
+        "stride": 1,
+    }
 
-    Returns a dict with keys: tokens_used, input_tokens, cache_read_input_tokens,
-    cache_creation_input_tokens, model, session_id, compaction_count, used_pct
-    (None if window unknown), and the most_recent_timestamp.
-    """
-    # First pass: collect all entries with usage. We need them all up front so
-    # we can apply ccstatusline's "if any entry has stop_reason, only count
-    # finalized + latest" filter correctly.
-    entries: list[dict[str, Any]] = []
-    has_stop_reason_field = False
-    last_session_id: Optional[str] = None
-    last_model: Optional[str] = None
-    is_compact_summary_seen = False
 
-    try:
-        with transcript_path.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError:
-                    # Tolerate partial / truncated lines at end-of-file.
-                    continue
+def _new_parse_state() -> dict[str, Any]:
+    return {
+        "has_stop_reason_field": False,
+        "session_id": None,
+        "model": None,
+        "compact_summary_seen": False,
+        "last_step": None,
+        "all": _new_tracker(),
+        "finalized": _new_tracker(),
+    }
 
-                if agent_name and obj.get("agentName") != agent_name:
-                    continue
 
-                if obj.get("isCompactSummary") is True:
-                    is_compact_summary_seen = True
+def _apply_step(tracker: dict[str, Any], step: dict[str, Any]) -> None:
+    """Advance one tracker by a main-chain usage step."""
+    used = step["input_tokens"] + step["cache_read_input_tokens"] + step["cache_creation_input_tokens"]
+    prev_used = tracker["prev_used"]
+    if prev_used is not None and used < prev_used:
+        tracker["drops"].append((prev_used, used))
+    tracker["prev_used"] = used
+
+    tracker["turns"] += 1
+    turn = tracker["turns"]
+    tracker["recent"].append(used)
+    if len(tracker["recent"]) > BURN_RATE_TURNS:
+        del tracker["recent"][0]
+    # Stride doubling: once the history is full, keep every other point and
+    # sample half as often, so it always spans the whole session.
+    if turn % tracker["stride"] == 0:
+        tracker["history"].append((turn, used))
+        if len(tracker["history"]) > HISTORY_POINTS:
+            tracker["history"] = tracker["history"][1::2]
+            tracker["stride"] *= 2
+
+    ts = step["timestamp"]
+    if ts and (tracker["best"] is None or ts > tracker["best"]["timestamp"]):
+        tracker["best"] = step
+
+
+def _feed_entry(state: dict[str, Any], obj: dict[str, Any]) -> None:
+    """Fold one transcript entry (already filtered by agent) into the state."""
+    if obj.get("isCompactSummary") is True:
+        state["compact_summary_seen"] = True
+
+    msg = obj.get("message")
+    if not isinstance(msg, dict):
+        return
+    usage = msg.get("usage")
+    if not isinstance(usage, dict):
+        return
+
+    if "stop_reason" in msg:
+        state["has_stop_reason_field"] = True
+    state["session_id"] = obj.get("sessionId") or state["session_id"]
+    state["model"] = msg.get("model") or state["model"]
+
+    # Sidechains (isSidechain === true) and api-error stub messages don't count.
+    main_chain = obj.get("isSidechain") is not True and not obj.get("isApiErrorMessage")
+    step = None
+    if main_chain:
+        step = {
+            "timestamp": obj.get("timestamp"),
+            "input_tokens": _coerce_nonneg_int(usage.get("input_tokens")),
+            "cache_read_input_tokens": _coerce_nonneg_int(usage.get("cache_read_input_tokens")),
+            "cache_creation_input_tokens": _coerce_nonneg_int(usage.get("cache_creation_input_tokens")),
+        }
+        _apply_step(state["all"], step)
+        if msg.get("stop_reason"):
+            _apply_step(state["finalized"], step)
+    state["last_step"] = {"pending": msg.get("stop_reason") is None, "step": step}
 
-                msg = obj.get("message")
-                if not isinstance(msg, dict):
-                    continue
-                usage = msg.get("usage")
-                if not isinstance(usage, dict):
-                    continue
 
-                if "stop_reason" in msg:
-                    has_stop_reason_field = True
+def _is_compaction(prev_used: int, used: int, window: int) -> bool:
+    """Whether usage fell by more than COMPACTION_DROP_THRESHOLD_PCT points."""
+    prev_pct = (prev_used / window) * 100.0 if window > 0 else 0.0
+    pct = (used / window) * 100.0 if window > 0 else 0.0
+    return pct < prev_pct - COMPACTION_DROP_THRESHOLD_PCT
 
-                last_session_id = obj.get("sessionId") or last_session_id
-                last_model = msg.get("model") or last_model
 
-                entries.append(obj)
-    except OSError as exc:
-        raise TranscriptParseError(f"could not read {transcript_path}: {exc}") from exc
+def _count_compactions(drops: list, window: int) -> int:
+    return sum(1 for prev_used, used in drops if _is_compaction(prev_used, used, window))
 
-    # Apply ccstatusline's streaming-aware filter:
-    #   - If any entry has stop_reason, keep entries with truthy stop_reason
-    #     PLUS the very last entry (which may still be unfinalized).
-    #   - Otherwise keep all entries.
-    if has_stop_reason_field:
-        last_idx = len(entries) - 1
-        kept: list[dict[str, Any]] = []
-        for i, obj in enumerate(entries):
-            stop_reason = obj["message"].get("stop_reason")
-            if stop_reason or (stop_reason is None and i == last_idx):
-                kept.append(obj)
-        entries = kept
-
-    # Find the most recent main-chain assistant entry. Sidechains
-    # (isSidechain === true) and api-error stub messages don't count.
-    most_recent: Optional[dict[str, Any]] = None
-    most_recent_ts: Optional[str] = None
-    for obj in entries:
-        if obj.get("isSidechain") is True:
-            continue
-        if obj.get("isApiErrorMessage"):
-            continue
-        ts = obj.get("timestamp")
-        if not ts:
-            continue
-        if most_recent_ts is None or ts > most_recent_ts:
-            most_recent_ts = ts
-            most_recent = obj
 
-    if most_recent is None:
+def _burn_rate(recent: list[int], window: int) -> Optional[float]:
+    """Average tokens added per turn over the recent turns, counted from the
+    last compaction inside that span (a compaction resets the trend)."""
+    start = 0
+    for i in range(1, len(recent)):
+        if _is_compaction(recent[i - 1], recent[i], window):
+            start = i
+    span = recent[start:]
+    if len(span) < 2:
+        return None
+    return (span[-1] - span[0]) / (len(span) - 1)
+
+
+def _finish_parse(state: dict[str, Any]) -> dict[str, Any]:
+    """Turn a parse state into parse_transcript()'s result without mutating it."""
+    if state["has_stop_reason_field"]:
+        tracker = state["finalized"]
+        last = state["last_step"]
+        if last is not None and last["pending"] and last["step"] is not None:
+            tracker = {
+                **tracker,
+                "drops": list(tracker["drops"]),
+                "recent": list(tracker["recent"]),
+                "history": list(tracker["history"]),
+            }
+            _apply_step(tracker, last["step"])
+    else:
+        tracker = state["all"]
+
+    best = tracker["best"]
+    if best is None:
         return {
             "tokens_used": 0,
             "input_tokens": 0,
             "cache_read_input_tokens": 0,
             "cache_creation_input_tokens": 0,
-            "model": last_model,
-            "session_id": last_session_id,
+            "model": state["model"],
+            "session_id": state["session_id"],
             "compaction_count": 0,
-            "compaction_summary_seen": is_compact_summary_seen,
+            "compaction_summary_seen": state["compact_summary_seen"],
             "most_recent_timestamp": None,
+            "turns": 0,
+            "burn_rate_tokens_per_turn": None,
+            "history": [],
         }
 
-    usage = most_recent["message"]["usage"]
-    input_tokens = _coerce_nonneg_int(usage.get("input_tokens"))
-    cache_read = _coerce_nonneg_int(usage.get("cache_read_input_tokens"))
-    cache_create = _coerce_nonneg_int(usage.get("cache_creation_input_tokens"))
-    tokens_used = input_tokens + cache_read + cache_create
-
-    # Compaction detection: walk forward, track context % across entries (using
-    # the same window size for percentage math), count drops >threshold. We
-    # need a window size for percentage-based detection; if the caller didn't
-    # supply one, infer from the model identifier on the latest entry.
+    # Compaction detection: track context % across entries (using the same
+    # window size for percentage math) and count drops >threshold. If the
+    # caller didn't supply a window, infer it from the latest model identifier.
     inferred_window = (
-        parse_context_window(last_model or "") or DEFAULT_CONTEXT_WINDOW
+        parse_context_window(state["model"] or "") or DEFAULT_CONTEXT_WINDOW
     )
+    compaction_count = _count_compactions(tracker["drops"], inferred_window)
 
-    compaction_count = 0
-    prev_pct: Optional[float] = None
-    for obj in entries:
-        if obj.get("isSidechain") is True or obj.get("isApiErrorMessage"):
-            continue
-        u = obj["message"].get("usage")
-        if not isinstance(u, dict):
-            continue
-        i = _coerce_nonneg_int(u.get("input_tokens"))
-        cr = _coerce_nonneg_int(u.get("cache_read_input_tokens"))
-        cc = _coerce_nonneg_int(u.get("cache_creation_input_tokens"))
-        used = i + cr + cc
-        pct = (used / inferred_window) * 100.0 if inferred_window > 0 else 0.0
-        if prev_pct is not None and pct < prev_pct - COMPACTION_DROP_THRESHOLD_PCT:
-            compaction_count += 1
-        prev_pct = pct
-
-    if is_compact_summary_seen and compaction_count == 0:
+    if state["compact_summary_seen"] and compaction_count == 0:
         # Definitive marker present but the percentage drop didn't register
         # (e.g. compaction happened at session boundaries). Trust the marker.
         compaction_count = 1
 
+    # The series always ends on the latest turn, whatever the stride.
+    history = [list(point) for point in tracker["history"]]
+    if history[-1:] != [[tracker["turns"], tracker["prev_used"]]]:
+        history.append([tracker["turns"], tracker["prev_used"]])
+    burn_rate = _burn_rate(tracker["recent"], inferred_window)
+
+    input_tokens = best["input_tokens"]
+    cache_read = best["cache_read_input_tokens"]
+    cache_create = best["cache_creation_input_tokens"]
     return {
-        "tokens_used": tokens_used,
+        "tokens_used": input_tokens + cache_read + cache_create,
         "input_tokens": input_tokens,
         "cache_read_input_tokens": cache_read,
         "cache_creation_input_tokens": cache_create,
-        "model": last_model,
-        "session_id": last_session_id,
+        "model": state["model"],
+        "session_id": state["session_id"],
         "compaction_count": compaction_count,
-        "compaction_summary_seen": is_compact_summary_seen,
-        "most_recent_timestamp": most_recent_ts,
+        "compaction_summary_seen": state["compact_summary_seen"],
+        "most_recent_timestamp": best["timestamp"],
+        "turns": tracker["turns"],
+        "burn_rate_tokens_per_turn": round(burn_rate, 1) if burn_rate is not None else None,
+        "history": history,
+    }
+
+
+def _decode_line(raw: bytes) -> Optional[dict[str, Any]]:
+    """Parse one JSONL line; None for blank, partial or non-object lines."""
+    try:
+        obj = json.loads(raw)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+# Only lines carrying one of these keys can change a parse state (see
+# _feed_entry), so every other line — tool output, user turns, attachments,
+# which make up most of a transcript's bytes — is skipped without decoding.
+_RELEVANT_MARKERS = (b'"usage"', b'"isCompactSummary"')
+
+if msgspec is not None:
+    class _Message(msgspec.Struct):
+        usage: Any = msgspec.UNSET
+        model: Any = msgspec.UNSET
+        stop_reason: Any = msgspec.UNSET
+
+    class _Entry(msgspec.Struct):
+        agentName: Any = msgspec.UNSET
+        teamName: Any = msgspec.UNSET
+        sessionId: Any = msgspec.UNSET
+        timestamp: Any = msgspec.UNSET
+        isSidechain: Any = msgspec.UNSET
+        isApiErrorMessage: Any = msgspec.UNSET
+        isCompactSummary: Any = msgspec.UNSET
+        message: Union[_Message, None, msgspec.UnsetType] = msgspec.UNSET
+
+    _ENTRY_DECODER = msgspec.json.Decoder(_Entry)
+
+    def _struct_fields(struct: Any) -> dict[str, Any]:
+        return {
+            name: getattr(struct, name)
+            for name in struct.__struct_fields__
+            if getattr(struct, name) is not msgspec.UNSET
+        }
+
+    def _decode_entry_msgspec(raw: bytes) -> Optional[dict[str, Any]]:
+        """Typed decode of only the fields _feed_entry reads; anything that
+        doesn't fit the schema (e.g. a non-object message) goes through the
+        generic decoder so the result never differs from json.loads."""
+        try:
+            entry = _ENTRY_DECODER.decode(raw)
+        except msgspec.DecodeError:
+            return _decode_line(raw)
+        obj = _struct_fields(entry)
+        if isinstance(entry.message, _Message):
+            obj["message"] = _struct_fields(entry.message)
+        return obj
+
+
+def _decode_entry_orjson(raw: bytes) -> Optional[dict[str, Any]]:
+    try:
+        obj = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson is stricter (NaN, huge ints); let json decide.
+        return _decode_line(raw)
+    return obj if isinstance(obj, dict) else None
+
+
+def _entry_decoder(backend: str):
+    """Line decoder for `backend`: "msgspec", "orjson", "json" or "auto"
+    (the fastest one installed)."""
+    if backend in ("auto", "msgspec") and msgspec is not None:
+        return _decode_entry_msgspec
+    if backend in ("auto", "orjson") and orjson is not None:
+        return _decode_entry_orjson
+    if backend in ("auto", "json", "msgspec", "orjson"):
+        return _decode_line
+    raise ValueError(f"unknown JSON backend: {backend}")
+
+
+_decode_entry = _entry_decoder(os.environ.get("BMAD_AUTO_JSON_BACKEND", "auto"))
+
+
+SCAN_BLOCK_BYTES = 1 << 20
+
+
+def _relevant_lines(block: bytes):
+    """Yield (start, end) of each line in `block` (whole lines only) that
+    contains a relevant marker. Found with bytes.find over the block, so
+    lines without one are never split out or copied."""
+    nxt = [block.find(marker) for marker in _RELEVANT_MARKERS]
+    pos = 0
+    while True:
+        hits = [h for h in nxt if h >= 0]
+        if not hits:
+            return
+        hit = min(hits)
+        start = block.rfind(b"\n", 0, hit) + 1
+        end = block.find(b"\n", hit) + 1
+        yield start, end
+        pos = end
+        nxt = [h if h >= pos or h < 0 else block.find(marker, pos)
+               for h, marker in zip(nxt, _RELEVANT_MARKERS)]
+
+
+def _scan_transcript(
+    transcript_path: Path,
+    offset: int,
+    states: dict[Optional[str], tuple[int, dict[str, Any]]],
+) -> int:
+    """Feed every entry from byte `offset` on into the parse states; return
+    the offset just past the last consumed line.
+
+    `states` maps an agentName (None = every line) to (start offset, state):
+    a line reaches a state only if it starts at or after that state's start,
+    so agents resuming from different checkpoints share one read. A trailing
+    line with no newline that does not decode yet is left for the next scan
+    (it is still being written).
+    """
+    def feed(line_start: int, obj: Optional[dict[str, Any]]) -> None:
+        if obj is None:
+            return  # Tolerate corrupt lines in the middle of the file.
+        line_agent = obj.get("agentName")
+        for agent_name, (start, state) in states.items():
+            if line_start < start or (agent_name and line_agent != agent_name):
+                continue
+            _feed_entry(state, obj)
+
+    try:
+        with transcript_path.open("rb") as fh:
+            fh.seek(offset)
+            # Bytes after the last newline seen, starting at `offset`. Kept as
+            # pieces and joined once a newline arrives, so a line spanning
+            # many blocks is copied once rather than once per block.
+            pieces: list[bytes] = []
+            while True:
+                chunk = fh.read(SCAN_BLOCK_BYTES)
+                if not chunk:
+                    break
+                last_newline = chunk.rfind(b"\n")
+                if last_newline < 0:
+                    pieces.append(chunk)
+                    continue
+                if pieces:
+                    pieces.append(chunk)
+                    block = b"".join(pieces)
+                    last_newline += len(block) - len(chunk)
+                else:
+                    block = chunk
+                whole = block[: last_newline + 1]
+                for start, end in _relevant_lines(whole):
+                    feed(offset + start, _decode_entry(whole[start:end]))
+                offset += last_newline + 1
+                rest = block[last_newline + 1:]
+                pieces = [rest] if rest else []
+    except OSError as exc:
+        raise TranscriptParseError(f"could not read {transcript_path}: {exc}") from exc
+
+    pending = b"".join(pieces)
+    if pending:
+        obj = _decode_entry(pending)
+        if obj is not None:
+            feed(offset, obj)
+            offset += len(pending)
+    return offset
+
+
+# ---------------------------------------------------------------------------
+# Incremental checkpoints
+# ---------------------------------------------------------------------------
+
+CHECKPOINT_VERSION = 2
+CHECKPOINT_PROBE_BYTES = 4096              # head/tail bytes hashed to spot rewrites
+
+
+def _checkpoint_path(transcript_path: Path, agent_name: Optional[str]) -> Path:
+    key = f"{transcript_path.resolve()}\0{agent_name or ''}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    return cache_dir() / "checkpoints" / f"{digest}.json"
+
+
+def _file_probe(transcript_path: Path, offset: int) -> dict[str, Any]:
+    """Identity of the first `offset` bytes: inode plus hashes of the head and
+    of the bytes just before `offset`. A truncated or rewritten file fails it."""
+    st = transcript_path.stat()
+    head_len = min(offset, CHECKPOINT_PROBE_BYTES)
+    tail_start = max(0, offset - CHECKPOINT_PROBE_BYTES)
+    with transcript_path.open("rb") as fh:
+        head = fh.read(head_len)
+        fh.seek(tail_start)
+        tail = fh.read(offset - tail_start)
+    return {
+        "dev": st.st_dev,
+        "ino": st.st_ino,
+        "offset": offset,
+        "head_sha1": hashlib.sha1(head).hexdigest(),
+        "tail_sha1": hashlib.sha1(tail).hexdigest(),
     }
 
 
+def _load_checkpoint(transcript_path: Path, agent_name: Optional[str]) -> Optional[dict[str, Any]]:
+    """Return a checkpoint that is still a valid prefix of the transcript."""
+    try:
+        with _checkpoint_path(transcript_path, agent_name).open("r", encoding="utf-8") as fh:
+            checkpoint = json.load(fh)
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            return None
+        probe = checkpoint["probe"]
+        if transcript_path.stat().st_size < probe["offset"]:
+            return None  # truncated
+        if _file_probe(transcript_path, probe["offset"]) != probe:
+            return None  # replaced or rewritten
+        return checkpoint
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_checkpoint(
+    transcript_path: Path,
+    agent_name: Optional[str],
+    offset: int,
+    state: dict[str, Any],
+) -> None:
+    """Atomically store a checkpoint; failures only cost a full parse next run."""
+    path = _checkpoint_path(transcript_path, agent_name)
+    try:
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "transcript_path": str(transcript_path),
+            "agent_name": agent_name,
+            "probe": _file_probe(transcript_path, offset),
+            "state": state,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(checkpoint, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def parse_transcript(
+    transcript_path: Path,
+    agent_name: Optional[str] = None,
+    incremental: bool = False,
+) -> dict[str, Any]:
+    """Compute the most recent main-chain context length and the compaction
+    count, applying ccstatusline's streaming-aware and sidechain-aware
+    filtering. If `agent_name` is given, restrict to lines tagged with that
+    agentName (so a multi-agent transcript file is filtered correctly).
+
+    With `incremental=True` the parse resumes from the checkpoint saved by the
+    previous incremental run (per transcript and agent) and only reads the
+    bytes appended since; the result is the same as a full parse. A truncated
+    or rewritten transcript is detected and parsed from the start.
+
+    Returns a dict with keys: tokens_used, input_tokens, cache_read_input_tokens,
+    cache_creation_input_tokens, model, session_id, compaction_count, used_pct
+    (None if window unknown), and the most_recent_timestamp.
+    """
+    return parse_transcript_agents(transcript_path, [agent_name], incremental)[agent_name]
+
+
+def parse_transcript_agents(
+    transcript_path: Path,
+    agent_names: list[Optional[str]],
+    incremental: bool = False,
+) -> dict[Optional[str], dict[str, Any]]:
+    """parse_transcript() for several agents sharing one transcript, reading
+    the file once. Returns {agent_name: result}."""
+    states = _initial_states(transcript_path, agent_names, incremental)
+    offset = min(start for start, _ in states.values())
+    end = _scan_transcript(transcript_path, offset, states)
+    if incremental:
+        for agent_name, (start, state) in states.items():
+            if end != start:
+                _save_checkpoint(transcript_path, agent_name, end, state)
+    return {agent_name: _finish_parse(state) for agent_name, (_, state) in states.items()}
+
+
+def _initial_states(
+    transcript_path: Path,
+    agent_names: list[Optional[str]],
+    incremental: bool,
+) -> dict[Optional[str], tuple[int, dict[str, Any]]]:
+    """{agent_name: (start offset, state)} from checkpoints or from scratch."""
+    states: dict[Optional[str], tuple[int, dict[str, Any]]] = {}
+    for agent_name in agent_names:
+        checkpoint = _load_checkpoint(transcript_path, agent_name) if incremental else None
+        if checkpoint is not None:
+            states[agent_name] = (checkpoint["probe"]["offset"], checkpoint["state"])
+        else:
+            states[agent_name] = (0, _new_parse_state())
+    return states
+
+
 # ---------------------------------------------------------------------------
 # Recommendation policy
 # ---------------------------------------------------------------------------
@@ -401,6 +1020,184 @@ def recommend(
     return "respawn-with-handover" if used_pct > threshold else "ok"
 
 
+def turns_until_threshold(
+    tokens_used: int,
+    window: int,
+    threshold_pct: float,
+    burn_rate: Optional[float],
+) -> Optional[int]:
+    """Projected turns before usage crosses the threshold at the current burn
+    rate: 0 if already past it, None if usage isn't growing (or unknown)."""
+    if window <= 0:
+        return None
+    remaining = window * threshold_pct / 100.0 - tokens_used
+    if remaining <= 0:
+        return 0
+    if not burn_rate or burn_rate <= 0:
+        return None
+    return math.ceil(remaining / burn_rate)
+
+
+# ---------------------------------------------------------------------------
+# Watch mode — follow transcripts and push changes
+# ---------------------------------------------------------------------------
+
+# inotify(7) constants from <sys/inotify.h>
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVE_SELF = 0x800
+_IN_DELETE_SELF = 0x400
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVE_SELF | _IN_DELETE_SELF
+
+
+WATCH_REDISCOVER_SECONDS = 5.0  # how often --watch re-runs discovery
+
+
+def _inotify_open(paths: list[Path]) -> Optional[int]:
+    """An inotify fd watching `paths`, or None where inotify is unavailable
+    (non-Linux, no libc, watch limit reached) so the caller polls instead."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        for path in paths:
+            if libc.inotify_add_watch(fd, os.fsencode(str(path)), _WATCH_MASK) < 0:
+                os.close(fd)
+                return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def _wait_for_change(fd: Optional[int], timeout: float) -> None:
+    """Block until an inotify event arrives or `timeout` seconds pass. The
+    timeout doubles as the polling interval when inotify is unavailable."""
+    if fd is None:
+        time.sleep(timeout)
+        return
+    readable, _, _ = select.select([fd], [], [], timeout)
+    if readable:
+        try:
+            while os.read(fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+
+def watch(args: argparse.Namespace, transcripts: dict[Optional[str], Path]) -> int:
+    """Follow the agents' transcripts, printing one JSON line per agent on
+    start and afterwards only when its recommendation changes, a new
+    compaction is detected or, for agents found by name/team, discovery
+    moves it to a newer transcript (respawn-with-handover). Runs until
+    interrupted or sent SIGTERM."""
+    transcripts = dict(transcripts)
+    by_path: dict[Path, list[Optional[str]]] = {}
+    followed: dict[Path, dict[str, Any]] = {}
+
+    def start(path: Path) -> None:
+        states = _initial_states(path, by_path[path], args.incremental)
+        offset = min(begin for begin, _ in states.values())
+        followed[path] = {"offset": offset, "states": states, "ino": None, "fresh": True}
+
+    def follow_transcripts() -> None:
+        """Start following new paths and drop ones no agent maps to."""
+        by_path.clear()
+        for name, path in transcripts.items():
+            by_path.setdefault(path, []).append(name)
+        for path in list(followed):
+            if path not in by_path or set(followed[path]["states"]) != set(by_path[path]):
+                del followed[path]
+        for path in by_path:
+            if path not in followed:
+                start(path)
+
+    follow_transcripts()
+    # A fixed --transcript-path or --session-id always names the same file.
+    rediscover = not (args.transcript_path or args.session_id)
+    discovered_at = time.monotonic()
+    # The orchestrator stops a watcher with SIGTERM; treat it like Ctrl-C.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    last: dict[Optional[str], tuple[str, int]] = {}
+    switched: set[Optional[str]] = set()
+    fd = None
+    watched_inodes: dict[Path, int] = {}
+
+    try:
+        while True:
+            if rediscover and time.monotonic() - discovered_at >= WATCH_REDISCOVER_SECONDS:
+                discovered_at = time.monotonic()
+                for name, path in resolve_transcripts(args, list(transcripts)).items():
+                    if path is not None and path != transcripts[name]:
+                        transcripts[name] = path
+                        switched.add(name)
+                if switched:
+                    follow_transcripts()
+            for path, follow in followed.items():
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                if (follow["ino"] is not None and st.st_ino != follow["ino"]) or st.st_size < follow["offset"]:
+                    start(path)  # rotated, rewritten or truncated: parse afresh
+                    follow = followed[path]
+                follow["ino"] = st.st_ino
+                if st.st_size == follow["offset"] and not follow["fresh"]:
+                    continue
+                follow["fresh"] = False
+                end = _scan_transcript(path, follow["offset"], follow["states"])
+                if args.incremental and end != follow["offset"]:
+                    for name, (_, state) in follow["states"].items():
+                        _save_checkpoint(path, name, end, state)
+                follow["offset"] = end
+                follow["states"] = {name: (0, state) for name, (_, state) in follow["states"].items()}
+
+                for name, (_, state) in follow["states"].items():
+                    report = build_report(args, name, path, _finish_parse(state))
+                    key = (report["recommendation"], report["compaction_count"])
+                    previous = last.get(name)
+                    if name in switched:
+                        switched.discard(name)
+                        event = "transcript-changed"
+                    elif previous == key:
+                        continue
+                    elif previous is None:
+                        event = "initial"
+                    elif key[1] > previous[1]:
+                        event = "compaction"
+                    elif key[0] != previous[0]:
+                        event = "recommendation-changed"
+                    else:
+                        event = None  # compaction count fell after a rewrite
+                    last[name] = key
+                    if event:
+                        print(json.dumps({"event": event, **report}), flush=True)
+
+            inodes = {path: follow["ino"] for path, follow in followed.items()}
+            if fd is None or inodes != watched_inodes:
+                if fd is not None:
+                    os.close(fd)
+                fd = _inotify_open(list(followed))
+                watched_inodes = inodes
+            _wait_for_change(fd, args.poll_interval)
+    except KeyboardInterrupt:
+        return 0
+    except TranscriptParseError as exc:
+        print(json.dumps({"error": str(exc)}), flush=True)
+        return 2
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -411,8 +1208,19 @@ def parse_args() -> argparse.Namespace:
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     p.add_argument("--session-id", help="Direct session id (filename stem).")
-    p.add_argument("--agent-name", help="Match transcripts by agentName field.")
+    p.add_argument(
+        "--agent-name",
+        action="append",
+        help="Match transcripts by agentName field. Repeat for several agents "
+             "to get one JSON array covering all of them.",
+    )
     p.add_argument("--team-name", help="Match transcripts by teamName field.")
+    p.add_argument(
+        "--all-agents",
+        action="store_true",
+        help="With --team-name: report every agent seen in that team, as one "
+             "JSON array.",
+    )
     p.add_argument(
         "--context-window",
         type=int,
@@ -440,45 +1248,54 @@ def parse_args() -> argparse.Namespace:
              "keep them alive until they actually approach context exhaustion. "
              "Use the policy default everywhere else.",
     )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Resume from the checkpoint left by the previous --incremental run "
+             "and parse only the bytes appended since (checkpoints live in "
+             "$BMAD_AUTO_CACHE_DIR, default ~/.cache/bmad-auto). Output is "
+             "identical to a full parse.",
+    )
+    p.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Find the transcript by scanning ~/.claude/projects directly "
+             "instead of through the discovery index in $BMAD_AUTO_CACHE_DIR.",
+    )
+    p.add_argument(
+        "--history",
+        action="store_true",
+        help="Include the downsampled [turn, tokens_used] series (at most %d "
+             "points plus the latest turn) in the output." % HISTORY_POINTS,
+    )
+    p.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: follow the transcript(s) (inotify on Linux, polling "
+             "elsewhere) and print one JSON line per agent at start and then "
+             "only when its recommendation changes or a compaction is detected. "
+             "Agents found by name or team are re-discovered every %d seconds, "
+             "so a respawned agent's new transcript is followed "
+             "(event \"transcript-changed\")." % WATCH_REDISCOVER_SECONDS,
+    )
+    p.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks in --watch mode when inotify is "
+             "unavailable (also the longest wait between inotify wakeups). "
+             "Default: 1.",
+    )
     return p.parse_args()
 
 
-def main() -> int:
-    args = parse_args()
-
-    # Locate the transcript.
-    if args.transcript_path:
-        transcript = Path(args.transcript_path)
-        if not transcript.exists():
-            print(json.dumps({"error": f"transcript not found: {transcript}"}))
-            return 1
-    elif args.session_id:
-        transcript = find_transcript_by_session_id(args.session_id)
-    elif args.agent_name or args.team_name:
-        transcript = find_transcript_by_agent(args.agent_name, args.team_name)
-    else:
-        print(json.dumps({
-            "error": "must provide --session-id, --agent-name, --team-name, "
-                     "or --transcript-path",
-        }))
-        return 2
-
-    if transcript is None:
-        print(json.dumps({
-            "error": "no transcript matched the given criteria",
-            "agent_name": args.agent_name,
-            "team_name": args.team_name,
-            "session_id": args.session_id,
-        }))
-        return 1
-
-    # Parse it.
-    try:
-        result = parse_transcript(transcript, agent_name=args.agent_name)
-    except TranscriptParseError as exc:
-        print(json.dumps({"error": str(exc), "transcript_path": str(transcript)}))
-        return 2
-
+def build_report(
+    args: argparse.Namespace,
+    agent_name: Optional[str],
+    transcript: Path,
+    result: dict[str, Any],
+) -> dict[str, Any]:
+    """Apply window inference and the policy to one parse result."""
     # Determine context window.
     if args.context_window:
         window = args.context_window
@@ -517,9 +1334,12 @@ def main() -> int:
         policy=policy,
         threshold_pct=args.threshold_pct,
     )
+    turns_left = turns_until_threshold(
+        result["tokens_used"], window, threshold_pct_used, result.get("burn_rate_tokens_per_turn")
+    )
 
-    out = {
-        "agent_name": args.agent_name,
+    report = {
+        "agent_name": agent_name,
         "team_name": args.team_name,
         "session_id": result.get("session_id"),
         "transcript_path": str(transcript),
@@ -539,9 +1359,154 @@ def main() -> int:
         "policy": policy,
         "threshold_pct": threshold_pct_used,
         "recommendation": rec,
+        "turns": result.get("turns", 0),
+        "burn_rate_tokens_per_turn": result.get("burn_rate_tokens_per_turn"),
+        "turns_until_threshold": turns_left,
     }
+    if getattr(args, "history", False):
+        report["history"] = result.get("history", [])
+    return report
+
+
+def resolve_transcripts(
+    args: argparse.Namespace, agent_names: list[Optional[str]]
+) -> dict[Optional[str], Optional[Path]]:
+    """Transcript per agent from --transcript-path, --session-id or discovery
+    (one pass for all agents). A None agent matches on --team-name alone."""
+    use_index = not args.no_index
+    if args.transcript_path:
+        transcript: Optional[Path] = Path(args.transcript_path)
+        return {name: transcript for name in agent_names}
+    if args.session_id:
+        transcript = find_transcript_by_session_id(args.session_id, use_index=use_index)
+        return {name: transcript for name in agent_names}
+    if agent_names == [None]:
+        return {None: find_transcript_by_agent(None, args.team_name, use_index=use_index)}
+    return dict(find_transcripts_by_agents(agent_names, args.team_name, use_index=use_index))
+
+
+def run_batch(args: argparse.Namespace, agent_names: list[str]) -> int:
+    """Report several agents as one JSON array. Discovery is a single pass and
+    each transcript shared by several agents is parsed once for all of them."""
+    if args.transcript_path and not Path(args.transcript_path).exists():
+        print(json.dumps({"error": f"transcript not found: {args.transcript_path}"}))
+        return 1
+    transcripts = resolve_transcripts(args, agent_names)
+
+    by_path: dict[Path, list[str]] = {}
+    for name, path in transcripts.items():
+        if path is not None:
+            by_path.setdefault(path, []).append(name)
+
+    results: dict[str, Any] = {}
+    for path, names in by_path.items():
+        try:
+            parsed = parse_transcript_agents(path, names, incremental=args.incremental)
+        except TranscriptParseError as exc:
+            parsed = {name: exc for name in names}
+        results.update(parsed)
+
+    reports = []
+    for name in agent_names:
+        transcript = transcripts.get(name)
+        result = results.get(name)
+        if transcript is None:
+            reports.append({
+                "error": "no transcript matched the given criteria",
+                "agent_name": name,
+                "team_name": args.team_name,
+                "session_id": args.session_id,
+            })
+        elif isinstance(result, TranscriptParseError):
+            reports.append({"error": str(result), "agent_name": name, "transcript_path": str(transcript)})
+        else:
+            reports.append(build_report(args, name, transcript, result))
+
+    print(json.dumps(reports, indent=2))
+    return 0 if all("error" not in report for report in reports) else 1
+
+
+def main() -> int:
+    args = parse_args()
+    agent_names: list[str] = list(dict.fromkeys(args.agent_name or []))
+
+    if args.all_agents:
+        if not args.team_name:
+            print(json.dumps({"error": "--all-agents requires --team-name"}))
+            return 2
+        team_agents = list_team_agents(args.team_name, use_index=not args.no_index)
+        agent_names = list(dict.fromkeys(agent_names + team_agents))
+        if not agent_names:
+            print(json.dumps({
+                "error": "no agents found for the given team",
+                "team_name": args.team_name,
+            }))
+            return 1
+    if args.watch:
+        if args.transcript_path and not Path(args.transcript_path).exists():
+            print(json.dumps({"error": f"transcript not found: {args.transcript_path}"}))
+            return 1
+        if not (args.transcript_path or args.session_id or agent_names or args.team_name):
+            print(json.dumps({
+                "error": "must provide --session-id, --agent-name, --team-name, "
+                         "or --transcript-path",
+            }))
+            return 2
+        transcripts = resolve_transcripts(args, agent_names or [None])
+        missing = [name for name, path in transcripts.items() if path is None]
+        if missing:
+            print(json.dumps({
+                "error": "no transcript matched the given criteria",
+                "agent_names": missing,
+                "team_name": args.team_name,
+                "session_id": args.session_id,
+            }))
+            return 1
+        return watch(args, transcripts)
+    if args.all_agents or len(agent_names) > 1:
+        return run_batch(args, agent_names)
+    agent_name = agent_names[0] if agent_names else None
+
+    # Locate the transcript.
+    if args.transcript_path:
+        transcript = Path(args.transcript_path)
+        if not transcript.exists():
+            print(json.dumps({"error": f"transcript not found: {transcript}"}))
+            return 1
+    elif args.session_id:
+        transcript = find_transcript_by_session_id(
+            args.session_id, use_index=not args.no_index
+        )
+    elif agent_name or args.team_name:
+        transcript = find_transcript_by_agent(
+            agent_name, args.team_name, use_index=not args.no_index
+        )
+    else:
+        print(json.dumps({
+            "error": "must provide --session-id, --agent-name, --team-name, "
+                     "or --transcript-path",
+        }))
+        return 2
+
+    if transcript is None:
+        print(json.dumps({
+            "error": "no transcript matched the given criteria",
+            "agent_name": agent_name,
+            "team_name": args.team_name,
+            "session_id": args.session_id,
+        }))
+        return 1
+
+    # Parse it.
+    try:
+        result = parse_transcript(
+            transcript, agent_name=agent_name, incremental=args.incremental
+        )
+    except TranscriptParseError as exc:
+        print(json.dumps({"error": str(exc), "transcript_path": str(transcript)}))
+        return 2
 
-    print(json.dumps(out, indent=2))
+    print(json.dumps(build_report(args, agent_name, transcript, result), indent=2))
     return 0
 
 
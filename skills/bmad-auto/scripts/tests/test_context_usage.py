@@ -0,0 +1,135 @@
+"""
+Tests for context-usage.py
+"""
+
+import importlib.util
+import json
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+SCRIPT_DIR = Path(__file__).parent.parent
+spec = importlib.util.spec_from_file_location("context_usage", SCRIPT_DIR / "context-usage.py")
+cu = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = cu
+spec.loader.exec_module(cu)
+
+
+def write_transcript(path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        for entry in entries:
+            fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+@pytest.fixture
+def projects(tmp_path, monkeypatch):
+    """Point ~/.claude/projects and the cache at a temp dir."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("BMAD_AUTO_CACHE_DIR", str(tmp_path / "cache"))
+    root = tmp_path / ".claude" / "projects" / "proj"
+    write_transcript(root / "lead.jsonl", [
+        {"sessionId": "s-lead", "agentName": "lead", "teamName": "alpha"},
+        # Nested ids (tool input/output) must not be indexed.
+        {"sessionId": "s-lead", "message": {"content": {"agentName": "ghost", "teamName": "alpha",
+                                                        "sessionId": "s-nested"}}},
+        {"sessionId": "s-lead", "toolUseResult": {"teamName": "beta"}, "agentName": "lead"},
+    ])
+    write_transcript(root / "worker.jsonl", [
+        {"sessionId": "s-worker", "agentName": "worker", "teamName": "alpha"},
+        {"sessionId": "s-worker", "teamName": "gamma"},
+        {"sessionId": "s-\"quoted\""},
+    ])
+    return root
+
+
+class TestDiscoveryIndex:
+    """Test the discovery index answers like the --no-index scans."""
+
+    def test_only_top_level_fields_indexed(self, projects):
+        """Test ids inside nested objects are ignored."""
+        files = cu.load_discovery_index()
+        lead = files[str(projects / "lead.jsonl")]
+        worker = files[str(projects / "worker.jsonl")]
+
+        assert lead["session_ids"] == ["s-lead"]
+        assert {tuple(pair) for pair in lead["pairs"]} == {("lead", "alpha"), ("lead", None)}
+        assert worker["session_ids"] == ['s-"quoted"', "s-worker"]
+        assert {tuple(pair) for pair in worker["pairs"]} == {(None, "gamma"), ("worker", "alpha")}
+
+    @pytest.mark.parametrize("session_id", ["s-lead", "s-worker", "s-nested", "missing"])
+    def test_session_lookup_parity(self, projects, session_id):
+        """Test session lookups match the --no-index scan."""
+        (projects / "lead.jsonl").rename(projects / "renamed-lead.jsonl")
+        assert (cu.find_transcript_by_session_id(session_id)
+                == cu.find_transcript_by_session_id(session_id, use_index=False))
+
+    @pytest.mark.parametrize("agent,team", [
+        ("lead", None), ("lead", "alpha"), ("lead", "beta"), ("ghost", None), ("ghost", "alpha"),
+        (None, "alpha"), (None, "beta"), (None, "gamma"), ("worker", "gamma"),
+    ])
+    def test_agent_lookup_parity(self, projects, agent, team):
+        """Test agent/team lookups match the --no-index scan."""
+        assert (cu.find_transcript_by_agent(agent, team)
+                == cu.find_transcript_by_agent(agent, team, use_index=False))
+        if agent:
+            assert (cu.find_transcripts_by_agents([agent], team)
+                    == cu.find_transcripts_by_agents([agent], team, use_index=False))
+
+    @pytest.mark.parametrize("team", ["alpha", "beta", "gamma"])
+    def test_team_agents_parity(self, projects, team):
+        """Test team member listing matches the --no-index scan."""
+        assert cu.list_team_agents(team) == cu.list_team_agents(team, use_index=False)
+
+
+class TestScanTranscript:
+    """Test the block-wise transcript scan."""
+
+    def test_lines_spanning_blocks(self, tmp_path):
+        """Test lines longer than a read block parse like whole-file reads."""
+        path = tmp_path / "t.jsonl"
+        write_transcript(path, [
+            {"sessionId": "s", "agentName": "a", "timestamp": f"2026-01-01T00:00:0{i}Z",
+             "toolUseResult": {"stdout": "x" * 500 * i},
+             "message": {"model": "claude[1m]", "stop_reason": "end_turn",
+                         "usage": {"input_tokens": 1, "cache_read_input_tokens": 1000 * i}}}
+            for i in range(1, 6)
+        ])
+        expected = cu.parse_transcript(path, agent_name="a")
+
+        with patch.object(cu, 'SCAN_BLOCK_BYTES', 64):
+            assert cu.parse_transcript(path, agent_name="a") == expected
+        assert expected["tokens_used"] == 5001
+
+
+class TestWatch:
+    """Test --watch follows respawned agents."""
+
+    @patch.object(cu, 'WATCH_REDISCOVER_SECONDS', 0)
+    @patch.object(cu.signal, 'signal')
+    @patch.object(cu, '_inotify_open', return_value=None)
+    def test_switches_to_respawned_transcript(self, mock_inotify, mock_signal, projects, capsys):
+        """Test a newer transcript for the agent is picked up and reported."""
+        respawned = projects / "respawned.jsonl"
+        polls = []
+
+        def respawn(fd, timeout):
+            polls.append(timeout)
+            if len(polls) == 1:
+                write_transcript(respawned, [{"sessionId": "s-new", "agentName": "lead", "teamName": "alpha"}])
+            else:
+                raise KeyboardInterrupt
+
+        with patch('sys.argv', ['context-usage.py', '--agent-name', 'lead', '--team-name', 'alpha', '--watch']):
+            args = cu.parse_args()
+        with patch.object(cu, '_wait_for_change', side_effect=respawn):
+            assert cu.watch(args, cu.resolve_transcripts(args, ['lead'])) == 0
+
+        events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [(e["event"], Path(e["transcript_path"]).name) for e in events] == [
+            ("initial", "lead.jsonl"), ("transcript-changed", "respawned.jsonl")]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
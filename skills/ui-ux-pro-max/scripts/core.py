@@ -4,70 +4,124 @@
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
+import atexit
 import csv
+import hashlib
+import heapq
+import json
+import os
+import pickle
 import re
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+
+# Optional vectorized backend for large corpora; pure Python is the fallback.
+# NumPy/SciPy are imported on first use so small-corpus queries skip them.
+np = None
+sparse = None
+_sparse_available = None
+
+
+def _load_sparse():
+    """Import NumPy/SciPy once; False if they are not installed"""
+    global np, sparse, _sparse_available
+    if _sparse_available is None:
+        try:
+            import numpy
+            from scipy import sparse as scipy_sparse
+        except ImportError:
+            _sparse_available = False
+        else:
+            np, sparse = numpy, scipy_sparse
+            _sparse_available = True
+    return _sparse_available
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
 
+# Prebuilt indexes live outside the skill so read-only installs still work
+INDEX_DIR = Path(os.environ.get("UI_PRO_MAX_INDEX_DIR", Path.home() / ".cache" / "ui-ux-pro-max" / "index"))
+INDEX_VERSION = 3
+
+# BM25 backend: "auto" uses NumPy/SciPy for corpora of SPARSE_MIN_DOCS rows or
+# more (when installed), "numpy" always does, "python" never does
+BM25_BACKEND = os.environ.get("UI_PRO_MAX_BM25_BACKEND", "auto")
+SPARSE_MIN_DOCS = 5000
+
+# Query result LRU; mirrored to a JSON file so separate CLI runs share hits.
+# Set UI_PRO_MAX_RESULT_CACHE to another path, or to "off" to keep it in memory.
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_FILE = os.environ.get("UI_PRO_MAX_RESULT_CACHE", str(INDEX_DIR.parent / "results.json"))
+
+# field_weights: BM25F boost per search column (missing columns weigh 1.0);
+# a term in a short name column should outrank the same term in long prose
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
         "search_cols": ["Style Category", "Keywords", "Best For", "Type"],
+        "field_weights": {"Style Category": 3.0, "Keywords": 2.0, "Best For": 1.0, "Type": 1.0},
         "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity"]
     },
     "prompt": {
         "file": "prompts.csv",
         "search_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords"],
+        "field_weights": {"Style Category": 3.0, "AI Prompt Keywords (Copy-Paste Ready)": 1.5, "CSS/Technical Keywords": 1.0},
         "output_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords", "Implementation Checklist"]
     },
     "color": {
         "file": "colors.csv",
         "search_cols": ["Product Type", "Keywords", "Notes"],
+        "field_weights": {"Product Type": 3.0, "Keywords": 2.0, "Notes": 0.5},
         "output_cols": ["Product Type", "Keywords", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Border (Hex)", "Notes"]
     },
     "chart": {
         "file": "charts.csv",
         "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
+        "field_weights": {"Data Type": 3.0, "Keywords": 2.0, "Best Chart Type": 1.5, "Accessibility Notes": 0.5},
         "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"]
     },
     "landing": {
         "file": "landing.csv",
         "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
+        "field_weights": {"Pattern Name": 3.0, "Keywords": 2.0, "Conversion Optimization": 1.0, "Section Order": 1.0},
         "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
     },
     "product": {
         "file": "products.csv",
         "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
+        "field_weights": {"Product Type": 3.0, "Keywords": 2.0, "Primary Style Recommendation": 1.0, "Key Considerations": 0.5},
         "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
     },
     "ux": {
         "file": "ux-guidelines.csv",
         "search_cols": ["Category", "Issue", "Description", "Platform"],
+        "field_weights": {"Category": 2.0, "Issue": 3.0, "Description": 1.0, "Platform": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     },
     "typography": {
         "file": "typography.csv",
         "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
+        "field_weights": {"Font Pairing Name": 3.0, "Category": 1.5, "Mood/Style Keywords": 2.0, "Best For": 1.0, "Heading Font": 1.0, "Body Font": 1.0},
         "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
     },
     "icons": {
         "file": "icons.csv",
         "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
+        "field_weights": {"Category": 1.5, "Icon Name": 3.0, "Keywords": 2.0, "Best For": 1.0},
         "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
     },
     "react": {
         "file": "react-performance.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "field_weights": {"Category": 1.5, "Issue": 3.0, "Keywords": 2.0, "Description": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     },
     "web": {
         "file": "web-interface.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "field_weights": {"Category": 1.5, "Issue": 3.0, "Keywords": 2.0, "Description": 1.0},
         "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
     }
 }
@@ -90,6 +144,7 @@ STACK_CONFIG = {
 # Common columns for all stacks
 _STACK_COLS = {
     "search_cols": ["Category", "Guideline", "Description", "Do", "Don't"],
+    "field_weights": {"Category": 1.5, "Guideline": 3.0, "Description": 1.0, "Do": 1.0, "Don't": 1.0},
     "output_cols": ["Category", "Guideline", "Description", "Do", "Don't", "Code Good", "Code Bad", "Severity", "Docs URL"]
 }
 
@@ -103,60 +158,457 @@ class BM25:
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.postings = defaultdict(list)
         self.N = 0
+        self._term_ids = None
+        self._weights = None
+        self._doc_norms = None
 
-    def tokenize(self, text):
+    @staticmethod
+    def tokenize(text):
         """Lowercase, split, remove punctuation, filter short words"""
         text = re.sub(r'[^\w\s]', ' ', str(text).lower())
         return [w for w in text.split() if len(w) > 2]
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        corpus = [self.tokenize(doc) for doc in documents]
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        # Postings: term -> [(doc_id, term frequency)], in doc_id order
+        for doc_id, doc in enumerate(corpus):
+            for word, tf in Counter(doc).items():
+                self.postings[word].append((doc_id, tf))
 
-        for word, freq in self.doc_freqs.items():
+        for word, docs in self.postings.items():
+            freq = len(docs)
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+    def to_dict(self):
+        """Serialize the fitted index (postings, doc lengths, idf) to plain Python types"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "N": self.N,
+            "avgdl": self.avgdl,
+            "doc_lengths": self.doc_lengths,
+            "idf": self.idf,
+            "postings": dict(self.postings)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a fitted index produced by to_dict()"""
+        bm25 = cls(k1=data["k1"], b=data["b"])
+        bm25.N = data["N"]
+        bm25.avgdl = data["avgdl"]
+        bm25.doc_lengths = data["doc_lengths"]
+        bm25.idf = data["idf"]
+        bm25.postings.update(data["postings"])
+        return bm25
+
+    def score(self, query, top_k=None):
+        """Score documents against query using the inverted index.
+
+        Only documents that contain at least one query term are touched; all
+        others would score 0. Returns (doc_id, score) pairs ordered by score
+        (ties by doc_id), trimmed to the top_k best via a heap when given.
+        """
+        return self.score_tokens(self.tokenize(query), top_k)
+
+    def score_tokens(self, query_tokens, top_k=None):
+        """Same as score() for a query that is already tokenized"""
+        if self._use_sparse():
+            return self._score_sparse(query_tokens, top_k)
+
+        scores = defaultdict(float)
+        norms = self._norms()
+
+        for token in query_tokens:
+            if token not in self.idf:
+                continue
+            idf = self.idf[token]
+            for doc_id, tf in self.postings[token]:
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norms[doc_id])
+
+        rank_key = lambda x: (-x[1], x[0])
+        if top_k is not None and top_k < len(scores):
+            return heapq.nsmallest(top_k, scores.items(), key=rank_key)
+        return sorted(scores.items(), key=rank_key)
+
+    def _norms(self):
+        """Per-document saturation constant: k1 * (1 - b + b * |d| / avgdl)"""
+        if self._doc_norms is None:
+            self._doc_norms = [self.k1 * (1 - self.b + self.b * dl / self.avgdl) for dl in self.doc_lengths]
+        return self._doc_norms
+
+    def _use_sparse(self):
+        """Whether to score with the NumPy/SciPy backend"""
+        if BM25_BACKEND == "python":
+            return False
+        if BM25_BACKEND != "numpy" and self.N < SPARSE_MIN_DOCS:
+            return False
+        return _load_sparse()
+
+    def _term_weights(self):
+        """Term-document CSR matrix of BM25 weights, built once from the postings.
+
+        Row t holds idf(t) * tf * (k1 + 1) / (tf + norm(d)) for every document
+        d containing t, where norm(d) comes from _norms(). A query score is
+        then a sparse dot product of query term counts with the matching rows.
+        """
+        if self._weights is None:
+            vocab = list(self.postings)
+            self._term_ids = {word: i for i, word in enumerate(vocab)}
+            indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(self.postings[word]) for word in vocab])
+            pairs = np.array([p for word in vocab for p in self.postings[word]], dtype=np.float64).reshape(-1, 2)
+            doc_ids = pairs[:, 0].astype(np.int32)
+            tf = pairs[:, 1]
+
+            norm = np.asarray(self._norms(), dtype=np.float64)
+            idf = np.repeat(np.array([self.idf[word] for word in vocab], dtype=np.float64), np.diff(indptr))
+            data = idf * tf * (self.k1 + 1) / (tf + norm[doc_ids])
+            self._weights = sparse.csr_matrix((data, doc_ids, indptr), shape=(len(vocab), self.N))
+        return self._weights
+
+    def _score_sparse(self, query_tokens, top_k=None):
+        """Vectorized score_tokens(): same ranking contract, computed with SciPy"""
+        if top_k == 0:
+            return []
+        weights = self._term_weights()
+        counts = Counter(token for token in query_tokens if token in self._term_ids)
+        if not counts:
+            return []
+
+        term_rows = [self._term_ids[token] for token in counts]
+        query = sparse.csr_matrix(
+            (np.fromiter(counts.values(), dtype=np.float64, count=len(counts)),
+             ([0] * len(counts), term_rows)),
+            shape=(1, weights.shape[0])
+        )
+        hits = (query @ weights).tocsr()
+        doc_ids, values = hits.indices, hits.data
+
+        # Keep everything tied with the k-th best so the doc_id tie-break holds
+        if top_k is not None and top_k < len(values):
+            kth = np.partition(values, len(values) - top_k)[len(values) - top_k]
+            keep = values >= kth
+            doc_ids, values = doc_ids[keep], values[keep]
+        order = np.lexsort((doc_ids, -values))
+        if top_k is not None:
+            order = order[:top_k]
+        return [(int(doc_ids[i]), float(values[i])) for i in order]
+
+
+class BM25F(BM25):
+    """BM25F: BM25 over documents split into weighted fields.
+
+    Each field keeps its own length statistics. At fit time a term's
+    per-field frequencies are length-normalized per field, multiplied by the
+    field weight and summed into one pseudo term frequency, which is what the
+    postings store. Scoring then saturates that value with a plain k1, so
+    score_tokens() and the sparse backend work unchanged.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, field_weights=None):
+        super().__init__(k1=k1, b=b)
+        self.field_weights = list(field_weights or [])
+        self.field_avgdl = []
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    def fit(self, documents):
+        """Build the index from documents given as lists of field strings"""
+        corpus = [[self.tokenize(field) for field in doc] for doc in documents]
+        self.N = len(corpus)
+        if self.N == 0:
+            return
+        n_fields = len(corpus[0])
+        if len(self.field_weights) != n_fields:
+            self.field_weights = (self.field_weights + [1.0] * n_fields)[:n_fields]
+        self.doc_lengths = [sum(len(field) for field in doc) for doc in corpus]
+        self.avgdl = sum(self.doc_lengths) / self.N
+        self.field_avgdl = [sum(len(doc[f]) for doc in corpus) / self.N for f in range(n_fields)]
+
+        for doc_id, doc in enumerate(corpus):
+            pseudo_tf = defaultdict(float)
+            for f, field in enumerate(doc):
+                if not field or not self.field_weights[f]:
+                    continue
+                length_norm = 1 - self.b + self.b * len(field) / self.field_avgdl[f]
+                boost = self.field_weights[f] / length_norm
+                for word, tf in Counter(field).items():
+                    pseudo_tf[word] += tf * boost
+            for word, tf in pseudo_tf.items():
+                self.postings[word].append((doc_id, tf))
+
+        for word, docs in self.postings.items():
+            freq = len(docs)
+            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-            scores.append((idx, score))
+    def to_dict(self):
+        data = super().to_dict()
+        data.update(model="bm25f", field_weights=self.field_weights, field_avgdl=self.field_avgdl)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        bm25 = super().from_dict(data)
+        bm25.field_weights = data["field_weights"]
+        bm25.field_avgdl = data["field_avgdl"]
+        return bm25
+
+    def _norms(self):
+        """Length normalization already happened per field at fit time"""
+        if self._doc_norms is None:
+            self._doc_norms = [self.k1] * self.N
+        return self._doc_norms
+
+
+# ============ PERSISTENT INDEX ============
+class CsvIndex:
+    """Prebuilt BM25 index for one CSV file plus the output rows it ranks.
+
+    Built once and pickled under INDEX_DIR (loading it is several times
+    faster than refitting, even for the small bundled CSVs; JSON was slower
+    than a rebuild). The fingerprint records the
+    CSV's mtime, size and SHA-1 together with the column config and field
+    weights, so an edited data file (or a changed CSV_CONFIG entry) triggers
+    a rebuild on next use.
+    """
+
+    def __init__(self, bm25, rows, fingerprint):
+        self.bm25 = bm25
+        self.rows = rows
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, filepath, search_cols, output_cols, fingerprint, field_weights=None):
+        """Read the CSV and fit a fresh BM25F index with one field per search column"""
+        data = _load_csv(filepath)
+        documents = [[str(row.get(col, "")) for col in search_cols] for row in data]
+        field_weights = field_weights or {}
+        bm25 = BM25F(field_weights=[field_weights.get(col, 1.0) for col in search_cols])
+        bm25.fit(documents)
+        rows = [{col: row.get(col, "") for col in output_cols if col in row} for row in data]
+        return cls(bm25, rows, fingerprint)
+
+    def to_dict(self):
+        return {"fingerprint": self.fingerprint, "rows": self.rows, "bm25": self.bm25.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        model = BM25F if data["bm25"].get("model") == "bm25f" else BM25
+        return cls(model.from_dict(data["bm25"]), data["rows"], data["fingerprint"])
+
+
+class ResultCache:
+    """Bounded LRU of ranked search hits.
+
+    Keys combine the CSV, the sorted query tokens, max_results and the data
+    version (the CSV's mtime and size + column config), so an edited data
+    file can never serve stale hits. The version needs only a stat(), so a
+    hit is answered without loading the index. When `path` is set the cache is loaded from it on first
+    use and written back at interpreter exit.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, path=None):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._loaded = False
+        self._dirty = False
+
+    @staticmethod
+    def make_key(filepath, query_tokens, max_results, stat, config):
+        return json.dumps([str(filepath), sorted(query_tokens), max_results,
+                           stat.st_mtime_ns, stat.st_size, config], ensure_ascii=False)
+
+    def get(self, key):
+        self._load()
+        rows = self.entries.get(key)
+        if rows is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return [dict(row) for row in rows]
+
+    def put(self, key, rows):
+        self._load()
+        self.entries[key] = [dict(row) for row in rows]
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._dirty = True
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None:
+            return
+        atexit.register(self.save)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(stored, list):
+            for key, rows in stored[-self.max_entries:]:
+                self.entries[key] = rows
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    def save(self):
+        """Write the cache file if anything changed; failures are ignored"""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self.entries.items()), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+
+_RESULT_CACHE = ResultCache(path=None if RESULT_CACHE_FILE.lower() in ("", "off", "0") else RESULT_CACHE_FILE)
+
+
+def result_cache_stats():
+    """Hit/miss counters of the query result cache for this process"""
+    return _RESULT_CACHE.stats()
+
+
+# In-process cache: absolute CSV path -> CsvIndex
+_INDEXES = {}
+
+
+def _file_sha1(filepath):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _config_hash(search_cols, output_cols, field_weights=None):
+    """Stable hash of the column config and field weights an index was built with"""
+    payload = json.dumps([INDEX_VERSION, search_cols, output_cols, field_weights or {}], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _index_path(filepath):
+    """On-disk location of the prebuilt index for a CSV file"""
+    try:
+        name = filepath.resolve().relative_to(DATA_DIR.resolve()).as_posix()
+    except ValueError:
+        name = filepath.name
+    path_hash = hashlib.sha1(str(filepath.resolve()).encode("utf-8")).hexdigest()[:8]
+    return INDEX_DIR / f"{name.replace('/', '__')}-{path_hash}.pickle"
+
+
+# Index files this module writes: <name>-<path hash>.pickle (.json before v3)
+_INDEX_FILE_RE = re.compile(r"-[0-9a-f]{8}\.(pickle|json)$")
+_INDEX_ERRORS = (OSError, EOFError, pickle.UnpicklingError, ValueError, KeyError, TypeError, AttributeError)
+
+
+def _read_index(index_path):
+    """Load a stored index, or None if it is missing or unreadable"""
+    try:
+        with open(index_path, 'rb') as f:
+            pickle.load(f)  # header
+            return CsvIndex.from_dict(pickle.load(f))
+    except _INDEX_ERRORS:
+        return None
+
+
+def _write_index(index_path, index, source):
+    """Atomically store an index; failures only cost a rebuild next run.
+
+    The file starts with a small header naming the source CSV, so stale
+    indexes can be found without loading them.
+    """
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"source": source}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(index.to_dict(), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        return
+    _prune_indexes(index_path)
+
+
+def _prune_indexes(keep):
+    """Delete index files whose CSV was moved or removed, and old JSON indexes"""
+    try:
+        paths = [p for p in INDEX_DIR.iterdir() if p != keep and _INDEX_FILE_RE.search(p.name)]
+    except OSError:
+        return
+    for path in paths:
+        source = None
+        if path.suffix == ".pickle":
+            try:
+                with open(path, 'rb') as f:
+                    source = pickle.load(f).get("source")
+            except _INDEX_ERRORS:
+                pass
+        if not source or not os.path.exists(source):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _get_index(filepath, search_cols, output_cols, field_weights=None):
+    """Return the index for a CSV, loading or rebuilding it lazily.
+
+    Lookup order: in-process cache, then the on-disk index, then a fresh
+    build. A stat() mismatch falls back to comparing the content hash, so a
+    touched-but-unchanged file does not force a refit.
+    """
+    key = str(filepath.resolve())
+    stat = filepath.stat()
+    config = _config_hash(search_cols, output_cols, field_weights)
+
+    def stat_matches(fp):
+        return fp["mtime_ns"] == stat.st_mtime_ns and fp["size"] == stat.st_size and fp["config"] == config
+
+    index = _INDEXES.get(key)
+    if index is not None and stat_matches(index.fingerprint):
+        return index
+
+    index_path = _index_path(filepath)
+    stored = _read_index(index_path)
+    if stored is not None and stat_matches(stored.fingerprint):
+        _INDEXES[key] = stored
+        return stored
+
+    sha1 = _file_sha1(filepath)
+    fingerprint = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": sha1, "config": config}
+    if stored is not None and stored.fingerprint.get("sha1") == sha1 and stored.fingerprint.get("config") == config:
+        stored.fingerprint = fingerprint
+        index = stored
+    else:
+        index = CsvIndex.build(filepath, search_cols, output_cols, fingerprint, field_weights)
+    _write_index(index_path, index, key)
+    _INDEXES[key] = index
+    return index
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -166,28 +618,31 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
+def _search_csv(filepath, search_cols, output_cols, query, max_results, query_tokens=None, field_weights=None):
+    """Core search function using BM25F over the search columns"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
+    if query_tokens is None:
+        query_tokens = BM25.tokenize(query)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    # Look up cached hits before paying for the index load
+    cache_key = ResultCache.make_key(filepath, query_tokens, max_results, filepath.stat(),
+                                     _config_hash(search_cols, output_cols, field_weights))
+    results = _RESULT_CACHE.get(cache_key)
+    if results is not None:
+        return results
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+    index = _get_index(filepath, search_cols, output_cols, field_weights)
+    ranked = index.bm25.score_tokens(query_tokens, top_k=max_results)
 
     # Get top results with score > 0
     results = []
     for idx, score in ranked[:max_results]:
         if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+            results.append(dict(index.rows[idx]))
 
+    _RESULT_CACHE.put(cache_key, results)
     return results
 
 
@@ -216,6 +671,27 @@ def detect_domain(query):
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
+    return _search_domain(query, domain, max_results)
+
+
+def search_many(queries):
+    """Run several (query, domain, max_results) searches in one pass.
+
+    Each distinct query string is tokenized once and every domain index is
+    loaded at most once. `domain` may be None for auto-detection, as in
+    search(). Returns the result dicts in the same order as `queries`.
+    """
+    query_tokens = {}
+    responses = []
+    for query, domain, max_results in queries:
+        if query not in query_tokens:
+            query_tokens[query] = BM25.tokenize(query)
+        responses.append(_search_domain(query, domain, max_results, query_tokens[query]))
+    return responses
+
+
+def _search_domain(query, domain, max_results, query_tokens=None):
+    """Search one domain CSV and wrap the hits in the search() response shape"""
     if domain is None:
         domain = detect_domain(query)
 
@@ -225,7 +701,8 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results,
+                          query_tokens, config.get("field_weights"))
 
     return {
         "domain": domain,
@@ -246,7 +723,8 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results,
+                          field_weights=_STACK_COLS["field_weights"])
 
     return {
         "domain": "stack",
@@ -256,3 +734,19 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def warm_indexes():
+    """Load (building if needed) every domain and stack index; returns how many were loaded"""
+    loaded = 0
+    for config in CSV_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _get_index(filepath, config["search_cols"], config["output_cols"], config.get("field_weights"))
+            loaded += 1
+    for config in STACK_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _get_index(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], _STACK_COLS["field_weights"])
+            loaded += 1
+    return loaded
@@ -11,14 +11,20 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Many projects in one run (shared generator and warm indexes)
+    from design_system import generate_design_systems
+    reports = generate_design_systems([{"project_name": "Shop", "query": "e-commerce", "pages": ["checkout"]}], persist=True)
 """
 
 import csv
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, search_many, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -32,6 +38,8 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+PERSIST_WORKERS = 8  # parallel file writers for batch generation
+
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
@@ -39,6 +47,7 @@ class DesignSystemGenerator:
 
     def __init__(self):
         self.reasoning_data = self._load_reasoning()
+        self._index_reasoning()
 
     def _load_reasoning(self) -> list:
         """Load reasoning rules from CSV."""
@@ -48,42 +57,88 @@ class DesignSystemGenerator:
         with open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
+    def _index_reasoning(self) -> None:
+        """Precompute lookup structures for _find_reasoning_rule.
+
+        - normalized (lowercased) categories, in rule order
+        - exact category -> first rule index
+        - category keyword -> first rule index (inverted map)
+        - every substring of a category -> first rule index containing it
+        - the distinct category and keyword lengths, so only windows of
+          those lengths of a query need to be looked up
+        - memo of resolved lookups and of parsed Decision_Rules JSON
+        """
+        self._categories = [rule.get("UI_Category", "").lower() for rule in self.reasoning_data]
+        self._category_keywords = [cat.replace("/", " ").replace("-", " ").split() for cat in self._categories]
+        self._exact_rules = {}
+        self._keyword_rules = {}
+        self._substring_rules = {}
+        for idx, cat in enumerate(self._categories):
+            self._exact_rules.setdefault(cat, idx)
+            for kw in self._category_keywords[idx]:
+                self._keyword_rules.setdefault(kw, idx)
+            for start in range(len(cat) + 1):
+                for end in range(start, len(cat) + 1):
+                    self._substring_rules.setdefault(cat[start:end], idx)
+        self._category_lengths = sorted({len(cat) for cat in self._exact_rules})
+        self._keyword_lengths = sorted({len(kw) for kw in self._keyword_rules})
+        self._rule_lookup_cache = {}
+        self._decision_rules_cache = {}
+
     def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+        """Execute searches across multiple domains in one batched pass."""
+        queries = []
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                queries.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                queries.append((query, domain, config["max_results"]))
+        return dict(zip(SEARCH_CONFIG, search_many(queries)))
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
         category_lower = category.lower()
-
+        if category_lower not in self._rule_lookup_cache:
+            idx = self._match_reasoning_rule(category_lower)
+            self._rule_lookup_cache[category_lower] = idx
+        idx = self._rule_lookup_cache[category_lower]
+        return self.reasoning_data[idx] if idx is not None else {}
+
+    def _match_reasoning_rule(self, category_lower: str):
+        """Index of the rule for a lowercased category, or None.
+
+        Precedence: exact category, then the first rule whose category
+        contains or is contained in the query, then the first rule with a
+        keyword inside the query. Each step is a dict lookup per query
+        window, so the cost follows the query length, not the rule count.
+        """
         # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        idx = self._exact_rules.get(category_lower)
+        if idx is not None:
+            return idx
+
+        # Try partial match: the query inside a category, or a category
+        # inside the query
+        matches = self._window_matches(category_lower, self._category_lengths, self._exact_rules)
+        if category_lower in self._substring_rules:
+            matches.append(self._substring_rules[category_lower])
+        if matches:
+            return min(matches)
+
+        # Try keyword match: a category keyword inside the query
+        matches = self._window_matches(category_lower, self._keyword_lengths, self._keyword_rules)
+        return min(matches) if matches else None
+
+    @staticmethod
+    def _window_matches(text: str, lengths: list, table: dict) -> list:
+        """Rule indexes of every substring of `text` with one of `lengths` found in `table`."""
+        return [table[text[start:start + length]]
+                for length in lengths if length <= len(text)
+                for start in range(len(text) - length + 1)
+                if text[start:start + length] in table]
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
@@ -101,12 +156,15 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
+        # Parse decision rules JSON (memoized per distinct rule text; the
+        # parsed dict is shared between results and only ever read)
+        raw_rules = rule.get("Decision_Rules", "{}")
+        if raw_rules not in self._decision_rules_cache:
+            try:
+                self._decision_rules_cache[raw_rules] = json.loads(raw_rules)
+            except json.JSONDecodeError:
+                self._decision_rules_cache[raw_rules] = {}
+        decision_rules = self._decision_rules_cache[raw_rules]
 
         return {
             "pattern": rule.get("Recommended_Pattern", ""),
@@ -120,7 +178,12 @@ class DesignSystemGenerator:
         }
 
     def _select_best_match(self, results: list, priority_keywords: list) -> dict:
-        """Select best matching result based on priority keywords."""
+        """Select best matching result based on priority keywords.
+
+        Results arrive ranked by BM25F, where a hit in "Style Category"
+        already outweighs one in "Keywords" or longer fields, so after the
+        style name check the top-ranked result is the best match.
+        """
         if not results:
             return {}
 
@@ -135,26 +198,7 @@ class DesignSystemGenerator:
                 if priority_lower in style_name or style_name in priority_lower:
                     return result
 
-        # Second: score by keyword match in all fields
-        scored = []
-        for result in results:
-            result_str = str(result).lower()
-            score = 0
-            for kw in priority_keywords:
-                kw_lower = kw.lower().strip()
-                # Higher score for style name match
-                if kw_lower in result.get("Style Category", "").lower():
-                    score += 10
-                # Lower score for keyword field match
-                elif kw_lower in result.get("Keywords", "").lower():
-                    score += 3
-                # Even lower for other field matches
-                elif kw_lower in result_str:
-                    score += 1
-            scored.append((score, result))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return scored[0][1] if scored and scored[0][0] > 0 else results[0]
+        return results[0]
 
     def _extract_results(self, search_result: dict) -> list:
         """Extract results list from search result dict."""
@@ -458,6 +502,17 @@ def format_markdown(design_system: dict) -> str:
 
 
 # ============ MAIN ENTRY POINT ============
+_generator = None
+
+
+def get_generator() -> DesignSystemGenerator:
+    """Return the process-wide generator, so its reasoning indexes are built once."""
+    global _generator
+    if _generator is None:
+        _generator = DesignSystemGenerator()
+    return _generator
+
+
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
                            persist: bool = False, page: str = None, output_dir: str = None) -> str:
     """
@@ -474,8 +529,7 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    design_system = get_generator().generate(query, project_name)
     
     # Persist to files if requested
     if persist:
@@ -486,6 +540,75 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     return format_ascii_box(design_system)
 
 
+def generate_design_systems(manifest: list, output_format: str = "ascii", persist: bool = False,
+                            output_dir: str = None, max_workers: int = PERSIST_WORKERS) -> list:
+    """
+    Generate design systems for many projects in one run.
+
+    One DesignSystemGenerator (and the process-wide search indexes) is shared
+    by every project. Files are rendered in order, then written by a thread
+    pool, since the writes are independent per file.
+
+    Args:
+        manifest: List of {"query": str, "project_name": str?, "pages": [...]?}.
+            Each page is a name, or {"name": str, "query": str?} when the page
+            needs its own search context (defaults to the project query).
+        output_format: "ascii" (default) or "markdown"
+        persist: If True, write design-system/<project>/ for every project
+        output_dir: Optional output directory (defaults to current working directory)
+        max_workers: Number of parallel file writers
+
+    Returns:
+        List of per-project dicts: project_name, output, created_files and
+        timing_ms (generate, render of persisted files, persist writes, total)
+    """
+    generator = get_generator()
+    reports = []
+    write_jobs = []  # (report index, path, content)
+
+    for entry in manifest:
+        started = time.perf_counter()
+        query = entry["query"]
+        design_system = generator.generate(query, entry.get("project_name"))
+        output = format_markdown(design_system) if output_format == "markdown" else format_ascii_box(design_system)
+        generated = time.perf_counter()
+
+        if persist:
+            pages = [page if isinstance(page, dict) else {"name": page} for page in entry.get("pages", [])]
+            design_system_dir, files = _plan_persist_files(design_system, pages, output_dir, query)
+            (design_system_dir / "pages").mkdir(parents=True, exist_ok=True)
+            write_jobs.extend((len(reports), path, content) for path, content in files)
+
+        reports.append({
+            "project_name": design_system["project_name"],
+            "output": output,
+            "created_files": [],
+            "timing_ms": {
+                "generate": (generated - started) * 1000,
+                "render": (time.perf_counter() - generated) * 1000,
+                "persist": 0.0,
+            },
+        })
+
+    def write(job):
+        report_idx, path, content = job
+        started = time.perf_counter()
+        _write_file(path, content)
+        return report_idx, str(path), (time.perf_counter() - started) * 1000
+
+    if write_jobs:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for report_idx, path, elapsed in pool.map(write, write_jobs):
+                reports[report_idx]["created_files"].append(path)
+                reports[report_idx]["timing_ms"]["persist"] += elapsed
+
+    for report in reports:
+        timing = report["timing_ms"]
+        timing["total"] = timing["generate"] + timing["render"] + timing["persist"]
+        report["timing_ms"] = {key: round(value, 2) for key, value in timing.items()}
+    return reports
+
+
 # ============ PERSISTENCE FUNCTIONS ============
 def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
     """
@@ -500,36 +623,16 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     Returns:
         dict with created file paths and status
     """
-    base_dir = Path(output_dir) if output_dir else Path.cwd()
-    
-    # Use project name for project-specific folder
-    project_name = design_system.get("project_name", "default")
-    project_slug = project_name.lower().replace(' ', '-')
-    
-    design_system_dir = base_dir / "design-system" / project_slug
-    pages_dir = design_system_dir / "pages"
-    
-    created_files = []
-    
+    pages = [{"name": page, "query": page_query}] if page else []
+    design_system_dir, files = _plan_persist_files(design_system, pages, output_dir, page_query)
+
     # Create directories
-    design_system_dir.mkdir(parents=True, exist_ok=True)
-    pages_dir.mkdir(parents=True, exist_ok=True)
-    
-    master_file = design_system_dir / "MASTER.md"
-    
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
-    
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+    (design_system_dir / "pages").mkdir(parents=True, exist_ok=True)
+
+    created_files = []
+    for path, content in files:
+        _write_file(path, content)
+        created_files.append(str(path))
     
     return {
         "status": "success",
@@ -538,6 +641,46 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     }
 
 
+def _plan_persist_files(design_system: dict, pages: list, output_dir: str = None, default_query: str = None) -> tuple:
+    """
+    Render MASTER.md and page override files without writing them.
+
+    Args:
+        design_system: The generated design system dictionary
+        pages: List of {"name": str, "query": str?} page overrides
+        output_dir: Optional output directory (defaults to current working directory)
+        default_query: Page query used when a page has none of its own
+
+    Returns:
+        (design_system_dir, [(path, content), ...]) with MASTER.md first
+    """
+    base_dir = Path(output_dir) if output_dir else Path.cwd()
+
+    # Use project name for project-specific folder
+    project_name = design_system.get("project_name", "default")
+    project_slug = project_name.lower().replace(' ', '-')
+
+    design_system_dir = base_dir / "design-system" / project_slug
+    pages_dir = design_system_dir / "pages"
+
+    files = [(design_system_dir / "MASTER.md", format_master_md(design_system))]
+
+    # Page override files with intelligent content
+    for page in pages:
+        name = page["name"]
+        page_file = pages_dir / f"{name.lower().replace(' ', '-')}.md"
+        files.append((page_file, format_page_override_md(design_system, name, page.get("query") or default_query)))
+
+    return design_system_dir, files
+
+
+def _write_file(path: Path, content: str) -> None:
+    """Write a UTF-8 text file, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
     project = design_system.get("project_name", "PROJECT")
@@ -917,16 +1060,16 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    style_search, ux_search, landing_search = search_many([
+        (combined_context, "style", 1),
+        (combined_context, "ux", 3),
+        (combined_context, "landing", 1),
+    ])
     
     # Extract results from search response
     style_results = style_search.get("results", [])
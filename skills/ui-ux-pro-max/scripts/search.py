@@ -3,6 +3,8 @@
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py --batch queries.jsonl [--json]
+       python search.py --manifest projects.json [--persist] [-f markdown]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
 
@@ -12,11 +14,25 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+
+Server mode (keeps every index warm between queries):
+  python server.py &                  # or: python server.py --stdio
+  python search.py "<query>" --server # same flags, answered by the server
+
+Indexes: BM25 indexes are prebuilt once per CSV and cached under
+  ~/.cache/ui-ux-pro-max/index (override with UI_PRO_MAX_INDEX_DIR).
+  They are rebuilt automatically when a data file changes.
+  Query results are memoized in ~/.cache/ui-ux-pro-max/results.json
+  (UI_PRO_MAX_RESULT_CACHE=<path|off>); --json output reports hits/misses.
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import os
+import sys
+
+# core and design_system are imported where they are used, so a --server
+# query is forwarded before the search engine is loaded
 
 
 def format_output(result):
@@ -45,13 +61,18 @@ def format_output(result):
     return "\n".join(output)
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+def build_parser():
+    """CLI parser shared by the local command and the search server"""
+    from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS
+
+    parser = argparse.ArgumentParser(prog="search.py", description="UI Pro Max Search")
+    parser.add_argument("query", nargs="?", help="Search query (omit with --batch)")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--batch", "-b", type=str, default=None, metavar="FILE",
+                        help="Run every query in a JSONL file ('-' for stdin); each line is {\"query\", \"domain\"?, \"stack\"?, \"max_results\"?}")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
@@ -60,47 +81,153 @@ if __name__ == "__main__":
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    parser.add_argument("--manifest", "-m", type=str, default=None, metavar="FILE",
+                        help="Generate design systems for every project in a JSON manifest: [{\"project_name\", \"query\", \"pages\"?}]")
+    # Search server (warm indexes in a long-lived process)
+    parser.add_argument("--server", nargs="?", const="", default=None, metavar="SOCKET",
+                        help="Send the query to a running server.py (default socket: $UI_PRO_MAX_SOCKET or the per-user temp socket); falls back to in-process search if none is listening")
+    return parser
 
-    args = parser.parse_args()
+
+def load_batch(path):
+    """Read batch queries from a JSONL file ('-' reads stdin)"""
+    handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        return [json.loads(line) for line in handle if line.strip()]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def run_batch(entries, default_max_results=None):
+    """Resolve batch entries in input order; domain queries share one search_many pass"""
+    from core import MAX_RESULTS, search_many, search_stack
+
+    if default_max_results is None:
+        default_max_results = MAX_RESULTS
+    results = [None] * len(entries)
+    domain_slots = []
+    domain_queries = []
+    for i, entry in enumerate(entries):
+        max_results = entry.get("max_results", default_max_results)
+        if entry.get("stack"):
+            results[i] = search_stack(entry["query"], entry["stack"], max_results)
+        else:
+            domain_slots.append(i)
+            domain_queries.append((entry["query"], entry.get("domain"), max_results))
+    for i, result in zip(domain_slots, search_many(domain_queries)):
+        results[i] = result
+    return results
+
+
+def format_manifest_reports(reports, persist):
+    """Format batch design-system output followed by per-project timing"""
+    output = [report["output"] for report in reports]
+    output.append("=" * 60)
+    output.append(f"⏱  Generated {len(reports)} design system(s)")
+    for report in reports:
+        timing = report["timing_ms"]
+        line = f"   {report['project_name']}: {timing['total']:.1f} ms (generate {timing['generate']:.1f}"
+        if persist:
+            line += f", render {timing['render']:.1f}, write {timing['persist']:.1f}; {len(report['created_files'])} file(s)"
+        output.append(line + ")")
+    output.append("=" * 60)
+    return "\n".join(output)
+
+
+def run(args):
+    """Execute a parsed command and return the text it prints"""
+    from core import result_cache_stats, search, search_stack
+
+    # Many design systems from a manifest
+    if args.manifest:
+        from design_system import generate_design_systems
+        with open(args.manifest, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        reports = generate_design_systems(manifest, args.format, persist=args.persist, output_dir=args.output_dir)
+        if args.json:
+            return json.dumps(reports, indent=2, ensure_ascii=False)
+        return format_manifest_reports(reports, args.persist)
+
+    # Batch of queries from a JSONL file
+    if args.batch:
+        results = run_batch(load_batch(args.batch), args.max_results)
+        if args.json:
+            return json.dumps({"results": results, "cache": result_cache_stats()}, indent=2, ensure_ascii=False)
+        return "\n".join(format_output(result) for result in results)
 
     # Design system takes priority
     if args.design_system:
+        from design_system import generate_design_system
         result = generate_design_system(
-            args.query, 
-            args.project_name, 
+            args.query,
+            args.project_name,
             args.format,
             persist=args.persist,
             page=args.page,
             output_dir=args.output_dir
         )
-        print(result)
-        
-        # Print persistence confirmation
+        output = [result]
+
+        # Persistence confirmation
         if args.persist:
             project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
-            print("\n" + "=" * 60)
-            print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
+            output.append("\n" + "=" * 60)
+            output.append(f"✅ Design system persisted to design-system/{project_slug}/")
+            output.append(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
             if args.page:
                 page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
-            print("")
-            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
-            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
-            print("=" * 60)
+                output.append(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+            output.append("")
+            output.append(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
+            output.append(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
+            output.append("=" * 60)
+        return "\n".join(output)
+
     # Stack search
-    elif args.stack:
+    if args.stack:
         result = search_stack(args.query, args.stack, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
     # Domain search
     else:
         result = search(args.query, args.domain, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+
+    if args.json:
+        return json.dumps({**result, "cache": result_cache_stats()}, indent=2, ensure_ascii=False)
+    return format_output(result)
+
+
+def server_target(argv):
+    """Socket to forward argv to ('' for the default), or None to search in-process.
+
+    Only --server and --batch are looked at, so the search engine need not
+    be imported to decide; the server parses and validates the full argv.
+    """
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--server", nargs="?", const="", default=None)
+    pre.add_argument("--batch", "-b", default=None)
+    known, _ = pre.parse_known_args(argv)
+    # stdin batches are read locally; the server cannot see this process's stdin
+    if known.batch == "-":
+        return None
+    if known.server is not None:
+        return known.server
+    return "" if os.environ.get("UI_PRO_MAX_SOCKET") else None
+
+
+if __name__ == "__main__":
+    target = server_target(sys.argv[1:])
+    if target is not None:
+        from server import request_server
+        response = request_server(sys.argv[1:], target or None)
+        if response is not None:
+            # Mirror the in-process command: errors go to stderr with its exit code
+            output, exit_code = response
+            if output:
+                print(output, file=sys.stderr if exit_code else sys.stdout)
+            sys.exit(exit_code)
+
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.query is None and not (args.batch or args.manifest):
+        parser.error("the query argument is required unless --batch or --manifest is given")
+    print(run(args))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Server - keeps every BM25 index warm in one process
+Usage: python server.py [--socket PATH]   # serve on a Unix socket
+       python server.py --stdio           # serve JSON lines on stdin/stdout
+
+Clients send one JSON object per line and get one JSON object back:
+  request:  {"argv": ["<query>", "--domain", "style"], "cwd": "/abs/path"}
+  response: {"output": "<text search.py would print>", "exit_code": 0}
+
+`argv` takes exactly the flags of search.py. `python search.py ... --server`
+is the thin client; it falls back to in-process search when no server is
+listening.
+"""
+
+import argparse
+import contextlib
+import getpass
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+from pathlib import Path
+
+
+# ============ CONFIGURATION ============
+CLIENT_TIMEOUT = 30  # seconds to wait for a server response
+
+
+def default_socket_path():
+    """Socket path from $UI_PRO_MAX_SOCKET, else a per-user temp socket"""
+    env_path = os.environ.get("UI_PRO_MAX_SOCKET")
+    if env_path:
+        return env_path
+    return str(Path(tempfile.gettempdir()) / f"ui-ux-pro-max-{getpass.getuser()}.sock")
+
+
+# ============ REQUEST HANDLING ============
+def handle_request(request):
+    """Run one search.py command in-process and capture what it prints"""
+    from search import build_parser, run
+
+    argv = [str(arg) for arg in request.get("argv", [])]
+    cwd = request.get("cwd") or os.getcwd()
+
+    # argparse reports --help and usage errors by printing; keep that off the
+    # protocol stream (stdout in --stdio mode) and return it as the output
+    captured = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+            args = build_parser().parse_args(argv)
+    except SystemExit as exc:
+        return {"output": captured.getvalue().rstrip(), "exit_code": exc.code or 0}
+
+    if args.query is None and not (args.batch or args.manifest):
+        return {"output": "Error: the query argument is required unless --batch or --manifest is given", "exit_code": 2}
+    for attr in ("batch", "manifest"):
+        path = getattr(args, attr)
+        if path and path != "-" and not os.path.isabs(path):
+            setattr(args, attr, os.path.join(cwd, path))
+
+    # Persisted files land relative to the client's working directory
+    if args.output_dir is None:
+        args.output_dir = cwd
+    elif not os.path.isabs(args.output_dir):
+        args.output_dir = os.path.join(cwd, args.output_dir)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            output = run(args)
+    except Exception as exc:
+        return {"output": f"Error: {exc}", "exit_code": 1}
+    return {"output": output, "exit_code": 0}
+
+
+def _handle_line(line):
+    """Decode a request line and encode its response line"""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as exc:
+        response = {"output": f"Error: invalid request: {exc}", "exit_code": 2}
+    else:
+        response = handle_request(request)
+    return json.dumps(response, ensure_ascii=False) + "\n"
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line; a connection may send several"""
+
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode("utf-8").strip()
+            if line:
+                self.wfile.write(_handle_line(line).encode("utf-8"))
+                self.wfile.flush()
+
+
+def serve_socket(socket_path):
+    """Serve requests on a Unix socket until interrupted"""
+    if os.path.exists(socket_path):
+        if _server_alive(socket_path):
+            print(f"Error: a server is already listening on {socket_path}", file=sys.stderr)
+            return 1
+        os.unlink(socket_path)
+
+    with socketserver.UnixStreamServer(socket_path, _RequestHandler) as server:
+        os.chmod(socket_path, 0o600)
+        print(f"UI Pro Max search server listening on {socket_path}", file=sys.stderr)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(socket_path)
+    return 0
+
+
+def serve_stdio():
+    """Serve JSON-line requests from stdin until EOF"""
+    for line in sys.stdin:
+        line = line.strip()
+        if line:
+            sys.stdout.write(_handle_line(line))
+            sys.stdout.flush()
+    return 0
+
+
+# ============ CLIENT ============
+def _server_alive(socket_path):
+    """True if something accepts connections on the socket"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def request_server(argv, socket_path=None):
+    """Send search.py arguments to a running server.
+
+    Returns (output, exit_code) as the server ran the command, or None when
+    no server answers so the caller can fall back to searching in-process.
+    """
+    socket_path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+
+    request = json.dumps({"argv": argv, "cwd": os.getcwd()}, ensure_ascii=False) + "\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(socket_path)
+            sock.sendall(request.encode("utf-8"))
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline().decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+    return response.get("output", ""), response.get("exit_code", 0)
+
+
+# ============ CLI ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Search Server")
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path (default: $UI_PRO_MAX_SOCKET or the per-user temp socket)")
+    parser.add_argument("--stdio", action="store_true", help="Serve JSON lines on stdin/stdout instead of a socket")
+    args = parser.parse_args()
+
+    from core import warm_indexes
+
+    loaded = warm_indexes()
+    print(f"Warmed {loaded} indexes", file=sys.stderr)
+
+    if args.stdio:
+        sys.exit(serve_stdio())
+    sys.exit(serve_socket(args.socket or default_socket_path()))